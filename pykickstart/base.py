@@ -46,11 +46,52 @@ This module exports several important base classes:
 from pykickstart.i18n import _
 
 import warnings
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from functools import lru_cache
 from pykickstart import __version__
-from pykickstart.errors import KickstartParseError, KickstartParseWarning, KickstartDeprecationWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, KickstartDeprecationWarning, warn
 from pykickstart.ko import KickstartObject
 from pykickstart.version import versionToString
-from pykickstart.parser import Packages
+from pykickstart.parser import Packages, Script
+
+# Parsers shared between all instances of a KickstartCommand subclass, keyed
+# by the class.  Each value is a tuple of the _getParser function the parser
+# was built with and the parser itself, or None if the class's parser can't be
+# shared.  This dict is maintained by KickstartCommand._getCachedParser.
+_parserCache = {}
+
+# The write priority and output of a freshly created instance of each
+# KickstartCommand subclass, keyed by the class.  This lets a handler write out
+# commands it never had to create.  This dict is maintained by _commandDefaults.
+_commandDefaultCache = {}
+
+# The _Registrations for the default command and data maps of each version,
+# keyed by the version.  This dict is maintained by
+# BaseHandler._registerCommands.
+_registrationCache = {}
+
+@lru_cache(maxsize=None)
+def _commandName(cmdClass):
+    """Return the name of a KickstartCommand subclass without its version
+       prefix.
+    """
+    if cmdClass.__name__.find("_") != -1:
+        return cmdClass.__name__.split("_", 1)[1]
+    else:
+        return cmdClass.__name__
+
+def _commandDefaults(cmdClass):
+    """Return a (writePriority, string) tuple describing a new instance of the
+       KickstartCommand subclass cmdClass.
+    """
+    try:
+        return _commandDefaultCache[cmdClass]
+    except KeyError:
+        cmdObj = cmdClass()
+        entry = (cmdObj.writePriority, cmdObj.__str__())
+        _commandDefaultCache[cmdClass] = entry
+        return entry
 
 ###
 ### COMMANDS
@@ -60,6 +101,7 @@ class KickstartCommand(KickstartObject):
     removedKeywords = []
     removedAttrs = []
     conflictingCommands = []
+    span = None
 
     def __init__(self, writePriority=0, *args, **kwargs):
         """Create a new KickstartCommand instance.  This method must be
@@ -78,6 +120,8 @@ class KickstartCommand(KickstartObject):
                             this attribute will be set to True.  This allows
                             for differentiating commands that were omitted
                             from those that default to unset.
+           span          -- The pykickstart.parser.SourceSpan of the line
+                            that last ran this command, or None.
            writePriority -- An integer specifying when this command should be
                             printed when iterating over all commands' __str__
                             methods.  The higher the number, the later this
@@ -100,10 +144,15 @@ class KickstartCommand(KickstartObject):
         self.lineno = 0
         self.seen = False
 
+        # The index used by findData.  This is a tuple of the list that was
+        # indexed, how many of its items have been indexed, the last of those
+        # items, and a dict mapping identity keys to lists of the items.
+        self._dataIndex = None
+
         # If a subclass provides a removedKeywords list, warn if the user
         # continues to use some of the removed keywords
         for arg in (kw for kw in self.removedKeywords if kw in kwargs):
-            warnings.warn("The '%s' keyword has been removed." % arg, KickstartParseWarning, stacklevel=2)
+            warn("The '%s' keyword has been removed." % arg, KickstartParseWarning, stacklevel=2)
 
     def __call__(self, *args, **kwargs):
         """Set multiple attributes on a subclass of KickstartCommand at once
@@ -135,6 +184,50 @@ class KickstartCommand(KickstartObject):
         raise TypeError("parse() not implemented for KickstartCommand")
     # pylint: enable=unused-argument
 
+    def _getParser(self):
+        """Return a new KSOptionParser for this command.  This method must be
+           provided by all subclasses that call _getCachedParser.
+        """
+        raise TypeError("_getParser() not implemented for KickstartCommand")
+
+    def _getCachedParser(self):
+        """Return an option parser for this command.  The parser returned by
+           _getParser is built once per class and shared with every later
+           instance, each of which gets a cheap copy of it.  This is what
+           subclasses should call from __init__ to set self.op.
+
+           The parser is rebuilt if the class's _getParser method is replaced.
+           Subclasses that change a parser in any other way at runtime must
+           call invalidateParserCache afterwards.
+        """
+        cls = self.__class__
+        entry = _parserCache.get(cls, ())
+
+        if entry is None:
+            return self._getParser()
+
+        if not entry or entry[0] is not cls._getParser:
+            op = self._getParser()
+
+            if not op._share(self):
+                _parserCache[cls] = None
+                return op
+
+            entry = (cls._getParser, op)
+            _parserCache[cls] = entry
+
+        return entry[1]._copyFor(self)
+
+    @classmethod
+    def invalidateParserCache(cls):
+        """Throw away the shared option parsers of this class and all of its
+           subclasses, so they are rebuilt by _getParser the next time an
+           instance is created.  Objects that already exist keep the parser
+           they were given.
+        """
+        for key in [k for k in _parserCache if issubclass(k, cls)]:
+            del _parserCache[key]
+
     def dataList(self):
         """For commands that can occur multiple times in a single kickstart
            file (like network, part, etc.), return the list that we should
@@ -151,6 +244,47 @@ class KickstartCommand(KickstartObject):
         """
         return None
 
+    def findData(self, data):
+        """Return the object in dataList that is equal to data, or None if
+           there is no such object.  This is how commands check for duplicates.
+
+           Data objects that provide an identityKey are found through an index
+           of dataList, which is kept up to date as objects are appended to
+           the list.  If the list is replaced, shrinks, or its last object
+           changes, the index is rebuilt.  Objects whose identity changes after
+           they were added are not found under their new identity.
+        """
+        lst = self.dataList() or []
+        if not lst:
+            return None
+
+        key = data.identityKey()
+        if key is None:
+            candidates = lst
+        else:
+            candidates = self._getDataIndex(lst).get(key, [])
+
+        for obj in candidates:
+            if obj is data or obj == data:
+                return obj
+
+        return None
+
+    def _getDataIndex(self, lst):
+        (indexedList, count, last, index) = self._dataIndex or (None, 0, None, None)
+
+        # Appending to the list is the only change that is followed
+        # incrementally.  Anything else that can be noticed cheaply starts
+        # over.
+        if indexedList is not lst or count > len(lst) or (count and lst[count-1] is not last):
+            (count, index) = (0, {})
+
+        for obj in lst[count:]:
+            index.setdefault(obj.identityKey(), []).append(obj)
+
+        self._dataIndex = (lst, len(lst), lst[-1], index)
+        return index
+
     def deleteRemovedAttrs(self):
         """Remove all attributes from self that are given in the removedAttrs
            list.  This method should be called from __init__ in a subclass,
@@ -219,7 +353,7 @@ class DeprecatedCommand(KickstartCommand):
     def parse(self, args):
         """Print a warning message if the command is seen in the input file."""
         mapping = {"lineno": self.lineno, "cmd": self.currentCmd}
-        warnings.warn(_("Ignoring deprecated command on line %(lineno)s:  The %(cmd)s command has been deprecated and no longer has any effect.  It may be removed from future releases, which will result in a fatal error from kickstart.  Please modify your kickstart file to remove this command.") % mapping, KickstartDeprecationWarning)
+        warn(_("Ignoring deprecated command on line %(lineno)s:  The %(cmd)s command has been deprecated and no longer has any effect.  It may be removed from future releases, which will result in a fatal error from kickstart.  Please modify your kickstart file to remove this command.") % mapping, KickstartDeprecationWarning)
         return None
 
 class RemovedCommand(KickstartCommand):
@@ -256,6 +390,94 @@ class RemovedCommand(KickstartCommand):
 ###
 ### HANDLERS
 ###
+class _Registrations(object):
+    """The commands and data objects a BaseHandler registers when it is
+       created, worked out from the command and data maps once so they can be
+       set up on any number of handlers with a few dict copies.
+    """
+    def __init__(self, cMap, dMap):
+        # Command objects are only created when they are first looked up.
+        # Until then, the command class itself stands in for the object in
+        # the handler's dicts.
+        self.classes = {}
+        self.commands = {}
+        self.attrs = {}
+
+        for (cmdName, cmdClass) in cMap.items():
+            if cmdClass.__name__ not in self.classes:
+                self.classes[cmdClass.__name__] = cmdClass
+                self.attrs[_commandName(cmdClass).lower()] = cmdClass
+
+            self.commands[cmdName] = cmdClass
+
+        # No checks here because dMap is a bijection.  At least, that's what
+        # the comment says.  Hope no one screws that up.
+        self.data = dict(dMap)
+
+    def apply(self, handler):
+        """Register everything on handler, which must not have any commands
+           registered yet.
+        """
+        handler._commandsByClassName.update(self.classes)
+        handler._pendingAttrs.update(self.attrs)
+        handler.commands._data.update(self.commands)
+
+        # Skip the method calls when registerData only sets the attribute.
+        if type(handler).registerData is KickstartHandler.registerData:
+            handler.__dict__.update(self.data)
+        else:
+            for (dataName, dataClass) in self.data.items():
+                handler.registerData(dataName, dataClass)
+
+class _CommandDict(MutableMapping):
+    """The commands dict of a KickstartHandler.  Values may be the classes of
+       commands that haven't been created yet, which are replaced with real
+       command objects on lookup.
+    """
+    def __init__(self, handler):
+        self._handler = handler
+        self._data = {}
+
+    def __getitem__(self, key):
+        value = self._data[key]
+
+        if isinstance(value, type):
+            value = self._handler._createCommand(value)
+            self._data[key] = value
+
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def peek(self, key):
+        """Return the command object for key without creating it.  Returns
+           None if the object hasn't been created yet.  Raises KeyError if
+           key is not in the dict.
+        """
+        value = self._data[key]
+
+        if isinstance(value, type):
+            cmdObj = self._handler._commandsByClassName.get(value.__name__)
+            return cmdObj if cmdObj.__class__ is value else None
+
+        return value
+
 class KickstartHandler(KickstartObject):
     """An empty kickstart handler.
 
@@ -278,14 +500,28 @@ class KickstartHandler(KickstartObject):
                        command object should ever exist.  Most users should
                        never have to deal with this directly, as it is
                        manipulated internally and called through dispatcher.
+                       Command objects are only created the first time they
+                       are looked up.
            currentLine -- The current unprocessed line from the input file
                           that caused this handler to be run.
+           currentSpan -- The pykickstart.parser.SourceSpan of currentLine.
         """
         KickstartObject.__init__(self, *args, **kwargs)
 
+        # Command attributes that haven't been looked up yet, keyed by the
+        # attribute name.  Each value is the class of the command object that
+        # will be created on lookup, which stands in for the object in the
+        # commands dict as well.
+        self._pendingAttrs = {}
+
+        # Whether command objects go into _writeOrder when they are created.
+        # This is only turned off by BaseHandler.maskAllExcept.
+        self._writePending = True
+
         # These will be set by the dispatcher.
-        self.commands = {}
+        self.commands = _CommandDict(self)
         self.currentLine = ""
+        self.currentSpan = None
 
         # A dict keyed by an integer priority number, with each value being a
         # list of KickstartCommand subclasses.  This dict is maintained by
@@ -293,63 +529,101 @@ class KickstartHandler(KickstartObject):
         # it.
         self._writeOrder = {}
 
+        # The names (as given by _commandName) of the objects in each
+        # _writeOrder list, kept alongside so the lists can be bisected.
+        self._writeOrderNames = {}
+
+        # The command objects in the commands dict keyed by their class name, so
+        # registerCommand can find an existing instance without a search.
+        # Values may be the classes of commands not created yet.
+        self._commandsByClassName = {}
+
+    def __getattr__(self, name):
+        # This is only called when normal lookup fails, which is the case for
+        # command attributes that haven't been used yet.
+        pending = self.__dict__.get("_pendingAttrs")
+        if pending is None or name not in pending:
+            raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+
+        return self._createCommand(pending[name])
+
     def __str__(self):
         """Return a string formatted for output to a kickstart file."""
         retval = ""
 
-        lst = list(self._writeOrder.keys())
-        lst.sort()
+        entries = []
+        for (prio, lst) in self._writeOrder.items():
+            for obj in lst:
+                entries.append((prio, _commandName(obj.__class__), obj))
 
-        for prio in lst:
-            for obj in self._writeOrder[prio]:
-                retval += obj.__str__()
+        # Commands that were never created are written out as a new instance
+        # would be, which for most of them is nothing at all.
+        if self._writePending:
+            for cmdClass in self._pendingAttrs.values():
+                (prio, text) = _commandDefaults(cmdClass)
+                if prio is not None and text:
+                    entries.append((prio, _commandName(cmdClass), text))
+
+        entries.sort(key=lambda entry: entry[:2])
+
+        for (_prio, _name, obj) in entries:
+            retval += obj.__str__()
 
         return retval
 
-    def _insertSorted(self, lst, obj):
-        def cmdName(cmdObj):
-            if cmdObj.__class__.__name__.find("_") != -1:
-                return cmdObj.__class__.__name__.split("_", 1)[1]
-            else:
-                return cmdObj.__class__.__name__
-
-        length = len(lst)
-        i = 0
-
-        while i < length:
-            # If the two classes have the same name, it's because we are
-            # overriding an existing class with one from a later kickstart
-            # version, so remove the old one in favor of the new one.
-            if cmdName(obj) > cmdName(lst[i]):
-                i += 1
-            elif cmdName(obj) == cmdName(lst[i]):
-                lst[i] = obj
-                return
-            elif cmdName(obj) < cmdName(lst[i]):
-                break
-
-        if i >= length:
-            lst.append(obj)
+    def _insertSorted(self, prio, obj):
+        lst = self._writeOrder.setdefault(prio, [])
+        names = self._writeOrderNames.setdefault(prio, [])
+        name = _commandName(obj.__class__)
+
+        i = bisect_left(names, name)
+
+        # If the two classes have the same name, it's because we are
+        # overriding an existing class with one from a later kickstart
+        # version, so remove the old one in favor of the new one.
+        if i < len(names) and names[i] == name:
+            lst[i] = obj
         else:
+            names.insert(i, name)
             lst.insert(i, obj)
 
     def _setCommand(self, cmdObj):
         # Add an attribute on this version object.  We need this to provide a
         # way for clients to access the command objects.  We also need to strip
         # off the version part from the front of the name.
-        if cmdObj.__class__.__name__.find("_") != -1:
-            name = cmdObj.__class__.__name__.split("_", 1)[1]
-        else:
-            name = cmdObj.__class__.__name__.lower()
+        name = _commandName(cmdObj.__class__).lower()
 
-        setattr(self, name.lower(), cmdObj)
+        self._pendingAttrs.pop(name, None)
+        setattr(self, name, cmdObj)
 
         # Also, add the object into the _writeOrder dict in the right place.
         if cmdObj.writePriority is not None:
-            if cmdObj.writePriority in self._writeOrder:
-                self._insertSorted(self._writeOrder[cmdObj.writePriority], cmdObj)
+            self._insertSorted(cmdObj.writePriority, cmdObj)
+
+    def _createCommand(self, cmdClass):
+        """Return the command object cmdClass stands in for, creating it if
+           that hasn't happened yet.
+        """
+        cmdObj = self._commandsByClassName.get(cmdClass.__name__)
+        if cmdObj.__class__ is cmdClass:
+            return cmdObj
+
+        cmdObj = cmdClass()
+        cmdObj.handler = self
+
+        if self._commandsByClassName.get(cmdClass.__name__) is cmdClass:
+            self._commandsByClassName[cmdClass.__name__] = cmdObj
+
+        # Only take over the attribute if no later class has claimed it.
+        name = _commandName(cmdClass).lower()
+        if self._pendingAttrs.get(name) is cmdClass:
+            if self._writePending:
+                self._setCommand(cmdObj)
             else:
-                self._writeOrder[cmdObj.writePriority] = [cmdObj]
+                del self._pendingAttrs[name]
+                setattr(self, name, cmdObj)
+
+        return cmdObj
 
     def registerCommand(self, cmdName, cmdClass):
         # First make sure we haven't instantiated this command handler
@@ -358,17 +632,16 @@ class KickstartHandler(KickstartObject):
         # NOTE:  We can't use the resetCommand method here since that relies
         # upon cmdClass already being instantiated.  We'll just have to keep
         # these two code blocks in sync.
-        cmdObj = None
+        cmdObj = self._commandsByClassName.get(cmdClass.__name__)
 
-        for (_key, val) in list(self.commands.items()):
-            if val.__class__.__name__ == cmdClass.__name__:
-                cmdObj = val
-                break
+        if isinstance(cmdObj, type):
+            cmdObj = self._createCommand(cmdObj)
 
         # If we didn't find an instance in self.commands, create one now.
         if cmdObj is None:
             cmdObj = cmdClass()
             self._setCommand(cmdObj)
+            self._commandsByClassName[cmdClass.__name__] = cmdObj
 
         # Finally, add the mapping to the commands dict.
         self.commands[cmdName] = cmdObj
@@ -392,6 +665,7 @@ class KickstartHandler(KickstartObject):
         cmdObj = self.commands[cmdName].__class__()
 
         self._setCommand(cmdObj)
+        self._commandsByClassName[cmdObj.__class__.__name__] = cmdObj
         self.commands[cmdName] = cmdObj
         self.commands[cmdName].handler = self
 
@@ -408,14 +682,19 @@ class KickstartHandler(KickstartObject):
 
         if cmd not in self.commands:
             raise KickstartParseError(_("Unknown command: %s") % cmd, lineno=lineno)
-        elif self.commands[cmd] is not None:
-            self.commands[cmd].currentCmd = cmd
-            self.commands[cmd].currentLine = self.currentLine
-            self.commands[cmd].lineno = lineno
-            self.commands[cmd].seen = True
+
+        # Looking a command up in self.commands goes through _CommandDict, so
+        # only do it once.
+        cmdObj = self.commands[cmd]
+        if cmdObj is not None:
+            cmdObj.currentCmd = cmd
+            cmdObj.currentLine = self.currentLine
+            cmdObj.lineno = lineno
+            cmdObj.span = self.currentSpan
+            cmdObj.seen = True
 
             # Check for conflicting commands.
-            conflicting_cmds = self.commands[cmd].conflictingCommands
+            conflicting_cmds = cmdObj.conflictingCommands
             self._checkConflictingCommands(cmd, conflicting_cmds, lineno=lineno)
 
             # The parser returns the data object that was modified.  This is either
@@ -424,12 +703,15 @@ class KickstartHandler(KickstartObject):
             # dataList.  The latter is done via side effects.
             #
             # Regardless, return the object that was given to us by the parser.
-            obj = self.commands[cmd].parse(args[1:])
+            obj = cmdObj.parse(args[1:])
 
             # Here's the side effect part - don't worry about lst not being returned.
-            lst = self.commands[cmd].dataList()
-            if isinstance(obj, BaseData) and lst is not None:
-                lst.append(obj)
+            lst = cmdObj.dataList()
+            if isinstance(obj, BaseData):
+                obj.span = self.currentSpan
+
+                if lst is not None:
+                    lst.append(obj)
 
             return obj
 
@@ -439,10 +721,9 @@ class KickstartHandler(KickstartObject):
             if conflicting_cmd not in self.commands:
                 continue
 
-            if self.commands[conflicting_cmd] is None:
-                continue
-
-            if not self.commands[conflicting_cmd].seen:
+            # Commands that haven't been created yet haven't been seen either.
+            cmdObj = self.commands.peek(conflicting_cmd)
+            if cmdObj is None or not cmdObj.seen:
                 continue
 
             raise KickstartParseError(
@@ -501,12 +782,17 @@ class BaseHandler(KickstartHandler):
             raise TypeError("BaseHandler is an abstract class.")
 
         KickstartHandler.__init__(self, *args, **kwargs)
+        self._setUp()
+        self._registerCommands(mapping, dataMapping, commandUpdates, dataUpdates)
 
+    def _setUp(self):
+        # Everything BaseHandler.__init__ does besides registering commands,
+        # which fresh needs to do as well.
         # This isn't really a good place for these, but it's better than
         # everything else I can think of.
         self.certificates = []
         self.scripts = []
-        self.packages = Packages()
+        self.packages = Packages(version=self.version)
         self.platform = ""
 
         # Any sections that we do not understand but want to prevent causing errors
@@ -515,10 +801,23 @@ class BaseHandler(KickstartHandler):
         # in the future.  Don't rely on this exact implementation.
         self._null_section_strings = []
 
-        self._registerCommands(mapping, dataMapping, commandUpdates, dataUpdates)
-
     def __str__(self):
         """Return a string formatted for output to a kickstart file."""
+        return "".join(self._chunks())
+
+    def write(self, f):
+        """Write the kickstart file this handler describes to the file object
+           f.  This gives the same output as __str__, but script bodies are
+           written out as they are instead of first being copied into one
+           large string.
+        """
+        if type(self).__str__ is BaseHandler.__str__:
+            f.writelines(self._chunks())
+        else:
+            f.write(self.__str__())
+
+    def _chunks(self):
+        """Yield the strings that make up the kickstart output, in order."""
         retval = "# Generated by pykickstart v%s\n" % __version__
 
         if self.platform:
@@ -526,26 +825,35 @@ class BaseHandler(KickstartHandler):
 
         retval += "#version=%s\n" % versionToString(self.version)
 
-        retval += KickstartHandler.__str__(self)
+        yield retval
+        yield KickstartHandler.__str__(self)
 
         for script in self.scripts:
-            retval += script.__str__()
+            # Subclasses of Script may write themselves out differently.
+            if type(script).__str__ is Script.__str__:
+                yield from script._chunks()
+            else:
+                yield script.__str__()
 
         if self._null_section_strings:
-            retval += "\n"
-
-            for s in self._null_section_strings:
-                retval += s
+            yield "\n"
+            yield from self._null_section_strings
 
-        retval += self.packages.__str__()
+        yield self.packages.__str__()
 
         for cert in self.certificates:
-            retval += cert.__str__()
-
-        return retval
+            yield cert.__str__()
 
     def _registerCommands(self, mapping=None, dataMapping=None, commandUpdates=None,
                           dataUpdates=None):
+        default = (mapping == {} or mapping is None) and (dataMapping == {} or dataMapping is None) \
+                  and not isinstance(commandUpdates, dict) and not isinstance(dataUpdates, dict)
+
+        if default and self.version in _registrationCache:
+            self._registrations = _registrationCache[self.version]
+            self._registrations.apply(self)
+            return
+
         if mapping == {} or mapping is None:
             from pykickstart.handlers.control import commandMap
             cMap = commandMap[self.version]
@@ -568,27 +876,57 @@ class BaseHandler(KickstartHandler):
             dMap = dict(dMap)
             dMap.update(dataUpdates)
 
-        for (cmdName, cmdClass) in list(cMap.items()):
-            self.registerCommand(cmdName, cmdClass)
+        # The command objects are only created when they are first looked up.
+        self._registrations = _Registrations(cMap, dMap)
+        if default:
+            _registrationCache[self.version] = self._registrations
 
-        # No checks here because dMap is a bijection.  At least, that's what
-        # the comment says.  Hope no one screws that up.
-        for (dataName, dataClass) in list(dMap.items()):
-            self.registerData(dataName, dataClass)
+        self._registrations.apply(self)
+
+    def fresh(self):
+        """Return a new, empty handler of the same class with the same
+           commands and data objects registered as this one was created with.
+           Nothing done to this handler since then carries over.  This is
+           much cheaper than creating a handler with makeVersion, for
+           programs that parse many kickstart files with the same version.
+
+           The new handler is set up by BaseHandler alone.  Subclasses that
+           set up more state of their own in __init__ must override this
+           method to do the same.
+        """
+        new = self.__class__.__new__(self.__class__)
+        KickstartHandler.__init__(new)
+        new._setUp()
+        new._registrations = self._registrations
+        new._registrations.apply(new)
+        return new
 
     def maskAllExcept(self, lst):
         """Set all entries in the commands dict to None, except the ones in
            the lst.  All other commands will not be processed.
         """
         self._writeOrder = {}
+        self._writeOrderNames = {}
+
+        # Commands created from now on stay out of the output as well.
+        self._writePending = False
 
-        for (key, _val) in list(self.commands.items()):
+        self._commandsByClassName = {}
+
+        for key in list(self.commands.keys()):
             if key not in lst:
                 self.commands[key] = None
+                continue
+
+            val = self.commands._data[key]
+            if isinstance(val, type):
+                self._commandsByClassName.setdefault(val.__name__, val)
+            elif val is not None:
+                self._commandsByClassName.setdefault(val.__class__.__name__, val)
 
     def hasCommand(self, cmd):
         """Return true if there is a handler for the string cmd."""
-        return hasattr(self, cmd)
+        return cmd in self._pendingAttrs or hasattr(self, cmd)
 
 ###
 ### DATA
@@ -597,11 +935,14 @@ class BaseData(KickstartObject):
     """The base class for all data objects.  This is an abstract class."""
     removedKeywords = []
     removedAttrs = []
+    span = None
 
     def __init__(self, *args, **kwargs):
         """Create a new BaseData instance.
 
            lineno -- Line number in the ks-file where this object was defined
+           span   -- The pykickstart.parser.SourceSpan of the line that
+                     defined this object, if it was read by the parser
         """
 
         # We don't want people using this class by itself.
@@ -614,12 +955,21 @@ class BaseData(KickstartObject):
         # If a subclass provides a removedKeywords list, warn if the user
         # continues to use some of the removed keywords
         for arg in (kw for kw in self.removedKeywords if kw in kwargs):
-            warnings.warn("The '%s' keyword has been removed." % arg, KickstartParseWarning, stacklevel=2)
+            warn("The '%s' keyword has been removed." % arg, KickstartParseWarning, stacklevel=2)
 
     def __str__(self):
         """Return a string formatted for output to a kickstart file."""
         return ""
 
+    def identityKey(self):
+        """Return a hashable key identifying this object, such that objects
+           that compare equal have equal keys.  Subclasses that define __eq__
+           should provide this as well, so KickstartCommand.findData doesn't
+           have to compare against every object in the data list.  Returns
+           None if there is no such key.
+        """
+        return None
+
     def __call__(self, *args, **kwargs):
         """Set multiple attributes on a subclass of BaseData at once via
            keyword arguments.  Valid attributes are anything specified in a
@@ -17,10 +17,9 @@
 # subject to the GNU General Public License and may only be used or replicated
 # with the express permission of Red Hat, Inc.
 #
-import warnings
 from textwrap import dedent
 
-from pykickstart.errors import KickstartDeprecationWarning
+from pykickstart.errors import KickstartDeprecationWarning, warn
 from pykickstart.version import FC3, versionToLongString, F28, F35
 from pykickstart.base import KickstartCommand, RemovedCommand
 from pykickstart.options import KSOptionParser
@@ -67,8 +66,8 @@ class F28_Authconfig(FC3_Authconfig):
     removedAttrs = FC3_Authconfig.removedAttrs
 
     def parse(self, args):
-        warnings.warn("The authconfig command will be deprecated, use authselect "
-                      "instead.", KickstartDeprecationWarning)
+        warn("The authconfig command will be deprecated, use authselect "
+             "instead.", KickstartDeprecationWarning)
 
         return super(F28_Authconfig, self).parse(args)
 
@@ -66,7 +66,7 @@ class F9_AutoPart(FC3_AutoPart):
         self.encrypted = kwargs.get("encrypted", False)
         self.passphrase = kwargs.get("passphrase", "")
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = KickstartCommand.__str__(self)
@@ -27,7 +27,7 @@ class F43_Bootc(KickstartCommand):
     def __init__(self, *args, **kwargs):
         KickstartCommand.__init__(self, *args, **kwargs)
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.stateroot = kwargs.get('stateroot', None)
         self.sourceImgRef = kwargs.get("sourceImgRef", None)
@@ -31,7 +31,7 @@ class FC3_Bootloader(KickstartCommand):
 
     def __init__(self, writePriority=10, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.driveorder = kwargs.get("driveorder", [])
         self.appendLine = kwargs.get("appendLine", "")
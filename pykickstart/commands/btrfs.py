@@ -20,10 +20,9 @@
 #
 from pykickstart.version import F17, F23, RHEL8, RHEL10, versionToLongString
 from pykickstart.base import BaseData, KickstartCommand, DeprecatedCommand, RemovedCommand
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser, mountpoint
 
-import warnings
 from pykickstart.i18n import _
 
 class F17_BTRFSData(BaseData):
@@ -54,6 +53,9 @@ class F17_BTRFSData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.mountpoint,)
+
     def _getArgsAsStr(self):
         retval = ""
         if not self.format:
@@ -102,7 +104,7 @@ class F17_BTRFS(KickstartCommand):
 
     def __init__(self, writePriority=132, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         # A dict of all the RAID levels we support.  This means that if we
         # support more levels in the future, subclasses don't have to
@@ -121,13 +123,13 @@ class F17_BTRFS(KickstartCommand):
 
         return retval
 
-    def _getParser(self):
-        def level_cb(value):
-            if value.lower() in self.levelMap:
-                return self.levelMap[value.lower()]
-            else:
-                raise KickstartParseError(_("Invalid btrfs level: %s") % value, lineno=self.lineno)
+    def _level_cb(self, value):
+        if value.lower() in self.levelMap:
+            return self.levelMap[value.lower()]
+        else:
+            raise KickstartParseError(_("Invalid btrfs level: %s") % value, lineno=self.lineno)
 
+    def _getParser(self):
         op = KSOptionParser(prog="btrfs", description="""
                             Defines a BTRFS volume or subvolume. This command
                             is of the form:
@@ -177,11 +179,11 @@ class F17_BTRFS(KickstartCommand):
                         If the given label is already in use by another
                         filesystem, a new label will be created. This option
                         has no meaning for subvolumes.""")
-        op.add_argument("--data", dest="dataLevel", type=level_cb, help="""
+        op.add_argument("--data", dest="dataLevel", type=self._level_cb, help="""
                         RAID level to use (0, 1, 10) for filesystem data. Optional.
                         This option has no meaning for subvolumes.""",
                         version=F17)
-        op.add_argument("--metadata", dest="metaDataLevel", type=level_cb,
+        op.add_argument("--metadata", dest="metaDataLevel", type=self._level_cb,
                         version=F17, help="""
                         RAID level to use (0, 1, 10) for filesystem/volume
                         metadata. Optional. This option has no meaning for
@@ -229,8 +231,8 @@ class F17_BTRFS(KickstartCommand):
             raise KickstartParseError(_("btrfs subvolume requires a name"), lineno=self.lineno)
 
         # Check for duplicates in the data list.
-        if data in self.dataList():
-            warnings.warn(_("A btrfs volume with the mountpoint %s has already been defined.") % data.mountpoint, KickstartParseWarning)
+        if self.findData(data) is not None:
+            warn(_("A btrfs volume with the mountpoint %s has already been defined.") % data.mountpoint, KickstartParseWarning)
 
         return data
 
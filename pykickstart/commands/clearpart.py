@@ -28,7 +28,7 @@ class FC3_ClearPart(KickstartCommand):
 
     def __init__(self, writePriority=120, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.drives = kwargs.get("drives", [])
         self.initAll = kwargs.get("initAll", False)
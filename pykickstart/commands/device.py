@@ -19,10 +19,9 @@
 #
 from pykickstart.version import versionToLongString, FC3, F24, F34
 from pykickstart.base import BaseData, DeprecatedCommand, KickstartCommand, RemovedCommand
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser
 
-import warnings
 from pykickstart.i18n import _
 
 class F8_DeviceData(BaseData):
@@ -43,6 +42,9 @@ class F8_DeviceData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.moduleName,)
+
     def __str__(self):
         retval = BaseData.__str__(self)
 
@@ -60,7 +62,7 @@ class FC3_Device(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.type = kwargs.get("type", "")
         self.moduleName = kwargs.get("moduleName", "")
@@ -152,8 +154,8 @@ class F8_Device(FC3_Device):
         dd.moduleName = extra[0]
 
         # Check for duplicates in the data list.
-        if dd in self.dataList():
-            warnings.warn(_("A module with the name %s has already been defined.") % dd.moduleName, KickstartParseWarning)
+        if self.findData(dd) is not None:
+            warn(_("A module with the name %s has already been defined.") % dd.moduleName, KickstartParseWarning)
 
         return dd
 
@@ -33,7 +33,7 @@ class FC3_DisplayMode(KickstartCommand):
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
         self.displayMode = kwargs.get("displayMode", None)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = KickstartCommand.__str__(self)
@@ -18,12 +18,11 @@
 # subject to the GNU General Public License and may only be used or replicated
 # with the express permission of Red Hat, Inc.
 #
-from pykickstart.errors import KickstartParseWarning
+from pykickstart.errors import KickstartParseWarning, warn
 from pykickstart.version import versionToLongString, FC6, F24, F34
 from pykickstart.base import BaseData, DeprecatedCommand, KickstartCommand, RemovedCommand
 from pykickstart.options import KSOptionParser
 
-import warnings
 from pykickstart.i18n import _
 
 class FC6_DmRaidData(BaseData):
@@ -46,6 +45,9 @@ class FC6_DmRaidData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.name, tuple(self.devices or []))
+
     def __str__(self):
         retval = BaseData.__str__(self)
         retval += "dmraid --name=%s" % self.name
@@ -61,7 +63,7 @@ class FC6_DmRaid(KickstartCommand):
 
     def __init__(self, writePriority=60, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.dmraids = kwargs.get("dmraids", [])
 
@@ -87,8 +89,8 @@ class FC6_DmRaid(KickstartCommand):
         dm.lineno = self.lineno
 
         # Check for duplicates in the data list.
-        if dm in self.dataList():
-            warnings.warn(_("A DM RAID device with the name %(name)s and devices %(devices)s has already been defined.") % {"name": dm.name, "devices": dm.devices}, KickstartParseWarning)
+        if self.findData(dm) is not None:
+            warn(_("A DM RAID device with the name %(name)s and devices %(devices)s has already been defined.") % {"name": dm.name, "devices": dm.devices}, KickstartParseWarning)
 
         return dm
 
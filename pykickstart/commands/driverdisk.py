@@ -94,7 +94,7 @@ class FC3_DriverDisk(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.driverdiskList = kwargs.get("driverdiskList", [])
 
@@ -29,7 +29,7 @@ class F20_Eula(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.agreed = kwargs.get("agreed", False)
 
     def __str__(self):
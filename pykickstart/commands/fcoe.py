@@ -18,11 +18,10 @@
 # with the express permission of Red Hat, Inc.
 #
 from pykickstart.version import F12, F13, F28, RHEL7
-from pykickstart.errors import KickstartParseWarning
+from pykickstart.errors import KickstartParseWarning, warn
 from pykickstart.base import BaseData, KickstartCommand
 from pykickstart.options import KSOptionParser
 
-import warnings
 from pykickstart.i18n import _
 
 class F12_FcoeData(BaseData):
@@ -42,6 +41,9 @@ class F12_FcoeData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.nic,)
+
     def _getArgsAsStr(self):
         retval = ""
 
@@ -118,7 +120,7 @@ class F12_Fcoe(KickstartCommand):
 
     def __init__(self, writePriority=71, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.fcoe = kwargs.get("fcoe", [])
 
     def __str__(self):
@@ -145,8 +147,8 @@ class F12_Fcoe(KickstartCommand):
         zd.lineno = self.lineno
 
         # Check for duplicates in the data list.
-        if zd in self.dataList():
-            warnings.warn(_("A FCOE device with the name %s has already been defined.") % zd.nic, KickstartParseWarning)
+        if self.findData(zd) is not None:
+            warn(_("A FCOE device with the name %s has already been defined.") % zd.nic, KickstartParseWarning)
 
         return zd
 
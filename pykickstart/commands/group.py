@@ -17,12 +17,11 @@
 # subject to the GNU General Public License and may only be used or replicated
 # with the express permission of Red Hat, Inc.
 #
-from pykickstart.errors import KickstartParseWarning
+from pykickstart.errors import KickstartParseWarning, warn
 from pykickstart.version import F12
 from pykickstart.base import BaseData, KickstartCommand
 from pykickstart.options import KSOptionParser
 
-import warnings
 from pykickstart.i18n import _
 
 class F12_GroupData(BaseData):
@@ -43,6 +42,9 @@ class F12_GroupData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.name,)
+
     def __str__(self):
         retval = BaseData.__str__(self)
         retval += "group"
@@ -60,7 +62,7 @@ class F12_Group(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.groupList = kwargs.get("groupList", [])
 
@@ -91,8 +93,8 @@ class F12_Group(KickstartCommand):
         gd.lineno = self.lineno
 
         # Check for duplicates in the data list.
-        if gd in self.dataList():
-            warnings.warn(_("A group with the name %s has already been defined.") % gd.name, KickstartParseWarning)
+        if self.findData(gd) is not None:
+            warn(_("A group with the name %s has already been defined.") % gd.name, KickstartParseWarning)
 
         return gd
 
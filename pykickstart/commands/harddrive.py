@@ -34,7 +34,7 @@ class FC3_HardDrive(KickstartCommand):
         self.partition = kwargs.get("partition", None)
         self.dir = kwargs.get("dir", None)
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.deleteRemovedAttrs()
 
@@ -29,7 +29,7 @@ class FC3_IgnoreDisk(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.ignoredisk = kwargs.get("ignoredisk", [])
 
@@ -27,7 +27,7 @@ class FC3_Interactive(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.interactive = kwargs.get("interactive", False)
 
     def __str__(self):
@@ -99,7 +99,7 @@ class FC6_Iscsi(KickstartCommand):
 
     def __init__(self, writePriority=71, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.iscsi = kwargs.get("iscsi", [])
 
@@ -31,7 +31,7 @@ class RHEL5_Key(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.key = kwargs.get("key", "")
         self.skip = kwargs.get("skip", False)
 
@@ -30,7 +30,7 @@ class FC3_Lang(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.lang = kwargs.get("lang", "")
 
     def __str__(self):
@@ -82,7 +82,7 @@ class F19_Lang(FC3_Lang):
         FC3_Lang.__init__(self, writePriority, *args, **kwargs)
         self.addsupport = kwargs.get("addsupport", [])
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         s = FC3_Lang.__str__(self)
@@ -29,7 +29,7 @@ class FC3_LangSupport(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.deflang = kwargs.get("deflang", "")
         self.supported = kwargs.get("supported", [])
@@ -32,7 +32,7 @@ class F19_Liveimg(KickstartCommand):
         self.proxy = kwargs.get("proxy", None)
         self.url = kwargs.get("url", None)
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __eq__(self, other):
         if not other:
@@ -20,10 +20,9 @@
 from pykickstart.version import FC3, FC4, F9, F12, F14, F15, F17, F18, F20, F21, F29
 from pykickstart.version import F23, RHEL5, RHEL6, RHEL7, RHEL8, versionToLongString
 from pykickstart.base import BaseData, KickstartCommand
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser, commaSplit, mountpoint
 
-import warnings
 from pykickstart.i18n import _
 
 class FC3_LogVolData(BaseData):
@@ -53,6 +52,9 @@ class FC3_LogVolData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.vgname, self.name)
+
     def _getArgsAsStr(self):
         retval = ""
 
@@ -392,7 +394,7 @@ class FC3_LogVol(KickstartCommand):
 
     def __init__(self, writePriority=133, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.lvList = kwargs.get("lvList", [])
 
@@ -478,8 +480,8 @@ class FC3_LogVol(KickstartCommand):
             lvd.preexist = True
 
         # Check for duplicates in the data list.
-        if lvd in self.dataList():
-            warnings.warn(_("A logical volume with the name %(logical_volume_name)s has already been defined in volume group %(volume_group)s.") % {"logical_volume_name": lvd.name, "volume_group": lvd.vgname}, KickstartParseWarning)
+        if self.findData(lvd) is not None:
+            warn(_("A logical volume with the name %(logical_volume_name)s has already been defined in volume group %(volume_group)s.") % {"logical_volume_name": lvd.name, "volume_group": lvd.vgname}, KickstartParseWarning)
 
         return lvd
 
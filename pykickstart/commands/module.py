@@ -46,6 +46,9 @@ class F29_ModuleData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.name, self.stream)
+
 
     def __str__(self):
         retval = BaseData.__str__(self)
@@ -92,7 +95,7 @@ class F29_Module(KickstartCommand):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
 
         self.moduleList = kwargs.get("moduleList", [])
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = ""
@@ -27,7 +27,7 @@ class FC3_Monitor(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.hsync = kwargs.get("hsync", "")
         self.monitor = kwargs.get("monitor", "")
@@ -47,6 +47,9 @@ class F27_MountData(BaseData):
     def __ne__(self, other):
         return not self == other
 
+    def identityKey(self):
+        return (self.mount_point,)
+
     def _getArgsAsStr(self):
         retval = "%s" % self.device
 
@@ -77,7 +80,7 @@ class F27_Mount(KickstartCommand):
 
     def __init__(self, *args, **kwargs):
         KickstartCommand.__init__(self, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.mount_points = kwargs.get("mount_points") or list()
 
     def __str__(self):
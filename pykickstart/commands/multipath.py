@@ -62,7 +62,7 @@ class FC6_MultiPath(KickstartCommand):
 
     def __init__(self, writePriority=50, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.mpaths = kwargs.get("mpaths", [])
 
@@ -23,9 +23,8 @@ from pykickstart.version import versionToLongString, RHEL4, RHEL5, RHEL6, RHEL7,
 from pykickstart.version import FC3, FC4, FC6, F8, F9, F16, F19, F20, F21, F22, F25, F27, F39
 from pykickstart.constants import BOOTPROTO_BOOTP, BOOTPROTO_DHCP, BOOTPROTO_IBFT, BOOTPROTO_QUERY, BOOTPROTO_STATIC, BIND_TO_MAC
 from pykickstart.options import KSOptionParser, ksboolean
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 
-import warnings
 from pykickstart.i18n import _
 
 MIN_VLAN_ID = 0
@@ -61,6 +60,9 @@ class FC3_NetworkData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.device,)
+
     def _getArgsAsStr(self):
         retval = ""
 
@@ -382,7 +384,7 @@ class FC3_Network(KickstartCommand):
         self.bootprotoList = [BOOTPROTO_DHCP, BOOTPROTO_BOOTP,
                               BOOTPROTO_STATIC]
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.network = kwargs.get("network", [])
 
@@ -493,8 +495,8 @@ class FC3_Network(KickstartCommand):
         nd.lineno = self.lineno
 
         # Check for duplicates in the data list.
-        if nd in self.dataList():
-            warnings.warn(_("A network device with the name %s has already been defined.") % nd.device, KickstartParseWarning)
+        if self.findData(nd) is not None:
+            warn(_("A network device with the name %s has already been defined.") % nd.device, KickstartParseWarning)
 
         return nd
 
@@ -30,7 +30,7 @@ class FC3_NFS(KickstartCommand):
         self.server = kwargs.get("server", None)
         self.dir = kwargs.get("dir", None)
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __eq__(self, other):
         if not other:
@@ -18,9 +18,8 @@
 # with the express permission of Red Hat, Inc.
 #
 
-import warnings
 from pykickstart.base import BaseData, KickstartCommand, DeprecatedCommand, RemovedCommand
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser, commaSplit
 from pykickstart.constants import NVDIMM_MODE_SECTOR, NVDIMM_ACTION_RECONFIGURE, \
     NVDIMM_ACTION_USE
@@ -51,6 +50,9 @@ class F28_NvdimmData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.action, self.namespace, tuple(self.blockdevs or []))
+
     def _getArgsAsStr(self):
         retval = "%s" % self.action
         if self.action == NVDIMM_ACTION_RECONFIGURE:
@@ -84,7 +86,7 @@ class F28_Nvdimm(KickstartCommand):
     def __init__(self, writePriority=80, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
         self.actionList = kwargs.get("actionList", [])
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = ""
@@ -141,13 +143,13 @@ class F28_Nvdimm(KickstartCommand):
             raise KickstartParseError(_("Only one of --namespace and --blockdevs device specifications can be used"))
 
         # Check for duplicates in the data list.
-        if nvdimm_data in self.dataList():
+        if self.findData(nvdimm_data) is not None:
             if nvdimm_data.namespace:
-                warnings.warn(_("An action %(action)s on namespace %(namespace)s has already been defined.")
-                              % {"action": action, "namespace": nvdimm_data.namespace}, KickstartParseWarning)
+                warn(_("An action %(action)s on namespace %(namespace)s has already been defined.")
+                     % {"action": action, "namespace": nvdimm_data.namespace}, KickstartParseWarning)
             if nvdimm_data.blockdevs:
-                warnings.warn(_("An action %(action)s on devices %(blockdevs)s has already been defined.")
-                              % {"action": action, "blockdevs": nvdimm_data.blockdevs}, KickstartParseWarning)
+                warn(_("An action %(action)s on devices %(blockdevs)s has already been defined.")
+                     % {"action": action, "blockdevs": nvdimm_data.blockdevs}, KickstartParseWarning)
 
         if action == NVDIMM_ACTION_RECONFIGURE:
             if not nvdimm_data.namespace:
@@ -26,7 +26,7 @@ class F38_OSTreeContainer(KickstartCommand):
 
     def __init__(self, *args, **kwargs):
         KickstartCommand.__init__(self, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.stateroot = kwargs.get('stateroot', None)
         self.url = kwargs.get('url', None)
         self.transport = kwargs.get("transport", None)
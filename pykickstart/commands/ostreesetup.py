@@ -27,7 +27,7 @@ class F21_OSTreeSetup(KickstartCommand):
 
     def __init__(self, *args, **kwargs):
         KickstartCommand.__init__(self, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.osname = kwargs.get('osname', None)
         self.remote = kwargs.get("remote", self.osname)
         self.url = kwargs.get('url', None)
@@ -20,10 +20,9 @@
 from pykickstart.version import RHEL5, RHEL6, RHEL8, versionToLongString
 from pykickstart.version import FC3, FC4, F9, F11, F12, F14, F17, F18, F23, F29, F34, F41
 from pykickstart.base import BaseData, KickstartCommand
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser, mountpoint
 
-import warnings
 from pykickstart.i18n import _
 
 class FC3_PartData(BaseData):
@@ -56,6 +55,9 @@ class FC3_PartData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.mountpoint,)
+
     def _getArgsAsStr(self):
         retval = ""
 
@@ -316,7 +318,7 @@ class FC3_Partition(KickstartCommand):
 
     def __init__(self, writePriority=130, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.partitions = kwargs.get("partitions", [])
 
@@ -457,8 +459,8 @@ class FC3_Partition(KickstartCommand):
         pd.mountpoint = ns.mntpoint[0]
 
         # Check for duplicates in the data list.
-        if pd.mountpoint != "swap" and pd in self.dataList():
-            warnings.warn(_("A partition with the mountpoint %s has already been defined.") % pd.mountpoint, KickstartParseWarning)
+        if pd.mountpoint != "swap" and self.findData(pd) is not None:
+            warn(_("A partition with the mountpoint %s has already been defined.") % pd.mountpoint, KickstartParseWarning)
 
         return pd
 
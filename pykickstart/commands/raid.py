@@ -21,10 +21,9 @@ from textwrap import dedent
 from pykickstart.version import versionToLongString, RHEL5, RHEL6, FC3, FC4, FC5, F29
 from pykickstart.version import F7, F9, F12, F13, F14, F15, F18, F23, F25, RHEL8
 from pykickstart.base import BaseData, KickstartCommand
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser, mountpoint
 
-import warnings
 from pykickstart.i18n import _
 
 class FC3_RaidData(BaseData):
@@ -51,6 +50,9 @@ class FC3_RaidData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.device,)
+
     def _getArgsAsStr(self):
         retval = ""
 
@@ -324,7 +326,7 @@ class FC3_Raid(KickstartCommand):
                          "RAID6": "RAID6", "6": "RAID6"}
 
         self.raidList = kwargs.get("raidList", [])
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = ""
@@ -454,8 +456,8 @@ class FC3_Raid(KickstartCommand):
             rd.members = ns.partitions
 
         # Check for duplicates in the data list.
-        if rd in self.dataList():
-            warnings.warn(_("A RAID device with the name %s has already been defined.") % rd.device, KickstartParseWarning)
+        if self.findData(rd) is not None:
+            warn(_("A RAID device with the name %s has already been defined.") % rd.device, KickstartParseWarning)
 
         if not rd.preexist and not rd.level:
             raise KickstartParseError("RAID Partition defined without RAID level", lineno=self.lineno)
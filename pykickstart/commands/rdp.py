@@ -25,7 +25,7 @@ class F43_RDP(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.enabled = kwargs.get("enabled", False)
         self.password = kwargs.get("password", "")
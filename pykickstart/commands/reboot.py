@@ -84,7 +84,7 @@ class FC6_Reboot(FC3_Reboot):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         FC3_Reboot.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.eject = kwargs.get("eject", False)
 
@@ -116,7 +116,7 @@ class F18_Reboot(FC6_Reboot):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         FC6_Reboot.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = FC6_Reboot.__str__(self)
@@ -156,7 +156,7 @@ class F23_Reboot(F18_Reboot):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         F18_Reboot.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.kexec = kwargs.get("kexec", False)
 
@@ -21,10 +21,9 @@ from textwrap import dedent
 from pykickstart.version import versionToLongString, F40
 from pykickstart.version import FC6, F8, F11, F13, F14, F15, F21, F27, F30, F33
 from pykickstart.base import BaseData, KickstartCommand
-from pykickstart.errors import KickstartError, KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartError, KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser, commaSplit, ksboolean
 
-import warnings
 from pykickstart.i18n import _
 
 class FC6_RepoData(BaseData):
@@ -46,6 +45,9 @@ class FC6_RepoData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.name,)
+
     def _getArgsAsStr(self):
         retval = ""
 
@@ -206,7 +208,7 @@ class FC6_Repo(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.repoList = kwargs.get("repoList", [])
         self.exclusive_required_options = [("mirrorlist", "--mirrorlist"),
@@ -290,8 +292,8 @@ class FC6_Repo(KickstartCommand):
         rd.lineno = self.lineno
 
         # Check for duplicates in the data list.
-        if rd in self.dataList():
-            warnings.warn(_("A repo with the name %s has already been defined.") % rd.name, KickstartParseWarning)
+        if self.findData(rd) is not None:
+            warn(_("A repo with the name %s has already been defined.") % rd.name, KickstartParseWarning)
 
         return rd
 
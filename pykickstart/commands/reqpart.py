@@ -31,7 +31,7 @@ class F23_ReqPart(KickstartCommand):
         self.reqpart = kwargs.get("reqpart", False)
         self.addBoot = kwargs.get("addBoot", False)
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def _getArgsAsStr(self):
         retval = ""
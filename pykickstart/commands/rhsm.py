@@ -29,7 +29,7 @@ class RHEL8_RHSM(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.organization = kwargs.get("organization", None)
         self.activation_keys = kwargs.get("activation_keys", None)
@@ -30,7 +30,7 @@ class FC6_Services(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.disabled = kwargs.get("disabled", [])
         self.enabled = kwargs.get("enabled", [])
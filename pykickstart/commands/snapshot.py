@@ -47,6 +47,9 @@ class F26_SnapshotData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.name, self.origin, self.when)
+
     def _getArgsAsStr(self):
         retval = ""
 
@@ -73,7 +76,7 @@ class F26_Snapshot(KickstartCommand):
         self.snapshotList = kwargs.get("snapshotList", [])
         self.whenMap = { "post-install": SNAPSHOT_WHEN_POST_INSTALL,
                          "pre-install": SNAPSHOT_WHEN_PRE_INSTALL }
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = ""
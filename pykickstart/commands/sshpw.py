@@ -19,9 +19,8 @@
 #
 from pykickstart.version import F13, F24
 from pykickstart.base import BaseData, KickstartCommand
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser
-import warnings
 
 from pykickstart.i18n import _
 
@@ -45,6 +44,9 @@ class F13_SshPwData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.username,)
+
     def __str__(self):
         retval = BaseData.__str__(self)
 
@@ -98,7 +100,7 @@ class F13_SshPw(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.sshUserList = kwargs.get("sshUserList", [])
 
@@ -166,8 +168,8 @@ class F13_SshPw(KickstartCommand):
         ud.password = " ".join(ns.password)
         ud.lineno = self.lineno
 
-        if ud in self.dataList():
-            warnings.warn(_("An ssh user with the name %s has already been defined.") % ud.username, KickstartParseWarning)
+        if self.findData(ud) is not None:
+            warn(_("An ssh user with the name %s has already been defined.") % ud.username, KickstartParseWarning)
 
         return ud
 
@@ -31,7 +31,7 @@ class RHEL8_Syspurpose(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.role = kwargs.get("role", None)
         self.sla = kwargs.get("sla", None)
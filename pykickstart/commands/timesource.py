@@ -80,7 +80,7 @@ class F33_Timesource(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.timesource_list = kwargs.get("timesource_list", [])
         self.exclusive_required_options = [("ntp_server", "--ntp-server"),
                                            ("ntp_pool", "--ntp-pool"),
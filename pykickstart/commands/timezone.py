@@ -17,11 +17,10 @@
 # subject to the GNU General Public License and may only be used or replicated
 # with the express permission of Red Hat, Inc.
 #
-import warnings
 from pykickstart.version import FC3, FC6, F18, F40
 from pykickstart.version import RHEL10
 from pykickstart.base import KickstartCommand
-from pykickstart.errors import KickstartParseError, KickstartDeprecationWarning
+from pykickstart.errors import KickstartParseError, KickstartDeprecationWarning, warn
 from pykickstart.options import KSOptionParser, commaSplit
 
 from pykickstart.i18n import _
@@ -32,7 +31,7 @@ class FC3_Timezone(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.isUtc = kwargs.get("isUtc", False)
         self.timezone = kwargs.get("timezone", "")
@@ -112,7 +111,7 @@ class FC6_Timezone(FC3_Timezone):
 class F18_Timezone(FC6_Timezone):
     def __init__(self, writePriority=0, *args, **kwargs):
         FC6_Timezone.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.nontp = kwargs.get("nontp", False)
         self.ntpservers = kwargs.get("ntpservers", set())
 
@@ -215,7 +214,7 @@ class F23_Timezone(F18_Timezone):
 class RHEL7_Timezone(F18_Timezone):
     def __init__(self, writePriority=0, *args, **kwargs):
         F18_Timezone.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def _getParser(self):
         op = KSOptionParser(prog="timezone", description="""
@@ -290,7 +289,7 @@ class RHEL7_Timezone(F18_Timezone):
 class F25_Timezone(F23_Timezone):
     def __init__(self, writePriority=0, *args, **kwargs):
         F23_Timezone.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = KickstartCommand.__str__(self)
@@ -396,7 +395,7 @@ class F32_Timezone(F25_Timezone):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         F25_Timezone.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def _getArgsAsStr(self):
         retval = ""
@@ -419,10 +418,10 @@ class F32_Timezone(F25_Timezone):
         F25_Timezone.parse(self, args)
 
         if "--isUtc" in args:
-            warnings.warn(_("The option --isUtc will be deprecated in future releases. Please "
-                            "modify your kickstart file to replace this option with its preferred "
-                            "alias --utc."),
-                          KickstartDeprecationWarning)
+            warn(_("The option --isUtc will be deprecated in future releases. Please "
+                   "modify your kickstart file to replace this option with its preferred "
+                   "alias --utc."),
+                 KickstartDeprecationWarning)
 
         return self
 
@@ -431,22 +430,22 @@ class F33_Timezone(F32_Timezone):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         F32_Timezone.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def parse(self, args):
         F32_Timezone.parse(self, args)
 
         if self.ntpservers:
-            warnings.warn(_("The option --ntpservers will be deprecated in future releases. Please "
-                            "modify your kickstart file to replace this option with "
-                            "timesource --ntp-server <server hostname> command invocation, "
-                            "one per NTP server."),
-                          KickstartDeprecationWarning)
+            warn(_("The option --ntpservers will be deprecated in future releases. Please "
+                   "modify your kickstart file to replace this option with "
+                   "timesource --ntp-server <server hostname> command invocation, "
+                   "one per NTP server."),
+                 KickstartDeprecationWarning)
         if self.nontp:
-            warnings.warn(_("The option --nontp will be deprecated in future releases. Please "
-                            "modify your kickstart file to replace this option with "
-                            "timesource --ntp-disable command invocation."),
-                          KickstartDeprecationWarning)
+            warn(_("The option --nontp will be deprecated in future releases. Please "
+                   "modify your kickstart file to replace this option with "
+                   "timesource --ntp-disable command invocation."),
+                 KickstartDeprecationWarning)
         return self
 
 
@@ -477,7 +476,7 @@ class RHEL10_Timezone(F32_Timezone):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         F32_Timezone.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.deleteRemovedAttrs()
 
     def _getParser(self):
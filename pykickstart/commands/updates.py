@@ -32,7 +32,7 @@ class F7_Updates(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.url = kwargs.get("url", "")
 
     def __str__(self):
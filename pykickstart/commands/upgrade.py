@@ -32,7 +32,7 @@ class FC3_Upgrade(KickstartCommand):
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
         self.upgrade = kwargs.get("upgrade", None)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __str__(self):
         retval = KickstartCommand.__str__(self)
@@ -75,7 +75,7 @@ class F11_Upgrade(FC3_Upgrade):
     def __init__(self, writePriority=0, *args, **kwargs):
         FC3_Upgrade.__init__(self, writePriority, *args, **kwargs)
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.root_device = kwargs.get("root_device", None)
 
     def __str__(self):
@@ -32,7 +32,7 @@ class FC3_Url(KickstartCommand):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
         self.url = kwargs.get("url", None)
 
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
     def __eq__(self, other):
         if not other:
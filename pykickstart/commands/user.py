@@ -17,12 +17,11 @@
 # subject to the GNU General Public License and may only be used or replicated
 # with the express permission of Red Hat, Inc.
 #
-from pykickstart.errors import KickstartParseWarning
+from pykickstart.errors import KickstartParseWarning, warn
 from pykickstart.version import FC6, F8, F12, F19, F24
 from pykickstart.base import BaseData, KickstartCommand
 from pykickstart.options import KSOptionParser, commaSplit
 
-import warnings
 from pykickstart.i18n import _
 
 class FC6_UserData(BaseData):
@@ -48,6 +47,9 @@ class FC6_UserData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.name,)
+
     def __str__(self):
         retval = BaseData.__str__(self)
 
@@ -135,7 +137,7 @@ class FC6_User(KickstartCommand):
 
     def __init__(self, writePriority=0, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.userList = kwargs.get("userList", [])
 
@@ -201,8 +203,8 @@ class FC6_User(KickstartCommand):
         ud.lineno = self.lineno
 
         # Check for duplicates in the data list.
-        if ud in self.dataList():
-            warnings.warn(_("A user with the name %s has already been defined.") % ud.name, KickstartParseWarning)
+        if self.findData(ud) is not None:
+            warn(_("A user with the name %s has already been defined.") % ud.name, KickstartParseWarning)
 
         return ud
 
@@ -19,10 +19,9 @@
 #
 from pykickstart.version import FC3, F16, F21
 from pykickstart.base import BaseData, KickstartCommand
-from pykickstart.errors import KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartParseError, KickstartParseWarning, warn
 from pykickstart.options import KSOptionParser
 
-import warnings
 from pykickstart.i18n import _
 
 class FC3_VolGroupData(BaseData):
@@ -46,6 +45,9 @@ class FC3_VolGroupData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.vgname,)
+
     def _getArgsAsStr(self):
         retval = ""
         if not self.format:
@@ -107,7 +109,7 @@ class FC3_VolGroup(KickstartCommand):
 
     def __init__(self, writePriority=132, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.vgList = kwargs.get("vgList", [])
 
@@ -182,8 +184,8 @@ class FC3_VolGroup(KickstartCommand):
             vg.physvols = ns.partitions
 
         # Check for duplicates in the data list.
-        if vg in self.dataList():
-            warnings.warn(_("A volgroup with the name %s has already been defined.") % vg.vgname, KickstartParseWarning)
+        if self.findData(vg) is not None:
+            warn(_("A volgroup with the name %s has already been defined.") % vg.vgname, KickstartParseWarning)
 
         return vg
 
@@ -17,9 +17,8 @@
 # subject to the GNU General Public License and may only be used or replicated
 # with the express permission of Red Hat, Inc.
 #
-import warnings
 
-from pykickstart.errors import KickstartDeprecationWarning
+from pykickstart.errors import KickstartDeprecationWarning, warn
 from pykickstart.version import FC3
 from pykickstart.base import KickstartCommand
 from pykickstart.options import KSOptionParser
@@ -32,7 +31,7 @@ class FC3_ZeroMbr(KickstartCommand):
 
     def __init__(self, writePriority=110, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.zerombr = kwargs.get("zerombr", False)
 
     def __str__(self):
@@ -59,7 +58,7 @@ class FC3_ZeroMbr(KickstartCommand):
         extra = self.op.parse_known_args(args=args, lineno=self.lineno)[1]
 
         if extra:
-            warnings.warn(_("Ignoring deprecated option on line %s:  The zerombr command no longer takes any options.  In future releases, this will result in a fatal error from kickstart.  Please modify your kickstart file to remove any options.") % self.lineno, KickstartDeprecationWarning)
+            warn(_("Ignoring deprecated option on line %s:  The zerombr command no longer takes any options.  In future releases, this will result in a fatal error from kickstart.  Please modify your kickstart file to remove any options.") % self.lineno, KickstartDeprecationWarning)
 
         self.zerombr = True
         return self
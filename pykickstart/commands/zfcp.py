@@ -19,12 +19,11 @@
 #
 from textwrap import dedent
 
-from pykickstart.errors import KickstartParseWarning, KickstartParseError
+from pykickstart.errors import KickstartParseWarning, KickstartParseError, warn
 from pykickstart.version import FC3, F12, F14, F37, versionToLongString
 from pykickstart.base import BaseData, KickstartCommand
 from pykickstart.options import KSOptionParser
 
-import warnings
 from pykickstart.i18n import _
 
 class FC3_ZFCPData(BaseData):
@@ -50,6 +49,9 @@ class FC3_ZFCPData(BaseData):
     def __ne__(self, y):
         return not self == y
 
+    def identityKey(self):
+        return (self.devnum, self.wwpn, self.fcplun, self.scsiid, self.scsilun)
+
     def __str__(self):
         retval = BaseData.__str__(self)
         retval += "zfcp"
@@ -82,6 +84,9 @@ class F12_ZFCPData(FC3_ZFCPData):
         return self.devnum == y.devnum and self.wwpn == y.wwpn and \
                self.fcplun == y.fcplun
 
+    def identityKey(self):
+        return (self.devnum, self.wwpn, self.fcplun)
+
 class F14_ZFCPData(F12_ZFCPData):
     pass
 
@@ -97,7 +102,7 @@ class FC3_ZFCP(KickstartCommand):
 
     def __init__(self, writePriority=71, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
 
         self.zfcp = kwargs.get("zfcp", [])
 
@@ -131,8 +136,8 @@ class FC3_ZFCP(KickstartCommand):
         zd.lineno = self.lineno
 
         # Check for duplicates in the data list.
-        if zd in self.dataList():
-            warnings.warn(_("A zfcp with this information has already been defined."), KickstartParseWarning)
+        if self.findData(zd) is not None:
+            warn(_("A zfcp with this information has already been defined."), KickstartParseWarning)
 
         return zd
 
@@ -28,7 +28,7 @@ class F32_Zipl(KickstartCommand):
 
     def __init__(self, writePriority=10, *args, **kwargs):
         KickstartCommand.__init__(self, writePriority, *args, **kwargs)
-        self.op = self._getParser()
+        self.op = self._getCachedParser()
         self.secure_boot = kwargs.get("secure_boot", SECURE_BOOT_DEFAULT)
 
     def _getParser(self):
@@ -41,7 +41,21 @@ And some warning classes:
     KickstartDeprecationWarning - A class for warnings occurring during parsing
                                   related to deprecated commands and options.
 
+And a function for issuing those warnings:
+
+    warn - Issue a KickstartParseWarning, giving the parser running in the
+           current thread a chance to handle it first.
+
+And classes for collecting them instead:
+
+    Diagnostic - One error or warning found while parsing.
+
+    Diagnostics - A list of Diagnostic entries that a parser adds to.
+
 """
+from collections import namedtuple
+
+import threading
 import warnings
 from pykickstart.i18n import _
 
@@ -88,12 +102,30 @@ class KickstartError(Exception):
         if isinstance(msg, tuple) and len(msg) == 2:
             self.lineno, self.message = msg
 
-        # Keep the value attribute for backwards compatibility.
-        self.value = self.message
+        # Format the error message if it is allowed, but only once it's first
+        # asked for.  Many errors are caught and never shown, and formatting
+        # means looking up a translation.
+        self._value = self.message
+        self._unformatted = None
 
-        # Format the error message if it is allowed.
         if formatting and self.lineno is not None:
-            self.value = _format_error_message(self.lineno, self.message)
+            self._unformatted = (self.lineno, self.message)
+
+    @property
+    def value(self):
+        """The error message, formatted with the line number if formatting
+           is allowed.  Kept for backwards compatibility.
+        """
+        if self._unformatted is not None:
+            self._value = _format_error_message(*self._unformatted)
+            self._unformatted = None
+
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._unformatted = None
 
     def __str__(self):
         return self.value
@@ -125,3 +157,124 @@ class KickstartDeprecationWarning(KickstartParseWarning, DeprecationWarning):
     """A class for warnings occurring during parsing related to using deprecated
        commands and options.
     """
+
+# The warning handler of the parser currently reading input in each thread.
+_warningHandler = threading.local()
+
+def _setWarningHandler(func):
+    """Make func the warning handler for the current thread, returning the
+       previous one so it can be restored.
+    """
+    prev = getattr(_warningHandler, "func", None)
+    _warningHandler.func = func
+    return prev
+
+def warn(message, category=KickstartParseWarning, stacklevel=1):
+    """Issue a warning found while parsing.  If a KickstartParser is reading
+       input in this thread, its warning handler is called with message and
+       category first and may raise an exception or return True to say the
+       warning has been dealt with.  Otherwise, this is warnings.warn.
+
+       This lets parsers in different threads treat warnings differently
+       without changing the process-wide warnings filters.
+    """
+    func = getattr(_warningHandler, "func", None)
+    if func is not None and func(message, category):
+        return
+
+    warnings.warn(message, category, stacklevel=stacklevel + 1)
+
+# Severities of a Diagnostic.
+ERROR = "error"
+WARNING = "warning"
+
+class Diagnostic(namedtuple("Diagnostic", ["severity", "category", "lineno", "span", "detail"])):
+    """One error or warning found while parsing.
+
+       severity -- ERROR or WARNING.
+       category -- The class of the exception or warning.
+       lineno   -- The line number it was found on, if known.
+       span     -- The pykickstart.parser.SourceSpan of the command or section
+                   header being handled when it was found, or None.
+       detail   -- The exception for an error, or the message of a warning.
+    """
+    __slots__ = ()
+
+    @property
+    def message(self):
+        """The message, formatted the same as it would have been printed.
+           Errors are only formatted when this is first asked for.
+        """
+        return str(self.detail)
+
+    def __str__(self):
+        return self.message
+
+class Diagnostics(object):
+    """Somewhere for a KickstartParser to put the errors it finds when
+       errorsAreFatal is False, instead of printing them to stderr, and
+       optionally the warnings as well, instead of passing them to the
+       warnings module.  Set one as the diagnostics attribute of a parser.
+       Subclasses can override add to do something else with each entry.
+    """
+    def __init__(self, captureWarnings=False, limit=None):
+        """Create a new Diagnostics instance.  Instance attributes:
+
+           captureWarnings -- Should warnings be added here instead of being
+                              passed to the warnings module?  Warnings that
+                              warningsAreErrors turns into errors are added
+                              as errors either way.
+           entries         -- The Diagnostic entries added so far.
+           limit           -- How many entries to take before the parser
+                              stops reading its input, or None for no limit.
+                              A line can add several entries, so the limit
+                              may be reached partway through one.  Entries
+                              past it are dropped, and the parser stops
+                              before the next line.
+           truncated       -- Were entries dropped, or did the parser stop
+                              early, because the limit was reached?
+        """
+        self.captureWarnings = captureWarnings
+        self.entries = []
+        self.limit = limit
+        self.truncated = False
+
+    @property
+    def full(self):
+        """Has the limit been reached?"""
+        return self.limit is not None and len(self.entries) >= self.limit
+
+    @property
+    def errors(self):
+        return [entry for entry in self.entries if entry.severity == ERROR]
+
+    @property
+    def warnings(self):
+        return [entry for entry in self.entries if entry.severity == WARNING]
+
+    def add(self, entry):
+        """Called with each new Diagnostic."""
+        self.entries.append(entry)
+
+    def addError(self, exc, span=None):
+        if self.full:
+            self.truncated = True
+            return
+
+        # The traceback would keep every frame it went through alive for as
+        # long as the entry is kept, which adds up over many files.
+        exc.__traceback__ = None
+        exc.__context__ = None
+        self.add(Diagnostic(ERROR, exc.__class__, getattr(exc, "lineno", None), span, exc))
+
+    def addWarning(self, message, category, span=None):
+        if self.full:
+            self.truncated = True
+            return
+
+        lineno = span.startLine if span is not None else None
+        self.add(Diagnostic(WARNING, category, lineno, span, message))
+
+    def clear(self):
+        self.entries = []
+        self.truncated = False
@@ -19,32 +19,43 @@
 #
 __all__ = ["commandMap", "dataMap"]
 
-import os
-import sys
-import importlib
-
-commandMap = {}
-dataMap = {}
-
-if not commandMap:
-    _path = os.path.dirname(__file__)
-    if not _path in sys.path:
-        sys.path.append(_path)
-
-    for name in os.listdir(os.path.dirname(__file__)):
-        if not (name.startswith("fc") or name.startswith("f") or name.startswith("rhel")):
-            continue
-
-        if not name.endswith(".py"):
-            continue
-
-        obj = importlib.import_module(name.replace(".py", ""))
-        if not obj.__all__ or not obj.__all__[0].endswith("Handler"):
-            continue
-
-        # Now we've got a WhateverHandler module in obj.  This module should
-        # export one class named WhateverHandler, which we can get at indirectly
-        # through __all__, like so:
-        handler = obj.__dict__[obj.__all__[0]]
-        commandMap[handler.version] = handler.commandMap
-        dataMap[handler.version] = handler.dataMap
+from collections.abc import Mapping
+
+from pykickstart.version import returnClassForVersion, versionMap
+
+class _HandlerMap(Mapping):
+    """A read-only dict from each syntax version to one of the maps of its
+       handler class.  The handler module for a version is only imported the
+       first time that version is looked up, so programs that use a single
+       version don't pay for loading all the others.
+
+       Every version in pykickstart.version.versionMap has a handler module
+       named after it, so the keys are known without looking at the
+       handlers directory.
+    """
+    def __init__(self, attr):
+        self._attr = attr
+
+    def __getitem__(self, version):
+        if version not in _versions:
+            raise KeyError(version)
+
+        return getattr(returnClassForVersion(version), self._attr)
+
+    def __contains__(self, version):
+        return version in _versions
+
+    def __iter__(self):
+        return iter(_versions)
+
+    def __len__(self):
+        return len(_versions)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+# Each version once, in the order they appear in versionMap.
+_versions = dict.fromkeys(versionMap.values())
+
+commandMap = _HandlerMap("commandMap")
+dataMap = _HandlerMap("dataMap")
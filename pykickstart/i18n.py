@@ -27,4 +27,27 @@ def _find_locale_files():
     gettext.bindtextdomain("pykickstart", locale_path)
 _find_locale_files()
 
-_ = lambda x: gettext.translation("pykickstart", fallback=True).gettext(x) if x != "" else ""
+# The translation messages are looked up in, or None until the first one is.
+# Finding it probes the environment and the file system, which is slow
+# enough to show up when many messages are produced, so it is only done
+# again after reset_translation is called.
+_translation = None
+
+def _get_translation():
+    global _translation
+
+    translation = _translation
+    if translation is None:
+        translation = gettext.translation("pykickstart", fallback=True)
+        _translation = translation
+
+    return translation
+
+def reset_translation():
+    '''Forget the translation found for earlier messages.  Call this after
+    changing the language through LANGUAGE, LC_ALL, LC_MESSAGES or LANG, so
+    the following messages are translated for the new one.'''
+    global _translation
+    _translation = None
+
+_ = lambda x: _get_translation().gettext(x) if x != "" else ""
@@ -0,0 +1,474 @@
+#
+# incremental.py:  Kickstart parser that follows edits to its input.
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use, modify,
+# copy, or redistribute it subject to the terms and conditions of the GNU
+# General Public License v.2.  This program is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY expressed or implied, including the
+# implied warranties of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the Free Software Foundation, Inc., 51
+# Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.  Any Red Hat
+# trademarks that are incorporated in the source code or documentation are not
+# subject to the GNU General Public License and may only be used or replicated
+# with the express permission of Red Hat, Inc.
+#
+"""
+Incremental kickstart file processing, for editors.
+
+This module exports one class:
+
+    IncrementalParser - A KickstartParser that updates its handler for an edit
+                        to the text it read, without reading all of it again.
+"""
+from bisect import bisect_right
+from itertools import accumulate
+
+from pykickstart.errors import _setWarningHandler
+from pykickstart.parser import KickstartParser, SourceSpan, _byteLength, _splitLine
+from pykickstart.sections import ScriptSection
+
+__all__ = ["IncrementalParser"]
+
+class _CommandLine(object):
+    """A line of the command section, as it was given to handleCommand."""
+    def __init__(self, lineno, span, args, line):
+        self.lineno = lineno
+        self.span = span
+        self.args = args
+        self.line = line
+        self.errors = 0
+        self.cls = None
+        self.known = False
+
+class _SectionRecord(object):
+    """A section that was read, and the Script it made if any."""
+    def __init__(self, section, span, script):
+        self.section = section
+        self.span = span
+        self.script = script
+
+def _lineStarts(lines, offset=0):
+    """Return the offset each of lines starts at, if the first starts at
+       offset.
+    """
+    return list(accumulate((len(line) for line in lines), initial=offset))[:-1]
+
+# Where str.splitlines ends a line.
+_lineBreaks = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+def _startsLine(text, pos):
+    """Does a line of text start at pos?"""
+    if pos == 0:
+        return True
+
+    return text[pos - 1] in _lineBreaks and not (text[pos - 1] == "\r" and text[pos:pos + 1] == "\n")
+
+def _shift(span, lines, offset):
+    return span._replace(startLine=span.startLine + lines, endLine=span.endLine + lines,
+                         startOffset=span.startOffset + offset, endOffset=span.endOffset + offset)
+
+class IncrementalParser(KickstartParser):
+    """A KickstartParser for programs like editors, that read a kickstart file
+       from a string and then keep changing it a little at a time.  After
+       readKickstartFromString, applyEdit changes the text and brings the
+       handler up to date with it.  The handler then looks the same as a new
+       handler would after a new parser read the new text: the same output,
+       data objects, scripts, line numbers, spans, and errorsCount.
+
+       An edit to lines of the command section only dispatches those lines
+       again, along with the other lines for the same commands and for any
+       commands that conflict with them, all on new command objects.  An
+       edit inside the body of a %pre, %post, or other script only changes
+       the text of that Script.  Either way the objects from later in the
+       file get new line numbers and spans, and all others are left as they
+       are.  Any other edit, and any edit to a file that uses %include or
+       %ksappend, reads the whole text again with a handler from
+       handler.fresh(), which then replaces this parser's handler.
+
+       Sections are set up again with setupSections when the text is read
+       again, so sections registered some other way are lost then.
+    """
+    def __init__(self, handler, **kwargs):
+        """Create a new IncrementalParser instance.  It takes the same
+           arguments as KickstartParser.  Instance attributes:
+
+           text         -- The text last read with readKickstartFromString,
+                           with all edits applied since.  This is None until
+                           then, and after input is read in any other way.
+        """
+        KickstartParser.__init__(self, handler, **kwargs)
+        self.text = None
+
+        # Whether the last read was of self.text alone, and what it was made
+        # of: the offset each line starts at, the command lines, and the
+        # sections.  See applyEdit.
+        self._incremental = False
+        self._starting = False
+        self._lineStarts = []
+        self._commandLines = None
+        self._sectionRecords = None
+
+        # The command line being dispatched again, if any.
+        self._replaying = None
+
+    def readKickstartFromString(self, s, reset=True):
+        if not reset:
+            KickstartParser.readKickstartFromString(self, s, reset=reset)
+            return
+
+        self.text = s
+        self._incremental = False
+        self._commandLines = []
+        self._sectionRecords = []
+        self._starting = True
+
+        try:
+            KickstartParser.readKickstartFromString(self, s, reset=reset)
+        finally:
+            self._starting = False
+
+        self._lineStarts = _lineStarts(s.splitlines(True))
+        self._incremental = self._commandLines is not None
+
+    def _readLines(self, lines):
+        if self._includeDepth > 0:
+            # The objects from an %include are mixed in with the others,
+            # which an edit can't tell apart.
+            self._commandLines = None
+        elif self._starting:
+            self._starting = False
+        else:
+            self.text = None
+            self._incremental = False
+            self._commandLines = None
+
+        KickstartParser._readLines(self, lines)
+
+    def handleCommand(self, lineno, args):
+        record = self._replaying
+        if record is None and self._commandLines is not None:
+            record = _CommandLine(lineno, self.handler.currentSpan, args, self._line)
+            self._commandLines.append(record)
+
+        try:
+            return KickstartParser.handleCommand(self, lineno, args)
+        except Exception:
+            if record is not None:
+                record.errors += 1
+
+            raise
+
+    def _finalize(self, obj):
+        count = len(self.handler.scripts)
+        KickstartParser._finalize(self, obj)
+
+        if self._sectionRecords is not None:
+            script = self.handler.scripts[-1] if len(self.handler.scripts) > count else None
+            self._sectionRecords.append(_SectionRecord(obj, obj.span, script))
+
+    def applyEdit(self, start, end, replacement):
+        """Replace the characters of text from start up to end with the
+           string replacement, and update the handler to match.  Errors and
+           warnings are handled as they are while reading.  Raises ValueError
+           if no text has been read from a string, or the range is not in it.
+        """
+        if self.text is None:
+            raise ValueError("no kickstart text to edit")
+
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError("edit range %s-%s is outside the text" % (start, end))
+
+        text = self.text[:start] + replacement + self.text[end:]
+
+        try:
+            done = self._incremental and self._update(start, end, text)
+        except Exception:   # pylint: disable=broad-except
+            # Something went wrong part of the way through, most likely an
+            # error with errorsAreFatal set.  Reading it all again gets the
+            # handler right and raises the error again.
+            done = False
+
+        if not done:
+            self._reparse(text)
+
+    def _reparse(self, text):
+        self.handler = self.handler.fresh()
+        self.errorsCount = 0
+        self.setupSections()
+        self.readKickstartFromString(text)
+
+    def _lineText(self, lineno):
+        starts = self._lineStarts
+        end = starts[lineno] if lineno < len(starts) else len(self.text)
+        return self.text[starts[lineno - 1]:end]
+
+    def _isTerminated(self, record):
+        try:
+            return _splitLine(self._lineText(record.span.endLine))[:1] == ["%end"]
+        except ValueError:
+            return False
+
+    def _mayEndScript(self, line):
+        """Could line start or end a section, if it were in a script?  This
+           is the same test _readSection makes.
+        """
+        stripped = line.lstrip()
+        if not stripped.startswith(tuple(self._sections) + ("%end", "%include")):
+            return False
+
+        word = stripped.split(None, 1)[0]
+        return self._validState(word) or word in ("%end", "%include")
+
+    def _commandClass(self, name):
+        """Return the class of the object for command name, or None if there
+           is no such command or it is not handled.
+        """
+        if name in self.handler.commands and self.handler.commands[name] is not None:
+            return self.handler.commands[name].__class__
+        else:
+            return None
+
+    def _recordClass(self, record):
+        if not record.known:
+            record.cls = self._commandClass(record.args[0])
+            record.known = True
+
+        return record.cls
+
+    def _parsedObjects(self):
+        """Yield every object of the handler that a span could be set on."""
+        found = set()
+
+        for name in self.handler.commands:
+            cmd = self.handler.commands.peek(name)
+            if cmd is None or id(cmd) in found:
+                continue
+
+            found.add(id(cmd))
+            yield cmd
+            yield from cmd.dataList() or []
+
+        yield from self.handler.scripts
+        yield from self.handler.certificates
+
+        if getattr(self.handler, "packages", None) is not None:
+            yield self.handler.packages
+
+    def _shiftAfter(self, lineno, lines, offset):
+        """Move everything the handler has from after line lineno down by
+           lines lines and offset bytes.
+        """
+        if lines == 0 and offset == 0:
+            return
+
+        for obj in self._parsedObjects():
+            span = obj.span
+            if span is None or span.source != 0 or span.startLine <= lineno:
+                continue
+
+            obj.span = _shift(span, lines, offset)
+            if getattr(obj, "lineno", None) == span.startLine:
+                obj.lineno += lines
+
+        for record in self._sectionRecords:
+            if record.span.startLine > lineno:
+                record.span = _shift(record.span, lines, offset)
+
+        for record in self._commandLines:
+            if record.lineno > lineno:
+                record.lineno += lines
+                record.span = _shift(record.span, lines, offset)
+
+    def _resetCommand(self, name):
+        """Replace the object for command name with a new one, under all of
+           the names the old one was known by.
+        """
+        commands = self.handler.commands
+        old = commands[name]
+        self.handler.resetCommand(name)
+        new = commands[name]
+
+        for other in commands:
+            if commands.peek(other) is old:
+                commands[other] = new
+
+    def _update(self, start, end, text):
+        """Update the handler for an edit without reading all of text, if
+           the edit is one that can be.  Nothing is changed before it's
+           certain the edit can be done.  Returns whether it was.
+        """
+        old = self.text
+        starts = self._lineStarts
+
+        # The edit touches lines a up to b, counting from zero.  The lines
+        # next to it are only touched if it joins them to its own, or splits
+        # a "\r\n" line ending or makes one.
+        growth = len(text) - len(old)
+        a = max(bisect_right(starts, start) - 1, 0)
+        if a > 0 and starts[a] == start and old[start - 1] == "\r":
+            a -= 1
+
+        b = bisect_right(starts, end)
+        if a < b and starts[b - 1] == end and _startsLine(text, end + growth):
+            b -= 1
+
+        regionStart = starts[a] if starts else 0
+        regionEnd = starts[b] if b < len(starts) else len(old)
+
+        oldRegion = old[regionStart:regionEnd]
+        newRegion = text[regionStart:regionEnd + growth]
+        oldLines = oldRegion.splitlines(True)
+        newLines = newRegion.splitlines(True)
+        lines = len(newLines) - len(oldLines)
+
+        if any(line[:10] == "#platform=" for line in oldLines + newLines):
+            return False
+
+        # Find the section the edit is in, or the last one before it.
+        # Everything after a section that doesn't end with %end is part of
+        # it, so there are no command lines to edit there.
+        section = None
+        for record in self._sectionRecords:
+            if record.span.startLine > b:
+                break
+
+            section = record
+
+        byteStart = _byteLength(old[:regionStart])
+        offset = _byteLength(newRegion) - _byteLength(oldRegion)
+
+        if section is None or section.span.endLine <= a:
+            if section is not None and not self._isTerminated(section):
+                return False
+
+            done = self._updateCommands(a, b, oldLines, newLines, byteStart, lines, offset)
+        elif section.span.startLine <= a and b < section.span.endLine \
+             and section.script is not None and isinstance(section.section, ScriptSection) \
+             and self._isTerminated(section):
+            done = self._updateScript(section, a, b, newRegion, oldLines + newLines, lines, offset)
+        else:
+            done = False
+
+        if done:
+            self._lineStarts = starts[:a] + _lineStarts(newLines, regionStart) \
+                + [s + growth for s in starts[b:]]
+            self.text = text
+
+        return done
+
+    def _updateScript(self, section, a, b, newRegion, changed, lines, offset):
+        if any(self._mayEndScript(line) for line in changed):
+            return False
+
+        script = section.script
+        starts = self._lineStarts
+        bodyStart = starts[section.span.startLine]
+        bodyEnd = starts[section.span.endLine - 1]
+
+        # The body of a script can start with the lines of blank scripts
+        # before it, which are best left to a full read.
+        if not isinstance(script.script, str) or len(script.script) != bodyEnd - bodyStart:
+            return False
+
+        body = script.script[:starts[a] - bodyStart] + newRegion + script.script[starts[b] - bodyStart:]
+        if body == "" or body.isspace():
+            return False
+
+        self._shiftAfter(b, lines, offset)
+        script.script = body
+        section.span = section.span._replace(endLine=section.span.endLine + lines,
+                                             endOffset=section.span.endOffset + offset)
+        script.span = section.span
+        return True
+
+    def _updateCommands(self, a, b, oldLines, newLines, byteStart, lines, offset):
+        for line in oldLines:
+            if not self._isBlankOrComment(line) and line.lstrip().startswith("%"):
+                return False
+
+        # Split the new lines the same way _stateMachine does.
+        added = []
+        lineno = a
+        end = byteStart
+
+        for line in newLines:
+            lineno += 1
+            start = end
+            end += _byteLength(line)
+
+            if self._isBlankOrComment(line):
+                continue
+
+            try:
+                args = _splitLine(line, comments=True)
+            except ValueError:
+                return False
+
+            if not args or not args[0] or args[0][0] == "%":
+                return False
+
+            added.append(_CommandLine(lineno, SourceSpan(0, lineno, lineno, start, end), args, line))
+
+        linenos = [record.lineno for record in self._commandLines]
+        i = bisect_right(linenos, a)
+        j = bisect_right(linenos, b)
+        (before, removed, after) = (self._commandLines[:i], self._commandLines[i:j], self._commandLines[j:])
+        records = before + added + after
+
+        # The commands on the edited lines are parsed again, and so is every
+        # other command in the file they conflict with or that conflicts
+        # with them, since those check whether the others have been seen.
+        names = {}
+        for record in removed + added + records:
+            names.setdefault(self._recordClass(record), record.args[0])
+
+        names.pop(None, None)
+        conflicts = dict((cls, set(self._commandClass(name) for name in cls.conflictingCommands))
+                         for cls in names)
+        affected = set(record.cls for record in removed + added) - {None}
+
+        while True:
+            more = set(cls for cls in set(names) - affected
+                       if any(cls in conflicts[other] or other in conflicts[cls] for other in affected))
+            if not more:
+                break
+
+            affected |= more
+
+        addedIds = set(id(record) for record in added)
+        replay = [record for record in records if record.cls in affected or id(record) in addedIds]
+
+        self.errorsCount -= sum(record.errors for record in removed)
+        self.errorsCount -= sum(record.errors for record in before + after if record.cls in affected)
+
+        self._shiftAfter(b, lines, offset)
+        self._commandLines = records
+
+        for cls in affected:
+            self._resetCommand(names[cls])
+
+        prev = _setWarningHandler(self._handleWarning)
+        try:
+            for record in replay:
+                self._replay(record)
+        finally:
+            _setWarningHandler(prev)
+
+        return True
+
+    def _replay(self, record):
+        self._line = record.line
+        self._lineSpan = record.span
+        self.handler.currentSpan = record.span
+        record.errors = 0
+        self._replaying = record
+
+        try:
+            self._tryFunc(lambda: self.handleCommand(record.lineno, record.args))
+        finally:
+            self._replaying = None
@@ -17,17 +17,49 @@
 # subject to the GNU General Public License and may only be used or replicated
 # with the express permission of Red Hat, Inc.
 #
-import requests
 import shutil
+import threading
+
+from collections import OrderedDict
 
 from pykickstart.errors import KickstartError
 from pykickstart.i18n import _
-from requests.exceptions import SSLError, RequestException
+
+# requests and concurrent.futures take a while to import and most programs
+# only ever load files, so they are imported the first time they are needed.
 
 is_url = lambda location: '://' in location  # RFC 3986
 
 SSL_VERIFY = True
 
+# How many URLs prefetch_to_str loads at the same time.
+PREFETCH_WORKERS = 8
+
+# How many characters of URL contents to keep for conditional GETs, or 0 to
+# keep none.  Only contents that came with an ETag or Last-Modified header are
+# kept, and the server is still asked whether they changed every time they
+# are loaded.  The least recently loaded contents are dropped first.
+#
+# The cache lasts as long as the process, so it is off by default: a program
+# that loads a URL once would only be keeping its contents around for
+# nothing.  Programs that load the same URLs again and again can turn it on
+# by setting this, as ksvalidator does.  prefetch_to_str uses the cache with
+# DEFAULT_CACHE_SIZE while it is off, since prefetching is already asked for
+# by programs that load many URLs.
+DEFAULT_CACHE_SIZE = 16 * 1024 * 1024
+CACHE_SIZE = 0
+
+# Each thread's requests.Session, so connections can be reused.  Sessions
+# aren't safe to share between threads, such as those of prefetch_to_str.
+_local = threading.local()
+
+# The conditional GET cache, mapping each URL to a tuple of the request
+# headers that revalidate it and its contents, least recently used first.
+_cache = OrderedDict()
+_cache_used = 0
+
+_lock = threading.Lock()
+
 def load_to_str(location):
     '''Load a destination URL or file into a string.
     Type of input is inferred automatically.
@@ -43,6 +75,40 @@ def load_to_str(location):
     else:
         return _load_file(location)
 
+def prefetch_to_str(locations, max_workers=None):
+    '''Load several destination URLs or files into strings at once.
+    URLs are loaded in a pool of at most max_workers threads, which
+    defaults to PREFETCH_WORKERS.
+
+    Arguments:
+    locations -- URLs or file names to load
+    max_workers -- how many URLs to load at the same time
+
+    Returns: dict mapping each location to a string with its contents, or
+             to the exception that loading it raised'''
+
+    def _load(location):
+        try:
+            if is_url(location):
+                return _load_url(location, CACHE_SIZE or DEFAULT_CACHE_SIZE)
+            else:
+                return _load_file(location)
+        except Exception as e:      # pylint: disable=broad-except
+            return e
+
+    locations = list(dict.fromkeys(locations))
+    urls = [location for location in locations if is_url(location)]
+    fetched = {}
+
+    if urls:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(len(urls), max_workers or PREFETCH_WORKERS)) as pool:
+            fetched = dict(zip(urls, pool.map(_load, urls)))
+
+    return {location: fetched[location] if location in fetched else _load(location)
+            for location in locations}
+
 def load_to_file(location, destination):
     '''Load a destination URL or file into a file name.
     Type of input is inferred automatically.
@@ -69,19 +135,103 @@ def load_to_file(location, destination):
         _copy_file(location, destination)
         return destination
 
-def _load_url(location):
-    '''Load a location (URL or filename) and return contents as string'''
+def clear_cache():
+    '''Forget all URL contents kept for conditional GETs.'''
+
+    global _cache_used
+
+    with _lock:
+        _cache.clear()
+        _cache_used = 0
+
+def _get_session():
+    '''Return this thread's requests.Session, creating it if needed'''
+
+    session = getattr(_local, "session", None)
+    if session is None:
+        import requests
+        session = requests.Session()
+        _local.session = session
+
+    return session
+
+def _cache_get(location):
+    '''Return the cache entry for a URL, or None'''
+
+    with _lock:
+        entry = _cache.get(location)
+        if entry is not None:
+            _cache.move_to_end(location)
+
+        return entry
+
+def _cache_put(location, headers, contents, cache_size):
+    '''Keep the contents of a URL, dropping old entries until at most
+    cache_size characters are kept'''
+
+    global _cache_used
+
+    with _lock:
+        old = _cache.pop(location, None)
+        if old is not None:
+            _cache_used -= len(old[1])
+
+        if len(contents) > cache_size:
+            return
+
+        _cache[location] = (headers, contents)
+        _cache_used += len(contents)
+
+        while _cache_used > cache_size:
+            (_location, (_headers, dropped)) = _cache.popitem(last=False)
+            _cache_used -= len(dropped)
+
+def _load_url(location, cache_size=None):
+    '''Load a location (URL or filename) and return contents as string.
+    cache_size overrides CACHE_SIZE for this load.'''
+
+    import requests
+    from requests.exceptions import SSLError, RequestException
+
+    if cache_size is None:
+        cache_size = CACHE_SIZE
+
+    entry = None
+    conditional = None
+
+    if cache_size > 0:
+        entry = _cache_get(location)
+        if entry is not None:
+            conditional = entry[0]
+
+    session = _get_session()
 
     try:
-        request = requests.get(location, verify=SSL_VERIFY, timeout=120)
+        request = session.get(location, headers=conditional, verify=SSL_VERIFY, timeout=120)
     except SSLError as e:
         raise KickstartError(_('Error securely accessing URL "%s"') % location + ': {e}'.format(e=str(e)))
     except RequestException as e:
         raise KickstartError(_('Error accessing URL "%s"') % location + ': {e}'.format(e=str(e)))
+    finally:
+        # Cookies are only kept for the redirects of a single load, the same
+        # as without a session.
+        session.cookies.clear()
+
+    if entry is not None and request.status_code == requests.codes.not_modified:     # pylint: disable=no-member
+        return entry[1]
 
     if request.status_code != requests.codes.ok:        # pylint: disable=no-member
         raise KickstartError(_('Error accessing URL "%s"') % location + ': {c}'.format(c=str(request.status_code)))
 
+    headers = {}
+    if "ETag" in request.headers:
+        headers["If-None-Match"] = request.headers["ETag"]
+    if "Last-Modified" in request.headers:
+        headers["If-Modified-Since"] = request.headers["Last-Modified"]
+
+    if headers and cache_size > 0:
+        _cache_put(location, headers, request.text, cache_size)
+
     return request.text
 
 def _load_file(filename):
@@ -43,13 +43,15 @@ And it exports two functions:
     ksboolean - A function to be used as the type= argument to any arguments
                 that can take a boolean.
 """
+import copy
 import os
+import types
 import warnings
 import textwrap
 from argparse import RawTextHelpFormatter, SUPPRESS
 from argparse import Action, ArgumentParser, ArgumentTypeError
 
-from pykickstart.errors import KickstartParseError, KickstartDeprecationWarning
+from pykickstart.errors import KickstartParseError, KickstartDeprecationWarning, warn
 from pykickstart.version import versionToLongString
 
 from pykickstart.i18n import _
@@ -114,13 +116,73 @@ class ExtendConstAction(Action):
         if getattr(namespace, self.dest, None) is not None:
             setattr(namespace, self.dest, self.const + values)
         else:
-            setattr(namespace, self.dest, self.const)
+            setattr(namespace, self.dest, list(self.const))
+
+def _renderHelp(text, fragments):
+    """Append the version notes recorded in fragments to the help text of an
+       option.  Each fragment is a tuple of a kind, a version number, and
+       for "versionchanged" the help text describing the change.
+    """
+    for (kind, version, extra) in fragments:
+        if kind == "versionchanged":
+            text += "\n\n    .. versionchanged:: %s\n\n%s" % (versionToLongString(version), extra)
+        else:
+            text += "\n\n    .. %s:: %s" % (kind, versionToLongString(version))
+
+    return text
+
+class _DeferredHelpAction(object):
+    """A mixin for argparse actions that keeps the version notes of an
+       option's help text as fragments, and only renders them into the help
+       text when something reads it.  Setting the help text replaces both.
+    """
+    _help = None
+    _helpFragments = ()
+
+    @property
+    def help(self):
+        if self._helpFragments:
+            self._help = _renderHelp(self._help or "", self._helpFragments)
+            self._helpFragments = ()
+
+        return self._help
+
+    @help.setter
+    def help(self, value):
+        self._help = value
+        self._helpFragments = ()
+
+_deferredHelpActions = {}
+_checkFormatters = {}
+
+def _deferredHelpAction(cls):
+    """Return a subclass of the argparse action class cls that defers its
+       help text.
+    """
+    if cls not in _deferredHelpActions:
+        _deferredHelpActions[cls] = type(cls.__name__, (_DeferredHelpAction, cls), {})
+
+    return _deferredHelpActions[cls]
+
+class _OwnerCallback(object):
+    """A type= callback that was a method of the command object a parser was
+       built for.  Parsers shared between several command objects call it
+       on whichever object the parser was copied for instead.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.__name__ = func.__name__
+
+    def bind(self, owner):
+        return types.MethodType(self.func, owner)
 
 class KSOptionParser(ArgumentParser):
     """A specialized subclass of argparse.ArgumentParser to handle extra option
        attribute checking, work error reporting into the KickstartParseError
        framework, and to turn off the default help.
     """
+    _checkingArgument = False
+
     def __init__(self, *args, **kwargs):
         """Create a new KSOptionParser instance.  Each KickstartCommand
            subclass should create one instance of KSOptionParser, providing
@@ -134,7 +196,6 @@ class KSOptionParser(ArgumentParser):
         # Overridden to allow for the version kwargs, to skip help option generation,
         # and to resolve conflicts instead of override earlier options.
         int_version = kwargs.pop("version")  # fail fast if no version is specified
-        version = versionToLongString(int_version)
 
         # always document the version
         if "addVersion" in kwargs:
@@ -143,28 +204,12 @@ class KSOptionParser(ArgumentParser):
 
         addVersion = kwargs.pop('addVersion', True)
 
-        # remove leading spaced from description and epilog.
-        # fail fast if we forgot to add description
-        kwargs['description'] = textwrap.dedent(kwargs.pop("description"))
-        if addVersion:
-            kwargs['description'] = "\n.. versionadded:: %s\n\n%s" % (version,
-                                                                    kwargs['description'])
-        kwargs['epilog'] = textwrap.dedent(kwargs.pop("epilog", ""))
-
-        # fail fast if we forgot to add prog
-        kwargs['prog'] = kwargs.pop("prog")
-
-        # Add text about conflicting commands
+        # The description and epilog are only needed for documentation, so
+        # they are put together when they are first read.
+        # fail fast if we forgot to add description or prog
+        description = kwargs.pop("description")
+        epilog = kwargs.pop("epilog", "")
         conflicts = kwargs.pop("conflicts", None)
-        if conflicts:
-            kwargs['description'] += "\n\n.. note:: ``%s`` cannot be used with the following commands: %s" % (kwargs["prog"], ", ".join(conflicts))
-
-        # remove leading spaced from description and epilog.
-        # fail fast if we forgot to add description
-        kwargs['description'] = textwrap.dedent(kwargs.pop("description"))
-        kwargs['epilog'] = textwrap.dedent(kwargs.pop("epilog", ""))
-
-        # fail fast if we forgot to add prog
         kwargs['prog'] = kwargs.pop("prog")
 
         ArgumentParser.__init__(self, add_help=False, conflict_handler="resolve",
@@ -175,6 +220,137 @@ class KSOptionParser(ArgumentParser):
         # ArgumentParser.__init__ has been executed
         self.version = int_version
         self.lineno = None
+        self._owner = None
+
+        # The options whose choices= list is an attribute of the command
+        # object the parser was built for, mapped to the attribute's name.
+        # This is filled in by _share.
+        self._ownerChoices = {}
+        self._deferredDescription = (description, addVersion, conflicts)
+        self._deferredEpilog = epilog
+
+    @property
+    def description(self):
+        if self._deferredDescription is not None:
+            (description, addVersion, conflicts) = self._deferredDescription
+            self._deferredDescription = None
+
+            # remove leading spaced from description
+            description = textwrap.dedent(description)
+            if addVersion:
+                description = "\n.. versionadded:: %s\n\n%s" % (versionToLongString(self.version),
+                                                                 description)
+
+            # Add text about conflicting commands
+            if conflicts:
+                description += "\n\n.. note:: ``%s`` cannot be used with the following commands: %s" % (self.prog, ", ".join(conflicts))
+
+            self._description = textwrap.dedent(description)
+
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        self._description = value
+        self._deferredDescription = None
+
+    @property
+    def epilog(self):
+        if self._deferredEpilog is not None:
+            # remove leading spaced from epilog
+            self._epilog = textwrap.dedent(self._deferredEpilog)
+            self._deferredEpilog = None
+
+        return self._epilog
+
+    @epilog.setter
+    def epilog(self, value):
+        self._epilog = value
+        self._deferredEpilog = None
+
+    def _get_formatter(self):
+        # argparse builds a formatter for every added option just to check
+        # its metavar.  Reuse one for that instead of building a new one and
+        # looking up the terminal size each time.
+        if self._checkingArgument:
+            if self.formatter_class not in _checkFormatters:
+                _checkFormatters[self.formatter_class] = self.formatter_class(prog="", width=80)
+
+            return _checkFormatters[self.formatter_class]
+
+        return ArgumentParser._get_formatter(self)
+
+    def _pop_action_class(self, kwargs, default=None):
+        # Options record the version notes in their help text as fragments
+        # that are rendered when the help text is read.
+        cls = ArgumentParser._pop_action_class(self, kwargs, default)
+
+        if isinstance(cls, type) and issubclass(cls, Action):
+            return _deferredHelpAction(cls)
+
+        return cls
+
+    def _share(self, owner):
+        """Prepare this parser, as returned by owner._getParser, for being
+           shared among all instances of owner's class.  Callbacks that are
+           bound methods of owner are rebound to the instance the parser is
+           copied for by _copyFor, and choices that are attributes of owner
+           are looked up on that instance.  Returns False if the parser
+           refers to owner in some other way and so cannot be shared.
+        """
+        def refersToOwner(obj):
+            for cell in getattr(obj, "__closure__", None) or []:
+                try:
+                    if cell.cell_contents is owner:
+                        return True
+                except ValueError:
+                    continue
+
+            return False
+
+        for action in self._actions:
+            if getattr(action.type, "__self__", None) is owner:
+                continue
+
+            if refersToOwner(action.type):
+                return False
+
+        for action in self._actions:
+            if getattr(action.type, "__self__", None) is owner:
+                action.type = _OwnerCallback(action.type.__func__)
+
+            if action.choices is not None:
+                for (name, value) in vars(owner).items():
+                    if value is action.choices:
+                        self._ownerChoices[action] = name
+                        break
+
+        return True
+
+    def _copyFor(self, owner):
+        """Return a cheap copy of this shared parser for the command object
+           owner.  The copy has its own line number but shares all of its
+           options with this parser, so it must not be modified.
+        """
+        op = copy.copy(self)
+        op.lineno = None
+        op._owner = owner
+        return op
+
+    def _get_value(self, action, arg_string):
+        if isinstance(action.type, _OwnerCallback):
+            action = copy.copy(action)
+            action.type = action.type.bind(self._owner)
+
+        return ArgumentParser._get_value(self, action, arg_string)
+
+    def _check_value(self, action, value):
+        name = self._ownerChoices.get(action)
+        if name is not None and self._owner is not None:
+            action = copy.copy(action)
+            action.choices = getattr(self._owner, name)
+
+        return ArgumentParser._check_value(self, action, value)
 
     def _parse_optional(self, arg_string):
         # Before 3.13 and 3.12.7, this returned None or a single
@@ -199,11 +375,11 @@ class KSOptionParser(ArgumentParser):
         option = action.option_strings[0]
 
         if action.deprecated:
-            warnings.warn(_("Ignoring deprecated option on line %(lineno)s: The %(option)s option "
-                            "has been deprecated and no longer has any effect. It may be removed "
-                            "from future releases, which will result in a fatal error from "
-                            "kickstart. Please modify your kickstart file to remove this option.")
-                          % {"lineno": self.lineno, "option": option}, KickstartDeprecationWarning)
+            warn(_("Ignoring deprecated option on line %(lineno)s: The %(option)s option "
+                   "has been deprecated and no longer has any effect. It may be removed "
+                   "from future releases, which will result in a fatal error from "
+                   "kickstart. Please modify your kickstart file to remove this option.")
+                 % {"lineno": self.lineno, "option": option}, KickstartDeprecationWarning)
 
         return option_tuple_or_tuples
 
@@ -220,10 +396,10 @@ class KSOptionParser(ArgumentParser):
         deprecated = kwargs.pop("deprecated", False)
 
         if deprecated:
-            version = versionToLongString(deprecated)
+            version = deprecated
         else:
             # fail fast if version is missing
-            version = versionToLongString(introduced or kwargs.pop("version"))
+            version = introduced or kwargs.pop("version")
 
         candidate = None
         for action in self._actions:
@@ -233,28 +409,44 @@ class KSOptionParser(ArgumentParser):
                     break
 
         if candidate:
-            if deprecated:
+            # Carry over the help text of the option being replaced, without
+            # rendering it if it is still deferred.
+            if isinstance(candidate, _DeferredHelpAction):
+                _help = candidate._help or ""
+                fragments = list(candidate._helpFragments)
+            else:
                 _help = candidate.help or ""
-                _help += "\n\n    .. deprecated:: %s" % version
-                kwargs["help"] = _help
+                fragments = []
+
+            if deprecated:
+                fragments.append(("deprecated", version, None))
             else:
                 # this is a modified argument, which is already present
-                _help = candidate.help or ""
-                _help += "\n\n    .. versionchanged:: %s\n\n%s" % (version, kwargs.pop("help"))
-                kwargs["help"] = _help
+                fragments.append(("versionchanged", version, kwargs.pop("help")))
         else:
             # this is a new argument which is added for the first time
             _help = kwargs.pop("help")
-            _help += "\n\n    .. versionadded:: %s" % version
+            fragments = [("versionadded", version, None)]
             # there are some argumets which are deprecated on first declaration
             if deprecated:
-                _help += "\n\n    .. deprecated:: %s" % version
-            kwargs["help"] = _help
+                fragments.append(("deprecated", version, None))
+
+        kwargs["help"] = _help
 
         notest = kwargs.pop("notest", False)
         removed = kwargs.pop("removed", None)
 
-        action = ArgumentParser.add_argument(self, *args, **kwargs)
+        self._checkingArgument = True
+        try:
+            action = ArgumentParser.add_argument(self, *args, **kwargs)
+        finally:
+            self._checkingArgument = False
+
+        if isinstance(action, _DeferredHelpAction):
+            action._helpFragments = fragments
+        else:
+            action.help = _renderHelp(_help, fragments)
+
         action.deprecated = deprecated
         action.introduced = introduced
         action.notest = notest
@@ -270,9 +462,13 @@ class KSOptionParser(ArgumentParser):
                 break
 
         if candidate:
-            if not candidate.help:
-                candidate.help = ""
-            candidate.help += "\n\n    .. versionremoved:: %s" % versionToLongString(kwargs.pop("version"))
+            fragment = ("versionremoved", kwargs.pop("version"), None)
+
+            if isinstance(candidate, _DeferredHelpAction):
+                candidate._helpFragments = tuple(candidate._helpFragments) + (fragment,)
+            else:
+                candidate.help = _renderHelp(candidate.help or "", [fragment])
+
             self._remove_action(candidate)
             self._option_string_actions.pop(arg)
 
@@ -30,19 +30,25 @@ This module exports several important classes:
 
     Packages - Representation of the %packages section.
 
+    SourceSpan - Where in the input a parsed object came from.
+
     KickstartParser - The kickstart file parser state machine.
 """
+from collections import namedtuple
 from collections.abc import Iterator
 
+import codecs
+import itertools
 import os
+import re
 import shlex
 import sys
-import warnings
 
 from pykickstart import constants, version
-from pykickstart.errors import KickstartError, KickstartParseError, KickstartParseWarning
+from pykickstart.errors import KickstartError, KickstartParseError, KickstartParseWarning, warn, \
+                              _setWarningHandler
 from pykickstart.ko import KickstartObject
-from pykickstart.load import load_to_str
+from pykickstart.load import is_url, load_to_str, prefetch_to_str
 from pykickstart.options import KSOptionParser
 from pykickstart.sections import CertificateSection, PackageSection, \
                                  PreScriptSection, PreInstallScriptSection, \
@@ -54,19 +60,133 @@ from pykickstart.i18n import _
 STATE_END = "end"
 STATE_COMMANDS = "commands"
 
-def _preprocessStateMachine(lineIter):
-    l = None
-    lineno = 0
-    retval = ""
+# The pieces _splitLine puts together into words:  a run of ordinary
+# characters, a backslash and the character it escapes, a single-quoted
+# string, or a double-quoted string.  Only the characters shlex treats as
+# whitespace end a word.
+_piece = r"[^ \t\r\n'\"\\%s]+|\\.|'[^']*'|\"(?:[^\"\\]|\\.)*\""
+
+_wordPattern = re.compile(r"(?:%s)+" % (_piece % ""), re.S)
+_commentedWordPattern = re.compile(r"(?:%s)+" % (_piece % "#"), re.S)
+_spacePattern = re.compile(r"[ \t\r\n]*")
+_commentedSpacePattern = re.compile(r"(?:[ \t\r\n]+|#[^\n]*\n?)*")
+_piecePattern = re.compile(_piece % "", re.S)
+_quotedEscapePattern = re.compile(r"\\(.)", re.S)
+
+def _unquote(word):
+    """Return word with its quotes and escapes removed the way shlex does."""
+    result = []
+
+    for m in _piecePattern.finditer(word):
+        piece = m.group(0)
+
+        if piece[0] == "\\":
+            result.append(piece[1])
+        elif piece[0] == "'":
+            result.append(piece[1:-1])
+        elif piece[0] == '"':
+            # Inside double quotes, a backslash only escapes another
+            # backslash or a double quote.  Otherwise it is kept.
+            result.append(_quotedEscapePattern.sub(lambda e: e.group(1) if e.group(1) in '"\\' else e.group(0),
+                                                   piece[1:-1]))
+        else:
+            result.append(piece)
 
-    retval = retval.encode(sys.getdefaultencoding())
+    return "".join(result)
+
+def _splitLine(line, comments=False):
+    """Split line into words exactly like shlex.split(line, comments=comments)
+       does, but without going through shlex one character at a time.  Lines
+       that shlex would reject, like those with an unclosed quote, are
+       handed to shlex so the same ValueError is raised.
+    """
+    if comments:
+        wordPattern = _commentedWordPattern
+        spacePattern = _commentedSpacePattern
+    else:
+        wordPattern = _wordPattern
+        spacePattern = _spacePattern
+
+    words = []
+    pos = spacePattern.match(line).end()
+
+    while pos < len(line):
+        m = wordPattern.match(line, pos)
+        if not m:
+            return shlex.split(line, comments=comments)
+
+        word = m.group(0)
+        if "\\" in word or "'" in word or '"' in word:
+            word = _unquote(word)
+
+        words.append(word)
+        pos = spacePattern.match(line, m.end()).end()
+
+    return words
+
+def _directiveTargets(s, directive):
+    """Yield the locations named by the directive lines (like %include) in
+       the string s.  Lines that can't be split are skipped; the parser will
+       complain about them when it gets there.
+    """
+    for l in s.splitlines():
+        ll = l.strip()
+        if not ll.startswith(directive):
+            continue
 
-    while True:
         try:
-            l = next(lineIter)
-        except StopIteration:
+            args = _splitLine(ll)
+        except ValueError:
+            continue
+
+        if len(args) > 1 and args[0] == directive and args[1]:
+            yield args[1]
+
+def _prefetch(s, directive, recursive=False):
+    """Fetch all URLs named by the directive lines in the string s at once,
+       ahead of the state machine that will need them.  If recursive is True,
+       the directive lines in the fetched files are followed as well.
+       Returns a dict for _loadToStr.
+    """
+    prefetched = {}
+    texts = [s]
+
+    while texts:
+        urls = [location for text in texts for location in _directiveTargets(text, directive)
+                if is_url(location) and location not in prefetched]
+        results = prefetch_to_str(urls)
+        prefetched.update(results)
+
+        if not recursive:
             break
 
+        texts = [contents for contents in results.values() if isinstance(contents, str)]
+
+    return prefetched
+
+def _loadToStr(location, prefetched=None):
+    """Like load_to_str, but take the result from prefetched if it is there.
+       Errors that happened while prefetching are raised now, so they come
+       up in the same order and with the same line numbers as they would
+       have without prefetching.
+    """
+    if prefetched and location in prefetched:
+        contents = prefetched[location]
+        if isinstance(contents, Exception):
+            raise contents
+
+        return contents
+
+    return load_to_str(location)
+
+def _preprocessStateMachine(lineIter, prefetched=None):
+    """Yield the lines given by lineIter, with each %ksappend line replaced by
+       the lines of the file it names.  Errors are raised as the lines are
+       reached.
+    """
+    lineno = 0
+
+    for l in lineIter:
         # At the end of the file?
         if l == "":
             break
@@ -76,7 +196,7 @@ def _preprocessStateMachine(lineIter):
 
         ll = l.strip()
         if not ll.startswith("%ksappend"):
-            retval += l.encode(sys.getdefaultencoding())
+            yield l
             continue
 
         # Try to pull down the remote file.
@@ -86,73 +206,156 @@ def _preprocessStateMachine(lineIter):
             raise KickstartParseError(_("Illegal url for %%ksappend: %s") % ll, lineno=lineno)
 
         try:
-            contents = load_to_str(ksurl)
+            contents = _loadToStr(ksurl, prefetched)
         except KickstartError as e:
             raise KickstartError(_("Unable to open %%ksappend file: %s") % str(e), lineno=lineno)
 
-        # If that worked, write the remote file to the output kickstart
-        # file in one burst.  This allows multiple %ksappend lines to
-        # exist.
+        # If that worked, pass the remote file along in place of the
+        # %ksappend line.  This allows multiple %ksappend lines to exist.
         if contents is not None:
-            retval += contents.encode(sys.getdefaultencoding())
+            yield from contents.splitlines(True)
+
+def _preprocessToTempFile(lineIter):
+    """Write the preprocessed lines to a new temporary file and return its
+       location, or None if there was nothing but whitespace to write.
+    """
+    import tempfile
+    (outF, outName) = tempfile.mkstemp(suffix="-ks.cfg")
+    empty = True
+
+    try:
+        with os.fdopen(outF, "wb") as f:
+            for l in lineIter:
+                l = l.encode(sys.getdefaultencoding())
+                empty = empty and not l.strip()
+                f.write(l)
+    except:
+        os.remove(outName)
+        raise
+
+    if empty:
+        os.remove(outName)
+        return None
+
+    return outName
+
+def _loadKickstart(f):
+    try:
+        return load_to_str(f)
+    except KickstartError as e:
+        raise KickstartError(_("Unable to open input kickstart file: %s") % str(e), lineno=0)
+
+def preprocessFromStringToLines(s, prefetch=False):
+    """Preprocess the kickstart file, provided as the string s.  This
+       method is currently only useful for handling %ksappend lines, which
+       need to be fetched before the real kickstart parser can be run.
+       Returns an iterator over the lines of the complete kickstart file,
+       which fetches %ksappend files as it reaches them.  Pass it to the
+       writelines method of a file object to write the file out.
 
-    return retval
+       If prefetch is True, all %ksappend URLs are fetched at once before
+       this method returns.  Any errors are still raised as the lines they
+       came from are reached.
+    """
+    prefetched = _prefetch(s, "%ksappend") if prefetch else None
+    return _preprocessStateMachine(iter(s.splitlines(True)), prefetched)
 
-def preprocessFromStringToString(s):
+def preprocessKickstartToLines(f, prefetch=False):
+    """Preprocess the kickstart file, given by the filename f.  This
+       method is currently only useful for handling %ksappend lines,
+       which need to be fetched before the real kickstart parser can be
+       run.  Returns an iterator over the lines of the complete kickstart
+       file, which fetches %ksappend files as it reaches them.  Pass it to
+       the writelines method of a file object to write the file out.
+
+       prefetch is handled as by preprocessFromStringToLines.
+    """
+    return preprocessFromStringToLines(_loadKickstart(f), prefetch=prefetch)
+
+def preprocessFromStringToString(s, prefetch=False):
     """Preprocess the kickstart file, provided as the string s.  This
        method is currently only useful for handling %ksappend lines, which
        need to be fetched before the real kickstart parser can be run.
        Returns the complete kickstart file as a string.
     """
-    i = iter(s.splitlines(True) + [""])
-    return _preprocessStateMachine(i)
+    return "".join(preprocessFromStringToLines(s, prefetch=prefetch)).encode(sys.getdefaultencoding())
 
-def preprocessKickstartToString(f):
+def preprocessKickstartToString(f, prefetch=False):
     """Preprocess the kickstart file, given by the filename f.  This
        method is currently only useful for handling %ksappend lines,
        which need to be fetched before the real kickstart parser can be
        run.  Returns the complete kickstart file as a string.
     """
-    try:
-        contents = load_to_str(f)
-    except KickstartError as e:
-        raise KickstartError(_("Unable to open input kickstart file: %s") % str(e), lineno=0)
+    return "".join(preprocessKickstartToLines(f, prefetch=prefetch)).encode(sys.getdefaultencoding())
 
-    return _preprocessStateMachine(iter(contents.splitlines(True)))
-
-def preprocessFromString(s):
+def preprocessFromString(s, prefetch=False):
     """Preprocess the kickstart file, provided as the string s.  This
        method is currently only useful for handling %ksappend lines,
        which need to be fetched before the real kickstart parser can be
        run.  Returns the location of the complete kickstart file.
     """
-    s = preprocessFromStringToString(s)
-    if s.strip():
-        import tempfile
-        (outF, outName) = tempfile.mkstemp(suffix="-ks.cfg")
-
-        os.write(outF, s)
-        os.close(outF)
-        return outName
+    return _preprocessToTempFile(preprocessFromStringToLines(s, prefetch=prefetch))
 
-    return None
-
-def preprocessKickstart(f):
+def preprocessKickstart(f, prefetch=False):
     """Preprocess the kickstart file, given by the filename f.  This
        method is currently only useful for handling %ksappend lines,
        which need to be fetched before the real kickstart parser can be
        run.  Returns the location of the complete kickstart file.
     """
-    s = preprocessKickstartToString(f)
-    if s.strip():
-        import tempfile
-        (outF, outName) = tempfile.mkstemp(suffix="-ks.cfg")
+    return _preprocessToTempFile(preprocessKickstartToLines(f, prefetch=prefetch))
+
+# The characters str.splitlines ends a line at.
+_LINE_BREAKS = frozenset("\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029")
 
-        os.write(outF, s)
-        os.close(outF)
-        return outName
+def _splitChunks(chunks):
+    """Yield the lines in the strings from chunks, with their line endings,
+       just as "".join(chunks).splitlines(True) would but without joining
+       them all first.  The chunks may be the lines of a file or pieces of
+       any size.
+    """
+    # The pieces of a line that goes on in the next chunk.  They are only
+    # joined once the line is finished, so a long line given in many small
+    # pieces isn't copied again for each of them.
+    pending = []
 
-    return None
+    for chunk in chunks:
+        if not chunk:
+            continue
+
+        # A line ending in "\r" is only finished once it's known that the
+        # next chunk doesn't start with the "\n" of a "\r\n".
+        if pending and pending[-1][-1] == "\r":
+            if chunk[0] == "\n":
+                pending.append("\n")
+                chunk = chunk[1:]
+
+            yield "".join(pending)
+            pending = []
+
+            if not chunk:
+                continue
+
+        lines = chunk.splitlines(True)
+        last = lines[-1][-1]
+
+        if last not in _LINE_BREAKS or last == "\r":
+            partial = lines.pop()
+        else:
+            partial = None
+
+        for line in lines:
+            if pending:
+                pending.append(line)
+                line = "".join(pending)
+                pending = []
+
+            yield line
+
+        if partial is not None:
+            pending.append(partial)
+
+    if pending:
+        yield "".join(pending)
 
 class PutBackIterator(Iterator):
     def __init__(self, iterable):
@@ -176,6 +379,41 @@ class PutBackIterator(Iterator):
     def __next__(self):
         return self.next()                          # pylint: disable=not-callable
 
+# Where in the input a command, data object, script, certificate, or
+# %packages section came from.  source is an index into the parser's
+# sourceFiles list.  Lines are numbered from 1 within each source, as in
+# error messages, and endLine is the last line included.  Offsets count
+# bytes of UTF-8 from the start of the source, and endOffset is just past
+# the end of the last line, including its line ending.
+SourceSpan = namedtuple("SourceSpan", ["source", "startLine", "endLine", "startOffset", "endOffset"])
+
+def _byteLength(s):
+    """Return the length of s in bytes of UTF-8."""
+    if s.isascii():
+        return len(s)
+    else:
+        return len(s.encode("utf-8", "surrogatepass"))
+
+class _LineReader(PutBackIterator):
+    """A PutBackIterator over the lines of one source that keeps track of
+       where in it the last line read starts and ends.
+    """
+    def __init__(self, iterable, source):
+        PutBackIterator.__init__(self, iterable)
+        self.source = source
+        self.start = 0
+        self.end = 0
+
+    def put(self, s):
+        PutBackIterator.put(self, s)
+        self.end = self.start
+
+    def next(self):
+        line = PutBackIterator.next(self)
+        self.start = self.end
+        self.end += _byteLength(line)
+        return line
+
 ###
 ### CERTIFICATE HANDLING
 ###
@@ -188,8 +426,10 @@ class Certificate(KickstartObject):
            :keyword filename: The file name of the certificate.
            :keyword dir: The directory where the certificate should be stored.
            :keyword type: The type of the certificate (e.g. "anchor").
+           :keyword span: The SourceSpan of the %certificate section.
         """
         KickstartObject.__init__(self, *args, **kwargs)
+        self.span = kwargs.get("span", None)
         self.cert = kwargs.get("cert", None)
         self.filename = kwargs.get("filename", None)
         self.dir = kwargs.get("dir", None)
@@ -246,21 +486,40 @@ class Script(KickstartObject):
 
            :keyword script: A string containing all the lines of the script.
 
+           :keyword span: The SourceSpan of the whole section, from the header
+                          through %end.
+
            :keyword type: The type of the script, which can be KS_SCRIPT_* from
                           :mod:`pykickstart.constants`.
+
+           :keyword version: The syntax version to write this script out in.
+                             Defaults to DEVEL.
         """
         KickstartObject.__init__(self, *args, **kwargs)
-        self.script = "".join(script)
+        if isinstance(script, str):
+            self.script = script
+        else:
+            self.script = "".join(script)
+        self._ver = kwargs.get("version", self._ver)
 
         self.interp = kwargs.get("interp", "/bin/sh")
         self.inChroot = kwargs.get("inChroot", False)
         self.lineno = kwargs.get("lineno", None)
+        self.span = kwargs.get("span", None)
         self.logfile = kwargs.get("logfile", None)
         self.errorOnFail = kwargs.get("errorOnFail", False)
         self.type = kwargs.get("type", constants.KS_SCRIPT_PRE)
 
     def __str__(self):
         """Return a string formatted for output to a kickstart file."""
+        return "".join(self._chunks())
+
+    def _chunks(self):
+        """Return the strings that make up this script's kickstart output, in
+           order.  The body is passed along as it is instead of being copied
+           into a bigger string, which matters for scripts carrying large
+           payloads.  See BaseHandler.write.
+        """
         retval = ""
 
         if self.type == constants.KS_SCRIPT_PRE:
@@ -284,15 +543,14 @@ class Script(KickstartObject):
             retval += " --erroronfail"
 
         if self.script.endswith("\n"):
-            if self._ver >= version.F8:
-                return retval + "\n%s%%end\n" % self.script
-            else:
-                return retval + "\n%s" % self.script
+            end = ""
         else:
-            if self._ver >= version.F8:
-                return retval + "\n%s\n%%end\n" % self.script
-            else:
-                return retval + "\n%s\n" % self.script
+            end = "\n"
+
+        if self._ver >= version.F8:
+            end += "%end\n"
+
+        return [retval + "\n", self.script, end]
 
 ##
 ## PACKAGE HANDLING
@@ -382,27 +640,84 @@ class Packages(KickstartObject):
                             a file should retry before returning an error.
            seen          -- If %packages was ever used in the kickstart file,
                             this attribute will be set to True.
+           span          -- The SourceSpan of the %packages section, or None.
 
+           The version keyword argument gives the syntax version to write the
+           section out in, and defaults to DEVEL.
         """
         KickstartObject.__init__(self, *args, **kwargs)
+        self._ver = kwargs.get("version", self._ver)
 
         self.addBase = True
         self.nocore = False
         self.default = False
         self.environment = None
-        self.excludedList = []
         self.excludedGroupList = []
         self.excludeDocs = False
         self.groupList = []
         self.handleMissing = constants.KS_MISSING_PROMPT
         self.handleBroken = constants.KS_BROKEN_REPORT
-        self.packageList = []
         self.instLangs = None
         self.multiLib = False
         self.excludeWeakdeps = False
         self.timeout = None
         self.retries = None
         self.seen = False
+        self.span = None
+
+        # Packages and excluded packages are accumulated into sets as lines
+        # are added, and only turned into the sorted packageList and
+        # excludedList on first read.  Once a list has been handed out, it
+        # is the authoritative copy until the next call to add, which folds
+        # any changes made to it back into the sets.
+        self._packageSet = set()
+        self._excludedSet = set()
+        self._packageList = None
+        self._excludedList = None
+
+        # Names that were both added and excluded by the most recent call to
+        # add.  These are the only names that can be in both sets at once.
+        self._overlap = set()
+
+    @property
+    def packageList(self):
+        if self._packageList is None:
+            self._packageList = sorted(self._packageSet)
+
+        return self._packageList
+
+    @packageList.setter
+    def packageList(self, value):
+        self._syncSets()
+        self._packageList = value
+
+    @property
+    def excludedList(self):
+        if self._excludedList is None:
+            self._excludedList = sorted(self._excludedSet)
+
+        return self._excludedList
+
+    @excludedList.setter
+    def excludedList(self, value):
+        self._syncSets()
+        self._excludedList = value
+
+    def _syncSets(self):
+        # Pick up any changes made directly to the materialized lists and
+        # drop them, so the sets are the only copy of the state again.
+        if self._packageList is None and self._excludedList is None:
+            return
+
+        if self._packageList is not None:
+            self._packageSet = set(self._packageList)
+            self._packageList = None
+
+        if self._excludedList is not None:
+            self._excludedSet = set(self._excludedList)
+            self._excludedList = None
+
+        self._overlap = self._packageSet & self._excludedSet
 
     def __str__(self):
         """Return a string formatted for output to a kickstart file."""
@@ -447,33 +762,33 @@ class Packages(KickstartObject):
             return "\n%packages" + retval + "\n" + pkgs + "\n"
 
     def _processPackagesContent(self):
-        pkgs = ""
+        pkgs = []
 
         if not self.default:
             if self.environment:
-                pkgs += "@^%s\n" % self.environment
+                pkgs.append("@^%s\n" % self.environment)
 
         grps = self.groupList
         grps.sort()
         for grp in grps:
-            pkgs += "%s\n" % grp.__str__()
+            pkgs.append("%s\n" % grp.__str__())
 
         p = self.packageList
         p.sort()
         for pkg in p:
-            pkgs += "%s\n" % pkg
+            pkgs.append("%s\n" % pkg)
 
         grps = self.excludedGroupList
         grps.sort()
         for grp in grps:
-            pkgs += "-%s\n" % grp.__str__()
+            pkgs.append("-%s\n" % grp.__str__())
 
         p = self.excludedList
         p.sort()
         for pkg in p:
-            pkgs += "-%s\n" % pkg
+            pkgs.append("-%s\n" % pkg)
 
-        return pkgs
+        return "".join(pkgs)
 
     def _processGroup(self, line):
         op = KSOptionParser(prog="", description="", version=version.DEVEL)
@@ -505,8 +820,6 @@ class Packages(KickstartObject):
         """Given a list of lines from the input file, strip off any leading
            symbols and add the result to the appropriate list.
         """
-        existingExcludedSet = set(self.excludedList)
-        existingPackageSet = set(self.packageList)
         newExcludedSet = set()
         newPackageSet = set()
 
@@ -529,27 +842,45 @@ class Packages(KickstartObject):
             else:
                 newPackageSet.add(stripped)
 
-        # Groups have to be excluded in two different ways (note: can't use
-        # sets here because we have to store objects):
-        excludedGroupNames = [g.name for g in excludedGroupList]
-
-        # First, an excluded group may be cancelling out a previously given
-        # one.  This is often the case when using %include.  So there we should
-        # just remove the group from the list.
-        self.groupList = [g for g in self.groupList if g.name not in excludedGroupNames]
-
-        # Second, the package list could have included globs which are not
-        # processed by pykickstart.  In that case we need to preserve a list of
-        # excluded groups so whatever tool doing package/group installation can
-        # take appropriate action.
-        self.excludedGroupList.extend(excludedGroupList)
-
-        existingPackageSet = (existingPackageSet - newExcludedSet) | newPackageSet
-        existingExcludedSet = (existingExcludedSet - existingPackageSet) | newExcludedSet
-
-        # FIXME: figure these types out
-        self.packageList = sorted(existingPackageSet)
-        self.excludedList = sorted(existingExcludedSet)
+        if excludedGroupList:
+            # Groups have to be excluded in two different ways (note: can't use
+            # sets here because we have to store objects):
+            excludedGroupNames = [g.name for g in excludedGroupList]
+
+            # First, an excluded group may be cancelling out a previously given
+            # one.  This is often the case when using %include.  So there we should
+            # just remove the group from the list.
+            self.groupList = [g for g in self.groupList if g.name not in excludedGroupNames]
+
+            # Second, the package list could have included globs which are not
+            # processed by pykickstart.  In that case we need to preserve a list of
+            # excluded groups so whatever tool doing package/group installation can
+            # take appropriate action.
+            self.excludedGroupList.extend(excludedGroupList)
+
+        # Even with nothing new to add, names left in both sets by the
+        # previous call still have to be settled.
+        self._syncSets()
+
+        # This is the same as:
+        #
+        #   packages = (packages - newExcluded) | newPackages
+        #   excluded = (excluded - packages) | newExcluded
+        #
+        # but only touches the names given in this call, plus any left over
+        # in both sets from the previous one.
+        self._packageSet.difference_update(newExcludedSet)
+        self._packageSet.update(newPackageSet)
+
+        for name in newPackageSet | self._overlap:
+            if name in self._packageSet:
+                self._excludedSet.discard(name)
+
+        self._excludedSet.update(newExcludedSet)
+        self._overlap = newExcludedSet & newPackageSet
+
+class _StopReading(Exception):
+    """Raised to stop reading input once the diagnostics are full."""
 
 ###
 ### PARSER
@@ -562,9 +893,15 @@ class KickstartParser(object):
        overridden.
     """
     def __init__(self, handler, followIncludes=True, errorsAreFatal=True,
-                 missingIncludeIsFatal=True, unknownSectionIsFatal=True):
+                 missingIncludeIsFatal=True, unknownSectionIsFatal=True,
+                 prefetch=False, warningsAreErrors=False, diagnostics=None):
         """Create a new KickstartParser instance.  Instance attributes:
 
+           diagnostics           -- A pykickstart.errors.Diagnostics to add
+                                    the errors that aren't fatal to, instead of
+                                    printing them, and warnings if it captures
+                                    them.  Reading stops once its limit is
+                                    reached.  None to print errors as usual.
            errorsAreFatal        -- Should errors cause processing to halt, or
                                     just print a message to the screen?  This
                                     is most useful for writing syntax checkers
@@ -578,26 +915,58 @@ class KickstartParser(object):
                                     will be executed.
            missingIncludeIsFatal -- Should missing include files be fatal, even
                                     if errorsAreFatal is False?
+           prefetch              -- Should all URLs given to %include be
+                                    fetched at once before parsing starts,
+                                    instead of one at a time as they are
+                                    reached?
+           sourceFiles           -- The name of each input read since the
+                                    parser was last reset, in the order they
+                                    were started, with None for input that
+                                    wasn't read from a named file.  The source
+                                    of a SourceSpan is an index into this list.
            unknownSectionIsFatal -- Should an unknown %section be fatal?  Not all
                                     sections are handled by pykickstart.  Some are
                                     user-defined, so there should be a way to have
                                     pykickstart ignore them.
+           warningsAreErrors     -- Should a KickstartParseWarning found while
+                                    reading input be raised as an exception,
+                                    the same as an error?  This does not touch
+                                    the warnings filters, so it only affects
+                                    this parser.
+
+           All of the state of a parse lives in the parser, its handler, and
+           the objects they create.  Separate parsers with separate handlers
+           may therefore be used at the same time in different threads, even
+           for different syntax versions.  A single parser or handler must
+           not be used by more than one thread at a time.
         """
+        self.diagnostics = diagnostics
         self.errorsAreFatal = errorsAreFatal
         self.errorsCount = 0
         self.followIncludes = followIncludes
         self.handler = handler
         self.currentdir = {}
         self.missingIncludeIsFatal = missingIncludeIsFatal
+        self.prefetch = prefetch
         self.unknownSectionIsFatal = unknownSectionIsFatal
+        self.warningsAreErrors = warningsAreErrors
 
         self._state = STATE_COMMANDS
         self._includeDepth = 0
         self._line = ""
+        self._prefetched = None
+        self.sourceFiles = []
+
+        # The name readKickstart gives the next source to be read, and where
+        # the section being read started.  See _readLines and _spanTo.
+        self._nextSource = None
+        self._sectionStart = None
+
+        # The span of the command or section header being handled, for
+        # diagnostics.
+        self._lineSpan = None
 
         self.version = self.handler.version
-        Script._ver = self.version
-        Packages._ver = self.version
 
         self._sections = {}
         self.setupSections()
@@ -606,6 +975,13 @@ class KickstartParser(object):
         """Reset the internal variables of the state machine for a new kickstart file."""
         self._state = STATE_COMMANDS
         self._includeDepth = 0
+        self._prefetched = None
+        self.sourceFiles = []
+        self._lineSpan = None
+
+    def _prefetchIncludes(self, s):
+        if self.prefetch and self.followIncludes:
+            self._prefetched = _prefetch(s, "%include", recursive=True)
 
     def getSection(self, s):
         """Return a reference to the requested section (s must start with '%'s),
@@ -658,6 +1034,11 @@ class KickstartParser(object):
     def _readSection(self, lineIter, lineno):
         obj = self._sections[self._state]
 
+        # A line can only start or end a section if it begins with one of
+        # these.  Checking that first means most "%" lines in scripts, like
+        # printf formats or rpm macros, are never split.
+        sectionStarts = tuple(self._sections) + ("%end", "%include")
+
         while True:
             try:
                 line = next(lineIter)
@@ -666,6 +1047,7 @@ class KickstartParser(object):
                     if self.version >= version.F8:
                         raise KickstartParseError(_("Section %s does not end with %%end.") % obj.sectionOpen, lineno=lineno)
 
+                    obj.span = self._spanTo(lineIter, lineno)
                     self._finalize(obj)
             except StopIteration:
                 break
@@ -677,21 +1059,27 @@ class KickstartParser(object):
             if self._isBlankOrComment(line) and not obj.allLines:
                 continue
 
-            if line.lstrip().startswith("%"):
+            stripped = line.lstrip()
+            if stripped.startswith("%"):
                 # If we're in a script, the line may begin with "%something"
                 # that's not the start of any section we recognize, but still
                 # valid for that script.  So, don't do the split below unless
-                # we're sure.
-                possibleSectionStart = line.split()[0]
+                # we're sure.  Only the first word is needed to tell.
+                if not stripped.startswith(sectionStarts):
+                    obj.handleLine(line)
+                    continue
+
+                possibleSectionStart = stripped.split(None, 1)[0]
                 if not self._validState(possibleSectionStart) \
                    and possibleSectionStart not in ("%end", "%include"):
                     obj.handleLine(line)
                     continue
 
-                args = shlex.split(line)
+                args = _splitLine(line)
 
                 if args and args[0] == "%end":
                     # This is a properly terminated section.
+                    obj.span = self._spanTo(lineIter, lineno)
                     self._finalize(obj)
                     break
                 elif args and args[0] == "%include":
@@ -711,6 +1099,7 @@ class KickstartParser(object):
                     # kicking back out to STATE_COMMANDS will ensure that happens.
                     lineIter.put(line)
                     lineno -= 1
+                    obj.span = self._spanTo(lineIter, lineno)
                     self._finalize(obj)
                     break
             else:
@@ -720,21 +1109,57 @@ class KickstartParser(object):
 
         return lineno
 
+    def _spanTo(self, lineIter, lineno):
+        """Return the SourceSpan of the section being read, from its header
+           to the line lineno just read from lineIter.  A section that ends
+           in a different source than it started in only gets its header.
+        """
+        if self._sectionStart is None:
+            return None
+
+        (source, startLine, startOffset, headerEnd) = self._sectionStart
+        if source == lineIter.source:
+            return SourceSpan(source, startLine, lineno, startOffset, lineIter.end)
+        else:
+            return SourceSpan(source, startLine, startLine, startOffset, headerEnd)
+
     def _validState(self, st):
         """Is the given section tag one that has been registered with the parser?"""
-        return st in list(self._sections.keys())
+        return st in self._sections
+
+    def _handleWarning(self, message, category):
+        """Called for every warning issued through pykickstart.errors.warn
+           while this parser is reading input.  Returns True if the warning
+           has been handled and should not be passed on to warnings.warn.
+           This method may be overridden in a subclass if necessary.
+        """
+        if self.warningsAreErrors and issubclass(category, KickstartParseWarning):
+            raise category(message)
+
+        if self.diagnostics is not None and self.diagnostics.captureWarnings:
+            self.diagnostics.addWarning(message, category, self._lineSpan)
+            return True
+
+        return False
 
     def _tryFunc(self, fn):
         """Call the provided function (which doesn't take any arguments) and
            do the appropriate error handling.  If errorsAreFatal is False, this
-           function will just print the exception and keep going.
+           function will just print the exception and keep going, or add it to
+           diagnostics if there are any.  Once those are full, nothing more is
+           done and reading stops.
         """
+        if self.diagnostics is not None and self.diagnostics.full:
+            raise _StopReading()
+
         try:
             fn()
         except Exception as msg:    # pylint: disable=broad-except
             self.errorsCount += 1
             if self.errorsAreFatal:
                 raise
+            elif self.diagnostics is not None:
+                self.diagnostics.addError(msg, self._lineSpan)
             else:
                 print(msg, file=sys.stderr)
 
@@ -756,8 +1181,8 @@ class KickstartParser(object):
             # early parsing in anaconda.
             if self.missingIncludeIsFatal:
                 raise
-
-        self._includeDepth -= 1
+        finally:
+            self._includeDepth -= 1
 
     def _stateMachine(self, lineIter):
         # For error reporting.
@@ -780,7 +1205,7 @@ class KickstartParser(object):
                 continue
 
             # Split the line, discarding comments.
-            args = shlex.split(self._line, comments=True)
+            args = _splitLine(self._line, comments=True)
 
             if args[0] == "%include":
                 if len(args) == 1 or not args[1]:
@@ -794,7 +1219,10 @@ class KickstartParser(object):
                 if args[0] == "%ksappend":
                     # This is handled by the preprocess* functions, so continue.
                     continue
-                elif args[0][0] == '%':
+
+                self._lineSpan = SourceSpan(lineIter.source, lineno, lineno, lineIter.start, lineIter.end)
+
+                if args[0][0] == '%':
                     # This is the beginning of a new section.  Handle its header
                     # here.
                     newSection = args[0]
@@ -806,11 +1234,12 @@ class KickstartParser(object):
                             # NullSection for the header we just saw.  Then nothing else
                             # needs to change.  You can turn this warning into an error via
                             # ksvalidator, or the warnings module.
-                            warnings.warn(_("Potentially unknown section seen at line %(lineno)s: %(sectionName)s") % {"lineno": lineno, "sectionName": newSection}, KickstartParseWarning)
+                            warn(_("Potentially unknown section seen at line %(lineno)s: %(sectionName)s") % {"lineno": lineno, "sectionName": newSection}, KickstartParseWarning)
                             self.registerSection(NullSection(self.handler, sectionOpen=newSection))
 
                     self._state = newSection
                     obj = self._sections[self._state]
+                    self._sectionStart = (lineIter.source, lineno, lineIter.start, lineIter.end)
                     self._tryFunc(lambda: obj.handleHeader(lineno, args))
 
                     # This will handle all section processing, kicking us back
@@ -819,6 +1248,9 @@ class KickstartParser(object):
                     lineno = self._readSection(lineIter, lineno)
                 else:
                     # This is a command in the command section.  Dispatch to it.
+                    if self.handler:
+                        self.handler.currentSpan = self._lineSpan
+
                     self._tryFunc(lambda: self.handleCommand(lineno, args))
             elif self._state == STATE_END:
                 break
@@ -827,19 +1259,67 @@ class KickstartParser(object):
                 lineno -= 1
                 lineno = self._readSection(lineIter, lineno)
 
+    def _readLines(self, lines):
+        self.sourceFiles.append(self._nextSource)
+        self._nextSource = None
+
+        # Add a "" to the end of the lines so the string reader acts like the
+        # file reader and we only get StopIteration when we're after the final
+        # line of input.
+        i = _LineReader(itertools.chain(lines, [""]), len(self.sourceFiles) - 1)
+
+        prev = _setWarningHandler(self._handleWarning)
+        try:
+            self._stateMachine(i)
+        except _StopReading:
+            # The diagnostics are full.  This stops the whole input, not just
+            # an %include.
+            if self._includeDepth > 0:
+                raise
+
+            self.diagnostics.truncated = True
+        finally:
+            _setWarningHandler(prev)
+
     def readKickstartFromString(self, s, reset=True):
         """Process a kickstart file, provided as the string str."""
         if reset:
             self._reset()
+            self._prefetchIncludes(s)
 
-        # Add a "" to the end of the list so the string reader acts like the
-        # file reader and we only get StopIteration when we're after the final
-        # line of input.
-        i = PutBackIterator(s.splitlines(True) + [""])
-        self._stateMachine(i)
+        self._readLines(s.splitlines(True))
+
+    def readKickstartFromLines(self, lines, reset=True):
+        """Process a kickstart file, provided as an iterable of strings such
+           as a file opened in text mode or a generator.  The strings do not
+           have to be whole lines.  They are read only as the parser gets to
+           them, so the whole file is never in memory at once.  %include
+           files are not prefetched, since finding them would mean reading
+           ahead.
+        """
+        if reset:
+            self._reset()
+
+        self._readLines(_splitChunks(lines))
+
+    def readKickstartFromFile(self, fileobj, reset=True):
+        """Process a kickstart file, provided as a file object or mmap open
+           for reading.  Binary input is decoded as UTF-8, the same as the
+           files read by readKickstart.  See readKickstartFromLines.
+        """
+        first = fileobj.readline()
+        lines = itertools.chain([first], iter(fileobj.readline, first[:0]))
+
+        if isinstance(first, bytes):
+            lines = codecs.iterdecode(lines, "utf-8")
+
+        self.readKickstartFromLines(lines, reset=reset)
 
     def readKickstart(self, f, reset=True):
-        """Process a kickstart file, given by the filename f."""
+        """Process a kickstart file, given by the filename f.  Local files
+           are read a line at a time unless %include files are being
+           prefetched, which needs the whole file.
+        """
         if reset:
             self._reset()
 
@@ -858,11 +1338,28 @@ class KickstartParser(object):
             cd = os.path.abspath(cd)
         self.currentdir[self._includeDepth] = cd
 
+        if not is_url(f) and not (self._prefetched and f in self._prefetched) \
+           and not (reset and self.prefetch and self.followIncludes):
+            try:
+                fh = open(f, "rb")
+            except IOError as e:
+                raise KickstartError(_("Unable to open input kickstart file: %s") % (_("Error opening file: %s") % str(e)), lineno=0)
+
+            with fh:
+                self._nextSource = f
+                self.readKickstartFromFile(fh, reset=False)
+
+            return
+
         try:
-            s = load_to_str(f)
+            s = _loadToStr(f, self._prefetched)
         except KickstartError as e:
             raise KickstartError(_("Unable to open input kickstart file: %s") % str(e), lineno=0)
 
+        if reset:
+            self._prefetchIncludes(s)
+
+        self._nextSource = f
         self.readKickstartFromString(s, reset=False)
 
     def setupSections(self):
@@ -29,12 +29,13 @@ treated just the same as a predefined one by the kickstart parser.  All that
 is necessary is to create a new subclass of Section and call
 parser.registerSection with an instance of your new class.
 """
-import warnings
+import io
+
 from pykickstart.constants import KS_SCRIPT_PRE, KS_SCRIPT_POST, KS_SCRIPT_TRACEBACK, \
                                   KS_SCRIPT_PREINSTALL, KS_SCRIPT_ONERROR, \
                                   KS_MISSING_IGNORE, KS_MISSING_PROMPT, \
                                   KS_BROKEN_IGNORE, KS_BROKEN_REPORT
-from pykickstart.errors import KickstartParseError, KickstartDeprecationWarning
+from pykickstart.errors import KickstartParseError, KickstartDeprecationWarning, warn
 from pykickstart.options import KSOptionParser
 from pykickstart.version import FC4, F7, F9, F18, F21, F22, F24, F32, F34, F40, F42, F45
 from pykickstart.version import isRHEL, RHEL6, RHEL7, RHEL9, RHEL10
@@ -50,14 +51,17 @@ class Section(object):
                       for every line in the section, even blanks and comments?
        sectionOpen -- The string that denotes the start of this section.  You
                       must start your tag with a percent sign.
+
+       Instance attributes:
+
+       span        -- The pykickstart.parser.SourceSpan of the section being
+                      finished, set by the parser before finalize is called.
        timesSeen   -- This attribute is for informational purposes only.  It is
                       incremented every time handleHeader is called to keep
-                      track of the number of times a section of this type is
-                      seen.
+                      track of the number of times this section is seen.
     """
     allLines = False
     sectionOpen = ""
-    timesSeen = 0
 
     def __init__(self, handler, **kwargs):
         """Create a new Script instance.  At the least, you must pass in an
@@ -70,6 +74,8 @@ class Section(object):
         """
         self.handler = handler
         self.version = self.handler.version
+        self.timesSeen = 0
+        self.span = None
 
         self.dataObj = kwargs.get("dataObj", None)
 
@@ -182,13 +188,20 @@ class ScriptSection(Section):
 
     def _resetScript(self):
         self._script = {"interp": "/bin/sh", "log": None, "errorOnFail": False,
-                        "lineno": None, "chroot": False, "body": []}
+                        "lineno": None, "chroot": False, "body": io.StringIO(),
+                        "blank": True}
 
     def handleLine(self, line):
-        self._script["body"].append(line)
+        # The body is collected in one buffer rather than a list of lines,
+        # which for scripts carrying large payloads takes a fraction of the
+        # memory.  Whether it is all whitespace is tracked along the way so
+        # it doesn't have to be copied to find out.
+        self._script["body"].write(line)
+        if self._script["blank"] and line and not line.isspace():
+            self._script["blank"] = False
 
     def finalize(self):
-        if " ".join(self._script["body"]).strip() == "":
+        if self._script["blank"]:
             return
 
         kwargs = {"interp": self._script["interp"],
@@ -196,10 +209,12 @@ class ScriptSection(Section):
                   "lineno": self._script["lineno"],
                   "logfile": self._script["log"],
                   "errorOnFail": self._script["errorOnFail"],
-                  "type": self._script["type"]}
+                  "type": self._script["type"],
+                  "span": self.span,
+                  "version": self.version}
 
         if self.dataObj is not None:
-            s = self.dataObj(self._script["body"], **kwargs)
+            s = self.dataObj(self._script["body"].getvalue(), **kwargs)
             self._resetScript()
             self.handler.scripts.append(s)
 
@@ -453,15 +468,18 @@ class TracebackScriptSection(OnErrorScriptSection):
         if self.version < F34:
             return
 
-        warnings.warn("The %traceback section has been deprecated. It may be removed in the "
-                      "future, which will result in a fatal error from kickstart. Please modify "
-                      "your kickstart file to use the %onerror section instead.",
-                      KickstartDeprecationWarning)
+        warn("The %traceback section has been deprecated. It may be removed in the "
+             "future, which will result in a fatal error from kickstart. Please modify "
+             "your kickstart file to use the %onerror section instead.",
+             KickstartDeprecationWarning)
 
 class PackageSection(Section):
     sectionOpen = "%packages"
     _title = "Package Selection"
 
+    def finalize(self):
+        self.handler.packages.span = self.span
+
     def handleLine(self, line):
         h = line.partition('#')[0]
         line = h.rstrip()
@@ -842,7 +860,7 @@ class PackageSection(Section):
 
     def _warn_alias_future_deprecation(self, option, new_option, lineno):
         """Show a warning about a future deprecation of the specified alias."""
-        warnings.warn(_(
+        warn(_(
             "The %(option)s option on line %(lineno)s will be deprecated in "
             "future releases. Please modify your kickstart file to replace "
             "this option with its preferred alias %(new_option)s."
@@ -969,6 +987,7 @@ class CertificateSection(Section):
             "filename": self._certificate["filename"],
             "dir": self._certificate["dir"],
             "type": self._certificate["type"],
+            "span": self.span,
         }
 
         if self.dataObj is not None:
@@ -45,7 +45,7 @@ This module also exports several functions:
                       syntax it uses.  This requires the kickstart file to
                       have a version= comment in it.
 """
-import os, re, sys
+import re
 
 import importlib
 
@@ -116,8 +116,48 @@ DEVEL = F45
 # On RHEL it points to the RHEL version that should be the default when no version is passed
 DEFAULT_VERSION = DEVEL
 
+class _VersionMap(dict):
+    """The type of versionMap, which throws away the reverse maps built from
+       it by _reverseMaps whenever it is changed.
+    """
+    def _changed(self):
+        global _reverse
+        _reverse = None
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        dict.clear(self)
+        self._changed()
+
+    def pop(self, *args):
+        self._changed()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._changed()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._changed()
+
 # A one-to-one mapping from string representations to version numbers.
-versionMap = {
+versionMap = _VersionMap({
     "DEVEL": DEVEL,
     "FC3": FC3, "FC4": FC4, "FC5": FC5, "FC6": FC6, "F7": F7, "F8": F8,
     "F9": F9, "F10": F10, "F11": F11, "F12": F12, "F13": F13,
@@ -131,7 +171,20 @@ versionMap = {
     "RHEL3": RHEL3, "RHEL4": RHEL4, "RHEL5": RHEL5, "RHEL6": RHEL6,
     "RHEL7": RHEL7, "RHEL8": RHEL8, "RHEL9": RHEL9, "RHEL10": RHEL10,
     "RHEL11": RHEL11
-}
+})
+
+# A tuple of versionMap and the maps from version numbers to their short and
+# long names built from it, or None if they need to be built.  This is
+# maintained by _reverseMaps.
+_reverse = None
+
+# Patterns for the long forms accepted by stringToVersion.
+_fedoraPattern = re.compile(r"^fedora.* (\d+)$", re.I)
+_rhelPattern = re.compile(r"^red hat enterprise linux.* (\d+)([\.\d]*)$", re.I)
+
+# The syntax handler class for each version, keyed by whatever was passed to
+# returnClassForVersion.  This dict is maintained by returnClassForVersion.
+_handlerClasses = {}
 
 def stringToVersion(s):
     """Convert string into one of the provided version constants.  Raises
@@ -144,7 +197,7 @@ def stringToVersion(s):
         pass
 
     # Now try the Fedora versions.
-    m = re.match(r"^fedora.* (\d+)$", s, re.I)      # pylint: disable=no-member
+    m = _fedoraPattern.match(s)
 
     if m and m.group(1):
         if "FC" + m.group(1) in versionMap:
@@ -155,7 +208,7 @@ def stringToVersion(s):
             raise KickstartVersionError(_("Unsupported version specified: %s") % s)
 
     # Now try the RHEL versions.
-    m = re.match(r"^red hat enterprise linux.* (\d+)([\.\d]*)$", s, re.I)       # pylint: disable=no-member
+    m = _rhelPattern.match(s)
 
     if m and m.group(1):
         if "RHEL" + m.group(1) in versionMap:
@@ -166,6 +219,27 @@ def stringToVersion(s):
     # If nothing else worked, we're out of options.
     raise KickstartVersionError(_("Unsupported version specified: %s") % s)
 
+def _reverseMaps():
+    """Return a tuple of dicts mapping each version number to its short name
+       and to its long name, building them from versionMap if needed.
+    """
+    global _reverse
+
+    if _reverse is None or _reverse[0] is not versionMap:
+        names = {}
+        for (key, val) in versionMap.items():
+            if key != "DEVEL":
+                names.setdefault(val, key)
+
+        longNames = {}
+        for (val, key) in names.items():
+            result = key.replace('FC', 'F').replace('F', 'Fedora')
+            longNames[val] = result.replace('RHEL', 'RedHatEnterpriseLinux')
+
+        _reverse = (versionMap, names, longNames)
+
+    return _reverse[1:]
+
 def versionToString(version, skipDevel=False):
     """Convert version into a string representation of the version number.
        This is the reverse operation of stringToVersion.  Raises
@@ -174,22 +248,19 @@ def versionToString(version, skipDevel=False):
     if not skipDevel and version == versionMap["DEVEL"]:
         return "DEVEL"
 
-    for (key, val) in list(versionMap.items()):
-        if key == "DEVEL":
-            continue
-        elif val == version:
-            return key
-
-    raise KickstartVersionError(_("Unsupported version specified: %s") % version)
+    try:
+        return _reverseMaps()[0][version]
+    except (KeyError, TypeError):
+        raise KickstartVersionError(_("Unsupported version specified: %s") % version)
 
 def versionToLongString(version):
     """
         Convert version into a long string representation.
     """
-    result = versionToString(version, True)
-    result = result.replace('FC', 'F').replace('F', 'Fedora')
-    result = result.replace('RHEL', 'RedHatEnterpriseLinux')
-    return result
+    try:
+        return _reverseMaps()[1][version]
+    except (KeyError, TypeError):
+        raise KickstartVersionError(_("Unsupported version specified: %s") % version)
 
 def versionFromFile(f):
     """Given a file or URL, look for a line starting with #version= and
@@ -216,24 +287,27 @@ def returnClassForVersion(version=DEFAULT_VERSION):
        if version does not match anything.
     """
     try:
-        version = int(version)
-        module = "%s" % versionToString(version, skipDevel=True)
+        return _handlerClasses[version]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        number = int(version)
     except ValueError:
-        module = "%s" % version
-        version = stringToVersion(version)
+        number = stringToVersion(version)
 
-    module = module.lower()
+    module = versionToString(number, skipDevel=True).lower()
 
+    # Each module in pykickstart.handlers exports a single handler class,
+    # named first in its __all__.
     try:
-        _path = os.path.join(os.path.dirname(__file__), "handlers/")
-        sys.path.extend([_path])
-        loaded = importlib.import_module(module)
-
-        for (k, v) in list(loaded.__dict__.items()):
-            if k.lower().endswith("%shandler" % module):
-                return v
-    except:
-        raise KickstartVersionError(_("Unsupported version specified: %s") % version)
+        loaded = importlib.import_module("pykickstart.handlers.%s" % module)
+        cls = getattr(loaded, loaded.__all__[0])
+    except (ImportError, AttributeError, IndexError):
+        raise KickstartVersionError(_("Unsupported version specified: %s") % number)
+
+    _handlerClasses[version] = cls
+    return cls
 
 def makeVersion(version=DEFAULT_VERSION):
     """Return a new instance of the syntax handler for version.  version can be
@@ -167,6 +167,65 @@ class BaseClasses_TestCase(ParserTest):
         self.assertEqual(data.testAttr, 'test-me')
         self.assertFalse(hasattr(data, 'missingAttr'))
 
+class ParserCache_TestCase(unittest.TestCase):
+    def runTest(self):
+        # Instances of the same class share the options of a single parser,
+        # but each has its own copy of the parser itself.
+        first = F24_User()
+        second = F24_User()
+        self.assertIsNot(first.op, second.op)
+        self.assertIs(first.op._actions, second.op._actions)
+
+        # Callbacks that are methods of the command run on the right object.
+        first = F25Handler()
+        second = F25Handler()
+
+        with self.assertRaisesRegex(KickstartParseError, "line 20"):
+            second.dispatcher(["raid", "/", "--device=md0", "--level=bogus", "raid.01"], 20)
+
+        data = first.dispatcher(["raid", "/", "--device=md0", "--level=1", "raid.01"], 10)
+        self.assertEqual(data.level, "RAID1")
+        self.assertEqual(data.device, "0")
+
+        # Choices that are attributes of the command are checked against the
+        # object the parser was copied for, as they are now.
+        first.network.bootprotoList.append("custom")
+        data = first.dispatcher(["network", "--bootproto=custom"], 30)
+        self.assertEqual(data.bootProto, "custom")
+
+        with self.assertRaises(KickstartParseError):
+            second.dispatcher(["network", "--bootproto=custom"], 31)
+
+        second.network.bootprotoList = ["other"]
+        data = second.dispatcher(["network", "--bootproto=other"], 32)
+        self.assertEqual(data.bootProto, "other")
+
+        with self.assertRaises(KickstartParseError):
+            second.dispatcher(["network", "--bootproto=dhcp"], 33)
+
+        # Replacing _getParser builds a new parser.
+        class PatchedUser(F24_User):
+            pass
+
+        before = PatchedUser().op
+        orig = PatchedUser._getParser
+
+        def _getParser(cmd):
+            op = orig(cmd)
+            op.add_argument("--patched", action="store_true", version=F25, help="")
+            return op
+
+        PatchedUser._getParser = _getParser
+        after = PatchedUser().op
+        self.assertIsNot(before._actions, after._actions)
+        self.assertTrue(after.parse_args(["--name=x", "--patched"]).patched)
+
+        # As does invalidating the cache, which leaves parent classes alone.
+        userActions = F24_User().op._actions
+        PatchedUser.invalidateParserCache()
+        self.assertIsNot(after._actions, PatchedUser().op._actions)
+        self.assertIs(F24_User().op._actions, userActions)
+
 class KickstartHandler_TestCase(unittest.TestCase):
     def runTest(self):
         handler = KickstartHandler()
@@ -287,6 +346,32 @@ class HandlerDispatch_TestCase(ParserTest):
         self.handler.dispatcher(['network', '--device', 'eth0'], 1)
         self.assertEqual(self.handler.network.dataList()[0].device, 'eth0')
 
+class HandlerDispatchLookup_TestCase(unittest.TestCase):
+    def runTest(self):
+        handler = F25Handler()
+        commands = type(handler.commands)
+
+        # Each dispatched command is only looked up once.
+        for args in [["autopart"], ["network", "--device", "eth0"], ["part", "/"]]:
+            with mock.patch.object(commands, "__getitem__", autospec=True,
+                                   side_effect=commands.__getitem__) as getitem:
+                # part conflicts with the autopart seen above.
+                if args[0] == "part":
+                    self.assertRaises(KickstartParseError, handler.dispatcher, args, 1)
+                else:
+                    handler.dispatcher(args, 1)
+
+            self.assertEqual([call.args[1] for call in getitem.call_args_list], [args[0]])
+
+        # Conflicts are still found when checked directly, but not for
+        # commands that haven't been seen.
+        handler = F25Handler()
+        handler._checkConflictingCommands("part", ["autopart"], lineno=1)
+        handler.autopart.seen = True
+        with self.assertRaises(KickstartParseError) as cm:
+            handler._checkConflictingCommands("part", ["autopart"], lineno=1)
+        self.assertEqual(cm.exception.lineno, 1)
+
 
 class HandlerMask_TestCase(ParserTest):
     def runTest(self):
@@ -312,5 +397,100 @@ class HandlerMask_TestCase(ParserTest):
         self.assertFalse(self.handler.autopart.encrypted)
         self.assertEqual(self.handler.autopart.passphrase, "")
 
+class FindData_TestCase(unittest.TestCase):
+    def runTest(self):
+        from pykickstart.handlers.control import dataMap
+
+        # Identity keys are hashable and agree with __eq__.
+        for mapping in dataMap.values():
+            for dataClass in mapping.values():
+                if dataClass is None:
+                    continue
+
+                (a, b) = (dataClass(), dataClass())
+                if a.identityKey() is None:
+                    continue
+
+                hash(a.identityKey())
+                self.assertEqual(a, b)
+                self.assertEqual(a.identityKey(), b.identityKey())
+
+        handler = F25Handler()
+        network = handler.network
+        eth0 = handler.NetworkData(device="eth0")
+        eth1 = handler.NetworkData(device="eth1")
+
+        self.assertIsNone(network.findData(eth0))
+        network.network.append(eth0)
+        self.assertIs(network.findData(handler.NetworkData(device="eth0")), eth0)
+        self.assertIsNone(network.findData(eth1))
+
+        # Appending to the list is picked up.
+        network.network.append(eth1)
+        self.assertIs(network.findData(handler.NetworkData(device="eth1")), eth1)
+
+        # So are replacing the list and removing from it.
+        network.network = [eth1]
+        self.assertIsNone(network.findData(eth0))
+        network.network.remove(eth1)
+        self.assertIsNone(network.findData(eth1))
+
+        # An object changed after it was indexed is not found under its
+        # old key.
+        network.network.append(eth0)
+        self.assertIs(network.findData(eth0), eth0)
+        eth0.device = "eth2"
+        self.assertIsNone(network.findData(handler.NetworkData(device="eth0")))
+
+        # Objects without an identity key are compared one by one.
+        class UnkeyedNetworkData(handler.NetworkData):
+            def identityKey(self):
+                return None
+
+        network.network = [handler.NetworkData(device="eth3")]
+        self.assertIs(network.findData(UnkeyedNetworkData(device="eth3")), network.network[0])
+
+class HandlerLazyCommands_TestCase(unittest.TestCase):
+    def runTest(self):
+        handler = F25Handler()
+
+        # Nothing has been created yet, but everything is known.
+        self.assertIsNone(handler.commands.peek("part"))
+        self.assertIn("part", handler.commands)
+        self.assertTrue(handler.hasCommand("partition"))
+        self.assertIsNone(handler.commands.peek("partition"))
+        self.assertFalse(handler.hasCommand("fakecommand"))
+        self.assertRaises(AttributeError, getattr, handler, "fakecommand")
+
+        # Untouched commands are written out like new instances would be.
+        self.assertEqual(str(handler), str(F25Handler()))
+        self.assertIn("bootloader --location=none", str(handler))
+        self.assertIsNone(handler.commands.peek("bootloader"))
+
+        # The attribute and all names for a command share one object.
+        partition = handler.partition
+        self.assertIs(handler.commands.peek("part"), partition)
+        self.assertIs(handler.commands["part"], partition)
+        self.assertIs(handler.commands["partition"], partition)
+        self.assertIs(partition.handler, handler)
+
+        # Looking up a command by name creates the attribute as well.
+        rootpw = handler.commands["rootpw"]
+        self.assertIs(handler.rootpw, rootpw)
+
+        # Conflict checks don't need to create the other command.
+        handler.dispatcher(["autopart"], 1)
+        self.assertIsNone(handler.commands.peek("logvol"))
+
+        # Masked commands are neither created nor written out.
+        handler = F25Handler()
+        handler.maskAllExcept(["rootpw"])
+        handler.dispatcher(["rootpw", "--plaintext", "secret"], 1)
+        handler.dispatcher(["autopart"], 1)
+        self.assertEqual(handler.rootpw.password, "secret")
+        self.assertFalse(handler.autopart.autopart)
+        self.assertNotIn("rootpw", str(handler))
+        self.assertNotIn("bootloader", str(handler))
+
 if __name__ == "__main__":
     unittest.main()
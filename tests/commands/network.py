@@ -18,6 +18,7 @@
 # with the express permission of Red Hat, Inc.
 #
 import unittest
+from unittest import mock
 
 from pykickstart.errors import KickstartParseWarning
 from tests.baseclass import CommandTest, CommandSequenceTest
@@ -134,6 +135,36 @@ network --device=eth1""")
 network --device=eth0
 network --device=eth0""", KickstartParseWarning)
 
+class FC3_DuplicateScaling_TestCase(CommandSequenceTest):
+    def __init__(self, *args, **kwargs):
+        CommandSequenceTest.__init__(self, *args, **kwargs)
+        self.version = FC3
+
+    def runTest(self):
+        # Duplicates are still found at the end of a long list.
+        self.assert_parse_error("".join("network --device=eth%d\n" % i for i in range(1000)) +
+                                "network --device=eth500", KickstartParseWarning)
+
+        # Checking for duplicates shouldn't compare each new device with
+        # every one before it.
+        compared = []
+        eq = FC3_NetworkData.__eq__
+
+        def countingEq(x, y):
+            compared.append((x, y))
+            return eq(x, y)
+
+        with mock.patch.object(FC3_NetworkData, "__eq__", countingEq):
+            parser = self.get_parser()
+            parser.readKickstartFromString("".join("network --device=eth%d\n" % i for i in range(2000)))
+            self.assertEqual(len(parser.handler.network.network), 2000)
+            self.assertEqual(compared, [])
+
+            with self.assertWarns(KickstartParseWarning):
+                parser.readKickstartFromString("network --device=eth1999\n", reset=False)
+
+            self.assertEqual(len(compared), 1)
+
 class RHEL4_TestCase(FC3_TestCase):
     def runTest(self):
         FC3_TestCase.runTest(self)
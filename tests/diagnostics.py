@@ -0,0 +1,133 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import warnings
+
+from pykickstart.errors import Diagnostics, KickstartParseError, KickstartParseWarning, \
+    ERROR, WARNING
+from pykickstart.parser import KickstartParser
+from pykickstart.version import DEVEL, makeVersion
+
+def parse(ks, diagnostics, **kwargs):
+    """Parse ks, returning the parser and what was printed to stderr."""
+    parser = KickstartParser(makeVersion(DEVEL), errorsAreFatal=False, diagnostics=diagnostics, **kwargs)
+    stderr = io.StringIO()
+
+    with contextlib.redirect_stderr(stderr):
+        parser.readKickstartFromString(ks)
+
+    return (parser, stderr.getvalue())
+
+class Diagnostics_Errors_TestCase(unittest.TestCase):
+    def runTest(self):
+        ks = "text\nbogus\npart --nosuchoption\n%post --nosuchoption\n%end\n"
+        diagnostics = Diagnostics()
+        (parser, stderr) = parse(ks, diagnostics)
+
+        self.assertEqual(stderr, "")
+        self.assertEqual(parser.errorsCount, 3)
+        self.assertEqual([e.severity for e in diagnostics.entries], [ERROR] * 3)
+        self.assertEqual([e.category for e in diagnostics.entries], [KickstartParseError] * 3)
+        self.assertEqual([e.lineno for e in diagnostics.entries], [2, 3, 4])
+        self.assertEqual([e.span.startLine for e in diagnostics.entries], [2, 3, 4])
+        self.assertEqual(diagnostics.entries[1].span.startOffset, len("text\nbogus\n"))
+        self.assertEqual(diagnostics.errors, diagnostics.entries)
+        self.assertEqual(diagnostics.warnings, [])
+        self.assertFalse(diagnostics.truncated)
+
+        # Nothing is formatted until it's asked for, and tracebacks aren't
+        # kept around.
+        entry = diagnostics.entries[0]
+        self.assertIsNone(entry.detail.__traceback__)
+        self.assertIsNotNone(entry.detail._unformatted)
+        self.assertIn("Unknown command: bogus", entry.message)
+        self.assertEqual(str(entry), entry.message)
+
+        diagnostics.clear()
+        self.assertEqual(diagnostics.entries, [])
+
+class Diagnostics_Warnings_TestCase(unittest.TestCase):
+    def runTest(self):
+        ks = "user --name=a\nuser --name=a\n"
+
+        # Warnings are captured without going through the warnings module.
+        diagnostics = Diagnostics(captureWarnings=True)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            (parser, _stderr) = parse(ks, diagnostics)
+
+        self.assertEqual(w, [])
+        self.assertEqual(parser.errorsCount, 0)
+        self.assertEqual(len(diagnostics.warnings), 1)
+        self.assertEqual(diagnostics.warnings[0].severity, WARNING)
+        self.assertEqual(diagnostics.warnings[0].category, KickstartParseWarning)
+        self.assertEqual(diagnostics.warnings[0].lineno, 2)
+        self.assertIn("a", diagnostics.warnings[0].message)
+
+        # Unless they aren't to be captured.
+        diagnostics = Diagnostics()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            parse(ks, diagnostics)
+
+        self.assertEqual(len(w), 1)
+        self.assertEqual(diagnostics.entries, [])
+
+        # Or they are errors.
+        diagnostics = Diagnostics(captureWarnings=True)
+        (parser, _stderr) = parse(ks, diagnostics, warningsAreErrors=True)
+        self.assertEqual(parser.errorsCount, 1)
+        self.assertEqual([(e.severity, e.category) for e in diagnostics.entries], [(ERROR, KickstartParseWarning)])
+
+class Diagnostics_Fatal_TestCase(unittest.TestCase):
+    def runTest(self):
+        # Fatal errors are raised the same as without diagnostics.
+        diagnostics = Diagnostics()
+        parser = KickstartParser(makeVersion(DEVEL), diagnostics=diagnostics)
+
+        with self.assertRaises(KickstartParseError):
+            parser.readKickstartFromString("bogus\n")
+
+        self.assertEqual(diagnostics.entries, [])
+
+class Diagnostics_Limit_TestCase(unittest.TestCase):
+    def runTest(self):
+        ks = "bogus\n" * 10 + "text\n"
+        diagnostics = Diagnostics(limit=3)
+        (parser, _stderr) = parse(ks, diagnostics)
+
+        self.assertEqual(len(diagnostics.entries), 3)
+        self.assertEqual(parser.errorsCount, 3)
+        self.assertTrue(diagnostics.truncated)
+        self.assertFalse(parser.handler.displaymode.seen)
+
+        # Reaching the limit in an %include stops the file including it too.
+        with tempfile.TemporaryDirectory() as d:
+            include = os.path.join(d, "include.ks")
+            with open(include, "w") as f:
+                f.write("bogus\nbogus\ntext\n")
+
+            diagnostics = Diagnostics(limit=2)
+            (parser, _stderr) = parse("%%include %s\nrootpw abc\n" % include, diagnostics)
+
+        self.assertTrue(diagnostics.truncated)
+        self.assertEqual([e.span.source for e in diagnostics.entries], [1, 1])
+        self.assertFalse(parser.handler.displaymode.seen)
+        self.assertFalse(parser.handler.rootpw.seen)
+        self.assertEqual(parser._includeDepth, 0)
+
+        # One line can add more entries than the limit allows, but those past
+        # it are dropped.
+        diagnostics = Diagnostics(captureWarnings=True, limit=2)
+        (parser, _stderr) = parse("timezone --isUtc --ntpservers=a --nontp Europe/Prague\ntext\n", diagnostics)
+
+        self.assertEqual(len(diagnostics.entries), 2)
+        self.assertEqual([e.severity for e in diagnostics.entries], [WARNING, WARNING])
+        self.assertEqual(parser.errorsCount, 1)
+        self.assertTrue(diagnostics.truncated)
+        self.assertFalse(parser.handler.displaymode.seen)
+
+if __name__ == "__main__":
+    unittest.main()
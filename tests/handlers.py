@@ -1,10 +1,14 @@
+import os
 import unittest
+from unittest import mock
 import importlib
 from textwrap import dedent
 
 from pykickstart.version import *           # pylint: disable=wildcard-import
+from pykickstart import base
 from pykickstart.handlers import control
-from pykickstart.base import KickstartCommand, BaseData, BaseHandler
+from pykickstart.base import KickstartCommand, BaseData, BaseHandler, KickstartHandler, \
+    _CommandDict, _commandName
 
 
 class HandlerMappingTestCase(unittest.TestCase):
@@ -239,5 +243,148 @@ class HandlerUpdateTestCase(unittest.TestCase):
         self._test_handler(command_updates, data_updates)
         self._test_handler(dict(), dict())
 
+class _UnsearchableCommandDict(_CommandDict):
+    def __iter__(self):
+        raise AssertionError("the commands dict was searched")
+
+class HandlerRegisterCommand_TestCase(unittest.TestCase):
+    """
+        Registering a command should look up an existing object for its
+        class without searching the commands already registered, and keep
+        the write order sorted without sorting it again.
+    """
+    def runTest(self):
+        handler = KickstartHandler()
+        handler.commands = _UnsearchableCommandDict(handler)
+        classes = set()
+
+        for version in control.commandMap:
+            for (cmdName, cmdClass) in control.commandMap[version].items():
+                handler.registerCommand("%s-%s" % (cmdName, version), cmdClass)
+                classes.add(cmdClass)
+
+        # Each class was created once and shared by all of its names.
+        self.assertEqual(len(handler.commands._data),
+                         sum(len(mapping) for mapping in control.commandMap.values()))
+        self.assertEqual(len({id(obj) for obj in handler.commands._data.values()}), len(classes))
+
+        for cmdClass in classes:
+            self.assertIs(handler._commandsByClassName[cmdClass.__name__].__class__, cmdClass)
+
+        for (prio, lst) in handler._writeOrder.items():
+            names = [_commandName(obj.__class__) for obj in lst]
+            self.assertEqual(names, sorted(names))
+            self.assertEqual(names, handler._writeOrderNames[prio])
+
+class LazyHandlerMap_TestCase(unittest.TestCase):
+    """
+        The command and data maps only import the handler modules of the
+        versions that are looked up.
+    """
+    script = dedent("""
+    import sys
+    from pykickstart.handlers import control
+    from pykickstart.version import F30, makeVersion
+
+    def loaded():
+        return sorted(m for m in sys.modules if m.startswith("pykickstart.handlers."))
+
+    print(len(control.commandMap), F30 in control.commandMap, loaded())
+    makeVersion(F30)
+    print(loaded())
+    """)
+
+    def runTest(self):
+        import subprocess
+        import sys
+
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.check_output([sys.executable, "-c", self.script], env=env, text=True)
+        self.assertEqual(output.splitlines(), [
+            "%d True ['pykickstart.handlers.control']" % len(set(versionMap.values())),
+            "['pykickstart.handlers.control', 'pykickstart.handlers.f30']"
+        ])
+
+        # Every version is there once it's asked for.
+        self.assertEqual(set(control.commandMap), set(versionMap.values()))
+        self.assertEqual(set(control.dataMap), set(versionMap.values()))
+        for version in control.commandMap:
+            self.assertIs(control.commandMap[version], returnClassForVersion(version).commandMap)
+            self.assertIs(control.dataMap[version], returnClassForVersion(version).dataMap)
+
+        self.assertNotIn(-1, control.commandMap)
+        with self.assertRaises(KeyError):
+            control.dataMap[-1]     # pylint: disable=pointless-statement
+
+class HandlerFresh_TestCase(unittest.TestCase):
+    ks = dedent("""
+    network --device=eth0 --bootproto=dhcp
+    part / --size=1000
+    rootpw --plaintext secret
+    %post
+    echo hi
+    %end
+    """)
+
+    def runTest(self):
+        from pykickstart.parser import KickstartParser
+
+        for version in control.commandMap:
+            handler = makeVersion(version)
+            KickstartParser(handler, errorsAreFatal=False).readKickstartFromString(self.ks)
+
+            # A fresh handler is the same as a new one, whatever was done to
+            # the one it came from.
+            fresh = handler.fresh()
+            self.assertIsInstance(fresh, handler.__class__)
+            self.assertEqual(str(fresh), str(makeVersion(version)))
+            self.assertEqual(sorted(fresh.commands), sorted(handler.commands))
+            self.assertEqual(fresh.scripts, [])
+            self.assertIsNot(fresh.packages, handler.packages)
+
+            # And it can be used without affecting the original.
+            before = str(handler)
+            KickstartParser(fresh, errorsAreFatal=False).readKickstartFromString(self.ks)
+            self.assertEqual(str(fresh), before)
+            fresh.resetCommand("part")
+            self.assertEqual(str(handler), before)
+
+        # Handlers made with different commands keep them.
+        class FooCommand(KickstartCommand):
+            def parse(self, args):
+                return self
+
+        handler = returnClassForVersion(DEVEL)(commandUpdates={"foo": FooCommand})
+        fresh = handler.fresh()
+        self.assertIsInstance(fresh.commands["foo"], FooCommand)
+        self.assertIsNot(fresh.commands["foo"], handler.commands["foo"])
+        self.assertNotIn("foo", makeVersion(DEVEL).commands)
+
+class HandlerFreshRegistrations_TestCase(unittest.TestCase):
+    """
+        Getting a fresh handler, or one from makeVersion, should share the
+        registrations worked out from the command and data maps instead of
+        working them out again, and shouldn't create any command objects.
+    """
+    def runTest(self):
+        with mock.patch.dict(base._registrationCache, clear=True), \
+             mock.patch.object(base, "_Registrations", wraps=base._Registrations) as registrations:
+            handler = makeVersion(DEVEL)
+            self.assertEqual(registrations.call_count, 1)
+
+            for _i in range(10):
+                fresh = handler.fresh()
+                self.assertIs(fresh._registrations, handler._registrations)
+                self.assertTrue(all(isinstance(value, type) for value in fresh.commands._data.values()))
+
+                self.assertIs(makeVersion(DEVEL)._registrations, handler._registrations)
+
+            self.assertEqual(registrations.call_count, 1)
+
+            # Handlers built from maps of their own work them out every time.
+            cls = returnClassForVersion(DEVEL)
+            cls(mapping=dict(control.commandMap[DEVEL]), dataMapping=dict(control.dataMap[DEVEL]))
+            self.assertEqual(registrations.call_count, 2)
+
 if __name__ == "__main__":
     unittest.main()
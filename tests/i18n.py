@@ -0,0 +1,52 @@
+import os
+import unittest
+from unittest import mock
+
+from pykickstart import errors, i18n
+from pykickstart.errors import KickstartParseError
+
+class Translation_Cache_TestCase(unittest.TestCase):
+    def runTest(self):
+        i18n.reset_translation()
+
+        with mock.patch("gettext.translation", wraps=i18n.gettext.translation) as translation:
+            # The translation is only looked up once for the same locale.
+            for _i in range(100):
+                i18n._("Unable to open input kickstart file: %s")
+
+            self.assertEqual(translation.call_count, 1)
+
+            # It is looked up again when told to, after the language changes.
+            with mock.patch.dict(os.environ, {"LANGUAGE": "fr"}):
+                i18n.reset_translation()
+                i18n._("Unable to open input kickstart file: %s")
+                self.assertEqual(translation.call_count, 2)
+
+            i18n.reset_translation()
+            i18n._("Unable to open input kickstart file: %s")
+            self.assertEqual(translation.call_count, 3)
+
+        self.assertEqual(i18n._(""), "")
+
+class Error_Lazy_Format_TestCase(unittest.TestCase):
+    def runTest(self):
+        expected = errors._format_error_message(47, "OH NO!")
+
+        with mock.patch("pykickstart.errors._format_error_message",
+                        wraps=errors._format_error_message) as formatMessage:
+            # An error that is never shown is never formatted.
+            err = KickstartParseError("OH NO!", lineno=47)
+            self.assertEqual(formatMessage.call_count, 0)
+
+            # It is formatted once when it's needed, using the line number
+            # and message it was created with.
+            err.lineno = 1
+            self.assertEqual(str(err), expected)
+            self.assertEqual(err.value, expected)
+            self.assertEqual(formatMessage.call_count, 1)
+
+        err.value = "replaced"
+        self.assertEqual(str(err), "replaced")
+
+if __name__ == "__main__":
+    unittest.main()
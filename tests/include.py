@@ -1,13 +1,17 @@
 from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import os
+import shutil
 import tempfile
 import threading
+import time
 import unittest
 
 from tests.baseclass import ParserTest
 
 from pykickstart import constants
 from pykickstart.errors import KickstartError, KickstartParseError
+from pykickstart.parser import KickstartParser, preprocessFromStringToString
+from pykickstart.version import makeVersion
 
 class Base_Include(ParserTest):
     def __init__(self, *args, **kwargs):
@@ -220,5 +224,120 @@ class Include_Bad_URL_TestCase(Include_URL_TestCase):
         self.assertRaisesRegex(KickstartError, "Error accessing URL",
                               self.parser.readKickstartFromString, self.ks % (self._url + "-garbage"))
 
+class SlowRequestHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            self.server.active += 1
+            self.server.maxActive = max(self.server.maxActive, self.server.active)
+
+        try:
+            time.sleep(self.server.delay)
+            super().do_GET()
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+class SlowDirServer(DirServer):
+    def __init__(self, address, directory, delay):
+        super().__init__(address, directory)
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.maxActive = 0
+
+    def finish_request(self, request, client_address):
+        SlowRequestHandler(request, client_address, self, directory=self.directory)
+
+class Base_Prefetch(ParserTest):
+    delay = 0.2
+
+    def setUp(self):
+        ParserTest.setUp(self)
+        self._dir = tempfile.mkdtemp(prefix="prefetch-")
+
+        self._server = SlowDirServer(('127.0.0.1', 0), self._dir, self.delay)
+        self._baseURL = 'http://127.0.0.1:%d/' % self._server.server_port
+        threading.Thread(target=self._server.serve_forever).start()
+
+    def tearDown(self):
+        ParserTest.tearDown(self)
+        self._server.shutdown()
+        shutil.rmtree(self._dir)
+
+    def _write(self, name, contents):
+        with open(os.path.join(self._dir, name), "w") as f:
+            f.write(contents)
+
+        return self._baseURL + name
+
+    def _parse(self, ks, prefetch):
+        handler = makeVersion(self.version)
+        parser = KickstartParser(handler, prefetch=prefetch)
+
+        parser.readKickstartFromString(ks)
+        return handler
+
+class Include_Prefetch_TestCase(Base_Prefetch):
+    def runTest(self):
+        nested = self._write("nested.ks", "%post\necho nested\n%end\n")
+        ks = "%%include %s\n" % self._write("outer.ks", "%%include %s\n" % nested)
+
+        for i in range(5):
+            ks += "%%include %s\n" % self._write("post%d.ks" % i, "%%post\necho %d\n%%end\n" % i)
+
+        handler = self._parse(ks, prefetch=True)
+
+        # Each URL was fetched once, and several of them at the same time.
+        self.assertEqual(len(self._server.requests), 7)
+        self.assertGreater(self._server.maxActive, 1)
+
+        # The result is the same as without prefetching.
+        expected = self._parse(ks, prefetch=False)
+        self.assertEqual([s.script for s in handler.scripts], [s.script for s in expected.scripts])
+        self.assertEqual(handler.scripts[0].script.rstrip(), "echo nested")
+
+class Include_Prefetch_Error_TestCase(Base_Prefetch):
+    delay = 0
+
+    def _error(self, ks, prefetch):
+        with self.assertRaises(KickstartError) as cm:
+            self._parse(ks, prefetch)
+
+        return str(cm.exception)
+
+    def runTest(self):
+        good = self._write("good.ks", "%post\necho good\n%end\n")
+        ks = "%%include %s\n%%include %s\n%%include %s\n" % (good, self._baseURL + "missing1.ks",
+                                                           self._baseURL + "missing2.ks")
+
+        # The first missing file is the one reported, however the files were
+        # fetched.
+        self.assertIn("missing1.ks", self._error(ks, prefetch=True))
+        self.assertEqual(self._error(ks, prefetch=True), self._error(ks, prefetch=False))
+
+        # %ksappend errors keep their line numbers.
+        ks = "lang en_US\n%%ksappend %s\nautopart\n%%ksappend %s\n" % (good, self._baseURL + "missing1.ks")
+        with self.assertRaises(KickstartError) as cm:
+            preprocessFromStringToString(ks, prefetch=True)
+
+        self.assertEqual(cm.exception.lineno, 4)
+
+class Ksappend_Prefetch_TestCase(Base_Prefetch):
+    def runTest(self):
+        ks = "lang en_US\n"
+        for i in range(5):
+            ks += "%%ksappend %s\n" % self._write("append%d.ks" % i, "part /part%d\n" % i)
+
+        processed = preprocessFromStringToString(ks, prefetch=True)
+        self.assertGreater(self._server.maxActive, 1)
+
+        self.assertEqual(processed, preprocessFromStringToString(ks))
+        self.assertEqual(processed.decode(), "lang en_US\n" + "".join("part /part%d\n" % i for i in range(5)))
+
 if __name__ == "__main__":
     unittest.main()
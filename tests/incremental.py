@@ -0,0 +1,241 @@
+import contextlib
+import io
+import random
+import unittest
+import warnings
+
+from pykickstart.errors import KickstartError
+from pykickstart.incremental import IncrementalParser
+from pykickstart.parser import KickstartParser
+from pykickstart.version import DEVEL, F7, makeVersion
+
+DOCUMENTS = {
+    DEVEL: """#version=DEVEL
+# A storage-heavy file.
+text
+lang en_US.UTF-8
+keyboard us
+network --device=eth0 --bootproto=dhcp
+network --device=eth1 --bootproto=static --ip=10.0.0.2 --netmask=255.255.255.0
+rootpw --plaintext secret
+user --name=alice
+user --name=bob --groups=wheel
+clearpart --all --initlabel
+part /boot --size=1024 --fstype=ext4
+part pv.01 --size=1 --grow
+part swap --recommended
+volgroup vg pv.01
+logvol / --vgname=vg --name=root --size=10000
+logvol /home --vgname=vg --name=home --size=1 --grow
+repo --name=extra --baseurl=http://example.com/repo
+services --enabled=sshd
+
+%pre
+echo "pre" > /tmp/pre
+%end
+
+%packages
+@core
+vim
+%end
+
+%post --log=/root/post.log
+printf "%s\\n" done
+%define x 1
+echo ünïcode
+%end
+
+%certificate --filename=a.pem --dir=/etc/pki
+-----BEGIN CERTIFICATE-----
+%end
+
+%addon com_example
+stuff
+%end
+timezone Europe/Prague
+""",
+    F7: """text
+part / --size=100
+%post
+echo one
+%pre
+echo two
+""",
+}
+
+# Pieces that edits insert, chosen to reach every kind of edit: lines for
+# commands that conflict, errors, duplicates, section headers and ends,
+# %include, #platform, quotes that can't be split, and line endings.
+SNIPPETS = [
+    "part /var --size=100\n", "autopart\n", "mount /dev/sda1 /\n", "reqpart\n",
+    "raid / --level=1 --device=md0 raid.01\n", "network --device=eth0 --bootproto=static\n",
+    "user --name=alice\n", "rootpw abc\n", "bogus command\n", "part --bad\n",
+    "# comment\n", "\n", "   \n", "%post\necho x\n%end\n", "%end\n", "%packages\n",
+    "%include /nonexistent\n", "#platform=x86\n", "%ksappend x\n", "echo %s\n",
+    "\"", "'", "\\", "%", "#", "\r", "\r\n", "\n", " ", "x", "ü", "--size=", "\"\"\n",
+]
+
+def full(version, text):
+    """Read text with a new parser and handler."""
+    parser = KickstartParser(makeVersion(version), errorsAreFatal=False)
+    parser.readKickstartFromString(text)
+    return parser
+
+def state(parser):
+    """Everything about a parse that an edit could change."""
+    handler = parser.handler
+    commands = []
+
+    # Some commands can't write out everything they accept.
+    try:
+        output = str(handler)
+    except TypeError as e:
+        output = type(e)
+
+    for name in sorted(handler.commands):
+        cmd = handler.commands[name]
+        if cmd is None:
+            continue
+
+        data = [(obj.lineno, obj.span, str(obj)) for obj in cmd.dataList() or []]
+        commands.append((name, cmd.seen, cmd.lineno, cmd.span, data))
+
+    scripts = [(script.lineno, script.span, script.script) for script in handler.scripts]
+    certificates = [(cert.span, cert.cert) for cert in handler.certificates]
+    return (output, parser.errorsCount, handler.platform, commands, scripts,
+            certificates, handler.packages.span)
+
+class Incremental_Differential_TestCase(unittest.TestCase):
+    def _edit(self, rng, text):
+        start = rng.randint(0, len(text))
+        op = rng.random()
+
+        if op < 0.4:
+            return (start, start, rng.choice(SNIPPETS))
+        elif op < 0.7:
+            return (start, min(len(text), start + rng.randint(1, 30)), "")
+        else:
+            return (start, min(len(text), start + rng.randint(1, 10)), rng.choice(SNIPPETS))
+
+    def _check(self, version, seed):
+        rng = random.Random(seed)
+        parser = IncrementalParser(makeVersion(version), errorsAreFatal=False)
+        parser.readKickstartFromString(DOCUMENTS[version])
+        text = DOCUMENTS[version]
+        incremental = 0
+
+        for _i in range(25):
+            (start, end, replacement) = self._edit(rng, text)
+            text = text[:start] + replacement + text[end:]
+            handler = parser.handler
+
+            try:
+                expected = state(full(version, text))
+            except (KickstartError, ValueError, IndexError) as e:
+                with self.assertRaises(type(e)):
+                    parser.applyEdit(start, end, replacement)
+
+                continue
+
+            parser.applyEdit(start, end, replacement)
+            self.assertEqual(parser.text, text)
+            self.assertEqual(state(parser), expected, (seed, start, end, replacement))
+
+            if parser.handler is handler:
+                incremental += 1
+
+        return incremental
+
+    def runTest(self):
+        incremental = 0
+
+        with warnings.catch_warnings(), contextlib.redirect_stderr(io.StringIO()):
+            warnings.simplefilter("ignore")
+
+            for seed in range(60):
+                incremental += self._check(DEVEL, seed)
+
+            for seed in range(20):
+                self._check(F7, seed)
+
+        # Many random edits change sections, but plenty of them should still
+        # have been done without reading everything again.
+        self.assertGreater(incremental, 250)
+
+class Incremental_Commands_TestCase(unittest.TestCase):
+    def runTest(self):
+        ks = "text\npart / --size=100\nrootpw abc\npart /home --size=10\n%post\necho hi\n%end\n"
+        parser = IncrementalParser(makeVersion(DEVEL))
+        parser.readKickstartFromString(ks)
+        handler = parser.handler
+        rootpw = handler.rootpw
+
+        # Only the partitions are parsed again, and the script after them
+        # moves down a line.
+        parser.applyEdit(ks.index("rootpw"), ks.index("rootpw"), "part /var --size=5\n")
+        self.assertIs(parser.handler, handler)
+        self.assertIs(handler.rootpw, rootpw)
+        self.assertEqual([p.mountpoint for p in handler.partition.partitions], ["/", "/var", "/home"])
+        self.assertEqual([p.lineno for p in handler.partition.partitions], [2, 3, 5])
+        self.assertIs(handler.commands["part"], handler.commands["partition"])
+        self.assertEqual(handler.scripts[0].lineno, 6)
+        self.assertEqual(rootpw.lineno, 4)
+
+        # Each partition after a conflicting command is an error, until the
+        # command is taken away again.
+        parser.errorsAreFatal = False
+        with contextlib.redirect_stderr(io.StringIO()):
+            parser.applyEdit(0, 0, "autopart\n")
+
+        self.assertEqual(parser.errorsCount, 3)
+        parser.applyEdit(0, len("autopart\n"), "")
+        self.assertEqual(parser.errorsCount, 0)
+        self.assertIs(parser.handler, handler)
+        self.assertFalse(handler.autopart.seen)
+
+class Incremental_Script_TestCase(unittest.TestCase):
+    def runTest(self):
+        ks = "text\n%post\necho one\n%end\n%post\necho two\n%end\n"
+        parser = IncrementalParser(makeVersion(DEVEL))
+        parser.readKickstartFromString(ks)
+        handler = parser.handler
+        second = handler.scripts[1]
+
+        parser.applyEdit(ks.index("one"), ks.index("one") + 3, "1\necho 2")
+        self.assertIs(parser.handler, handler)
+        self.assertEqual(handler.scripts[0].script, "echo 1\necho 2\n")
+        self.assertEqual(handler.scripts[0].span.endLine, 5)
+        self.assertIs(handler.scripts[1], second)
+        self.assertEqual(second.lineno, 6)
+
+        # Adding a section is not something an edit can do in place.
+        parser.applyEdit(0, 0, "%pre\necho pre\n%end\n")
+        self.assertIsNot(parser.handler, handler)
+        self.assertEqual([s.lineno for s in parser.handler.scripts], [1, 5, 9])
+
+class Incremental_Errors_TestCase(unittest.TestCase):
+    def runTest(self):
+        parser = IncrementalParser(makeVersion(DEVEL))
+
+        with self.assertRaises(ValueError):
+            parser.applyEdit(0, 0, "text\n")
+
+        parser.readKickstartFromString("text\n")
+        with self.assertRaises(ValueError):
+            parser.applyEdit(0, 10, "")
+
+        # With errorsAreFatal set, the error is raised from applyEdit and the
+        # next edit reads it all again.
+        with self.assertRaises(KickstartError):
+            parser.applyEdit(0, 0, "bogus\n")
+
+        self.assertEqual(parser.text, "bogus\ntext\n")
+        handler = parser.handler
+
+        parser.applyEdit(0, len("bogus\n"), "")
+        self.assertIsNot(parser.handler, handler)
+        self.assertEqual(parser.text, "text\n")
+        self.assertTrue(parser.handler.displaymode.seen)
+
+if __name__ == "__main__":
+    unittest.main()
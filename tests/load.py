@@ -3,6 +3,7 @@ import unittest
 import os
 import tempfile
 import threading
+import time
 
 from pykickstart import load
 from pykickstart.errors import KickstartError
@@ -130,5 +131,114 @@ class Load_From_URL_To_File_TestCase(Load_From_URL_Test):
         super(Load_From_URL_To_File_TestCase, self).tearDown()
         os.unlink(self._target_path)
 
+class Prefetch_To_Str_TestCase(Load_From_URL_Test):
+    def runTest(self):
+        missing = self._url + '.TEST'
+        results = load.prefetch_to_str([self._url, self._path, missing, self._url], max_workers=2)
+
+        self.assertEqual(list(results.keys()), [self._url, self._path, missing])
+        self.assertEqual(results[self._url], self._content)
+        self.assertEqual(results[self._path], self._content)
+        self.assertIsInstance(results[missing], KickstartError)
+
+        self.assertEqual(load.prefetch_to_str([]), {})
+
+class RecordingRequestHandler(SimpleHTTPRequestHandler):
+    def send_response(self, code, message=None):
+        self.server.responses.append((self.path, self.headers.get("If-Modified-Since"), code,
+                                      self.headers.get("Cookie")))
+        super().send_response(code, message)
+        self.send_header("Set-Cookie", "seen=1")
+
+    def log_message(self, *args):
+        pass
+
+class RecordingDirServer(DirServer):
+    def __init__(self, address, directory):
+        super().__init__(address, directory)
+        self.responses = []
+
+    def finish_request(self, request, client_address):
+        RecordingRequestHandler(request, client_address, self, directory=self.directory)
+
+class Load_Cache_TestCase(LoadTest):
+    def setUp(self):
+        super(Load_Cache_TestCase, self).setUp()
+        load.clear_cache()
+        self._cacheSize = load.CACHE_SIZE
+        load.CACHE_SIZE = load.DEFAULT_CACHE_SIZE
+
+        self._server = RecordingDirServer(('127.0.0.1', 0), os.path.dirname(self._path))
+        self._url = 'http://127.0.0.1:%d/%s' % (self._server.server_port, os.path.basename(self._path))
+        threading.Thread(target=self._server.serve_forever).start()
+
+    def tearDown(self):
+        super(Load_Cache_TestCase, self).tearDown()
+        self._server.shutdown()
+        load.CACHE_SIZE = self._cacheSize
+        load.clear_cache()
+
+    def runTest(self):
+        # The second load asks the server whether the file changed.
+        self.assertEqual(load.load_to_str(self._url), self._content)
+        self.assertEqual(load.load_to_str(self._url), self._content)
+
+        responses = self._server.responses
+        self.assertEqual(len(responses), 2)
+        self.assertIsNone(responses[0][1])
+        self.assertEqual(responses[0][2], 200)
+        self.assertIsNotNone(responses[1][1])
+        self.assertEqual(responses[1][2], 304)
+
+        # Changes are picked up.
+        with open(self._path, "w") as f:
+            f.write("autopart\n")
+        os.utime(self._path, (time.time() + 10, time.time() + 10))
+        self.assertEqual(load.load_to_str(self._url), "autopart\n")
+        self.assertEqual(self._server.responses[-1][2], 200)
+
+        # Loading another URL drops the first one once the cache is full.
+        load.CACHE_SIZE = len("autopart\n")
+        other = self._url + "-other"
+        with open(self._path + "-other", "w") as f:
+            f.write("reboot\n")
+
+        try:
+            self.assertEqual(load.load_to_str(other), "reboot\n")
+            self.assertEqual(load.load_to_str(self._url), "autopart\n")
+            self.assertIsNone(self._server.responses[-1][1])
+        finally:
+            os.unlink(self._path + "-other")
+
+        # Nothing is kept with the cache turned off.
+        load.CACHE_SIZE = 0
+        load.clear_cache()
+        load.load_to_str(self._url)
+        load.load_to_str(self._url)
+        self.assertIsNone(self._server.responses[-1][1])
+
+        # Except by prefetch_to_str.
+        load.prefetch_to_str([self._url])
+        self.assertIsNone(self._server.responses[-1][1])
+        self.assertEqual(load.prefetch_to_str([self._url]), {self._url: "autopart\n"})
+        self.assertEqual(self._server.responses[-1][2], 304)
+
+class Load_Session_TestCase(Load_Cache_TestCase):
+    def runTest(self):
+        # Each thread has a session of its own.
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(load._get_session()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(load._get_session(), load._get_session())
+        self.assertIsNot(sessions[0], load._get_session())
+
+        # Cookies the server sets aren't sent back on later loads.
+        load.load_to_str(self._url)
+        load.load_to_str(self._url)
+        self.assertEqual([response[3] for response in self._server.responses], [None, None])
+        self.assertEqual(len(load._get_session().cookies), 0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,8 @@
 from argparse import ArgumentTypeError
 from tests.baseclass import ParserTest
 
-from pykickstart.options import ksboolean, mountpoint
+from pykickstart.options import KSOptionParser, ksboolean, mountpoint
+from pykickstart.version import FC3, F7, F9
 
 class Ksboolean_TestCase(ParserTest):
     def runTest(self):
@@ -39,3 +40,31 @@ class Mountpoint_TestCase(ParserTest):
         self.assertEqual(mountpoint("/home/"), "/home")
         self.assertEqual(mountpoint("/var"), "/var")
         self.assertEqual(mountpoint("/var/"), "/var")
+
+class DeferredHelp_TestCase(ParserTest):
+    def runTest(self):
+        op = KSOptionParser(prog="cmd", description="""
+                            Does things.""", version=FC3, conflicts=["other"])
+        op.add_argument("--opt", help="Option.", version=FC3)
+        op.add_argument("--opt", help="Changed.", version=F7)
+        op.add_argument("--gone", help="Gone.", version=FC3)
+
+        # Nothing is rendered until something asks for it.
+        self.assertIsNotNone(op._deferredDescription)
+        for action in op._actions:
+            self.assertEqual(len(action._helpFragments), 2 if "--opt" in action.option_strings else 1)
+
+        op.remove_argument("--gone", version=F9)
+        self.assertEqual(op._actions[0]._help, "Option.")
+
+        self.assertEqual(op.description,
+                         "\n.. versionadded:: Fedora3\n\n\nDoes things.\n\n"
+                         ".. note:: ``cmd`` cannot be used with the following commands: other")
+        self.assertEqual(op._actions[0].help,
+                         "Option.\n\n    .. versionadded:: Fedora3\n\n"
+                         "    .. versionchanged:: Fedora7\n\nChanged.")
+
+        # Extending the help text keeps it after the version notes.
+        op._actions[0].help += " More."
+        self.assertTrue(op._actions[0].help.endswith("Changed. More."))
+        self.assertIn(".. versionadded:: Fedora3", op.format_help())
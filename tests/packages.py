@@ -664,6 +664,47 @@ class Packages_RHEL10_TestCase(ParserTest):
             expected = "unrecognized arguments:"
             self.assertIn(expected, str(cm.exception))
 
+class Packages_Overlap_TestCase(unittest.TestCase):
+    def runTest(self):
+        # A name both added and excluded in one call stays in both lists
+        # until the next call, whatever that call adds.
+        for later in [["@core"], ["-@core"], [], ["other"]]:
+            pkgs = Packages()
+            pkgs.add(["f", "-f"])
+            self.assertEqual(pkgs.packageList, ["f"])
+            self.assertEqual(pkgs.excludedList, ["f"])
+
+            pkgs.add(later)
+            self.assertIn("f", pkgs.packageList, later)
+            self.assertNotIn("f", pkgs.excludedList, later)
+
+class Packages_Incremental_TestCase(ParserTest):
+    def runTest(self):
+        ks = "%%packages\n%s%%end\n" % "".join("package%d\n-excluded%d\n" % (i, i) for i in range(1000))
+
+        # Each line is added to the same sets, and the sorted lists aren't
+        # built until they are read.
+        packages = self.handler.packages
+        packageSet = packages._packageSet
+        excludedSet = packages._excludedSet
+
+        self.parser.readKickstartFromString(ks)
+        self.assertIs(packages._packageSet, packageSet)
+        self.assertIs(packages._excludedSet, excludedSet)
+        self.assertIsNone(packages._packageList)
+        self.assertIsNone(packages._excludedList)
+
+        self.assertEqual(len(packages.packageList), 1000)
+        self.assertEqual(len(packages.excludedList), 1000)
+        self.assertEqual(packages.packageList, sorted("package%d" % i for i in range(1000)))
+
+        # Adding again after a list was read picks up changes made to it.
+        packages.packageList.remove("package0")
+        packages.add(["package1000"])
+        self.assertNotIn("package0", packages.packageList)
+        self.assertIn("package1000", packages.packageList)
+        self.assertEqual(len(packages.packageList), 1000)
+
 
 if __name__ == "__main__":
     unittest.main()
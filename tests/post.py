@@ -19,6 +19,30 @@ echo "# Added by kickstart
         self.parser.readKickstartFromString(self.ks)
         self.assertEqual(len(self.handler.scripts), 1)
 
+class Script_Percent_Lines_TestCase(ParserTest):
+    def __init__(self, *args, **kwargs):
+        ParserTest.__init__(self, *args, **kwargs)
+        self.ks = """
+%post
+%{_libdir}/helper
+  %s %d
+%endless
+%packagesfoo
+  %end
+%pre
+ls
+%end
+"""
+
+    def runTest(self):
+        # Lines that only look like section tags stay in the script, and
+        # tags are still found after leading whitespace.
+        self.parser.readKickstartFromString(self.ks)
+        self.assertEqual(len(self.handler.scripts), 2)
+        self.assertEqual(self.handler.scripts[0].script,
+                         "%{_libdir}/helper\n  %s %d\n%endless\n%packagesfoo\n")
+        self.assertEqual(self.handler.scripts[1].script, "ls\n")
+
 class Simple_Terminated_TestCase(ParserTest):
     def __init__(self, *args, **kwargs):
         ParserTest.__init__(self, *args, **kwargs)
@@ -1,9 +1,12 @@
+import io
+import itertools
 import os
 import tempfile
 from tests.baseclass import ParserTest
 
 from pykickstart.errors import KickstartError, KickstartParseError
 from pykickstart.parser import preprocessKickstart, preprocessFromString, preprocessKickstartToString, preprocessFromStringToString
+from pykickstart.parser import preprocessKickstartToLines, preprocessFromStringToLines
 
 ###
 ### TESTING preprocessKickstart
@@ -336,3 +339,53 @@ timezone America/New_York
     def runTest(self):
         processed = preprocessFromStringToString(self.ks + "%ksappend " + self._ksappendPath)
         self.assertEqual(processed.decode(), self.ks + self.ksappend)
+
+###
+### TESTING preprocessFromStringToLines and preprocessKickstartToLines
+###
+
+class PTL_With_Ksappend(PKTS_With_Ksappend):
+    def runTest(self):
+        lines = list(preprocessFromStringToLines(self.ks + "%ksappend " + self._ksappendPath + "\nreboot\n"))
+        self.assertEqual(lines, (self.ks + self.ksappend + "reboot\n").splitlines(True))
+
+        # Any file object can be written to.
+        f = io.StringIO()
+        f.writelines(preprocessKickstartToLines(self._path))
+        self.assertEqual(f.getvalue(), self.ks + self.ksappend)
+
+class PTL_Ksappend_Missing(ParserTest):
+    def runTest(self):
+        # Problems with %ksappend lines only come up once they are reached.
+        lines = preprocessFromStringToLines("lang en_US\n%ksappend /tmp/MISSING_FILE\n")
+        self.assertEqual(next(lines), "lang en_US\n")
+        self.assertRaises(KickstartError, next, lines)
+
+        lines = preprocessFromStringToLines("%ksappend\n")
+        self.assertRaises(KickstartParseError, list, lines)
+
+        # A missing input file is reported right away.
+        self.assertRaises(KickstartError, preprocessKickstartToLines, "/tmp/MISSING_FILE")
+
+class PTL_Streaming(ParserTest):
+    def runTest(self):
+        from pykickstart.parser import _preprocessStateMachine
+
+        lines = ["part /home%d --size=1\n" % i for i in range(100000)]
+        read = []
+
+        def source():
+            for l in lines:
+                read.append(l)
+                yield l
+
+        # Lines are handed on as they are read, without reading ahead or
+        # building up the output.
+        processed = _preprocessStateMachine(source())
+        for (i, l) in enumerate(itertools.islice(processed, 10)):
+            self.assertIs(l, lines[i])
+
+        self.assertEqual(len(read), 10)
+
+        self.assertEqual(list(processed), lines[10:])
+        self.assertEqual(len(read), len(lines))
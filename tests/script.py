@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from tests.baseclass import ParserTest
@@ -71,19 +72,51 @@ class Old_Script_TestCase(ParserTest):
         self.version = F7
 
     def runTest(self):
-        self.get_parser()
-
-        obj = Script("ls /\n", type=KS_SCRIPT_POST)
+        obj = Script("ls /\n", type=KS_SCRIPT_POST, version=self.version)
         self.assertEqual(str(obj), """
 %post --nochroot
 ls /
 """)
 
-        obj = Script("ls /", type=KS_SCRIPT_POST)
+        obj = Script("ls /", type=KS_SCRIPT_POST, version=self.version)
         self.assertEqual(str(obj), """
 %post --nochroot
 ls /
 """)
 
+class Script_Write_TestCase(ParserTest):
+    def __init__(self, *args, **kwargs):
+        ParserTest.__init__(self, *args, **kwargs)
+        self.ks = """
+%pre
+  \t
+
+%end
+%post --nochroot
+echo one
+echo two
+%end
+"""
+
+    def runTest(self):
+        # A body that is only whitespace doesn't make a script.
+        self.parser.readKickstartFromString(self.ks)
+        self.assertEqual(len(self.handler.scripts), 1)
+        self.assertEqual(self.handler.scripts[0].script, "echo one\necho two\n")
+
+        # A body given as a string is kept as it is.
+        body = "A" * 1000 + "\n"
+        obj = Script(body, type=KS_SCRIPT_POST)
+        self.assertIs(obj.script, body)
+        self.handler.scripts.append(obj)
+
+        # write gives the same output as str, passing script bodies
+        # through without copying them.
+        f = io.StringIO()
+        self.handler.write(f)
+        self.assertEqual(f.getvalue(), str(self.handler))
+        self.assertIn("\n%post --nochroot\necho one\necho two\n%end\n", f.getvalue())
+        self.assertTrue(any(chunk is body for chunk in self.handler._chunks()))
+
 if __name__ == "__main__":
     unittest.main()
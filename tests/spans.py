@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pykickstart.parser import KickstartParser, SourceSpan
+from pykickstart.version import makeVersion, F7
+
+KS = """# comment
+rootpw --plaintext é
+part / --size=1
+part swap --size=2
+
+%post --nochroot
+echo hi
+%end
+
+%certificate --filename=a.pem --dir=/etc/pki
+-----BEGIN CERTIFICATE-----
+-----END CERTIFICATE-----
+%end
+
+%packages
+vim
+%end
+"""
+
+def text(data, span):
+    return data[span.startOffset:span.endOffset].decode("utf-8")
+
+class Span_TestCase(unittest.TestCase):
+    def runTest(self):
+        handler = makeVersion()
+        parser = KickstartParser(handler)
+        parser.readKickstartFromString(KS)
+        data = KS.encode("utf-8")
+
+        self.assertEqual(parser.sourceFiles, [None])
+
+        # Commands and data objects get the line they came from, with byte
+        # offsets that account for non-ASCII text.
+        self.assertEqual(handler.rootpw.span, SourceSpan(0, 2, 2, 10, 32))
+        self.assertEqual(text(data, handler.rootpw.span), "rootpw --plaintext é\n")
+
+        (root, swap) = handler.partition.partitions
+        self.assertEqual(text(data, root.span), "part / --size=1\n")
+        self.assertEqual(text(data, swap.span), "part swap --size=2\n")
+        self.assertEqual(handler.partition.span, swap.span)
+        self.assertIsNone(handler.bootloader.span)
+
+        # Sections cover everything from the header to %end.
+        self.assertEqual((handler.scripts[0].span.startLine, handler.scripts[0].span.endLine), (6, 8))
+        self.assertEqual(text(data, handler.scripts[0].span), "%post --nochroot\necho hi\n%end\n")
+        self.assertTrue(text(data, handler.certificates[0].span).startswith("%certificate --filename=a.pem --dir=/etc/pki\n"))
+        self.assertTrue(text(data, handler.certificates[0].span).endswith("CERTIFICATE-----\n%end\n"))
+        self.assertEqual(text(data, handler.packages.span), "%packages\nvim\n%end\n")
+
+class Span_Unterminated_TestCase(unittest.TestCase):
+    def runTest(self):
+        # Before %end was required, a section ended at the next section or
+        # at the end of the file.
+        ks = "%post\necho one\n\n%post\necho two\n"
+        handler = makeVersion(F7)
+        KickstartParser(handler).readKickstartFromString(ks)
+        data = ks.encode("utf-8")
+
+        self.assertEqual(handler.scripts[0].span, SourceSpan(0, 1, 3, 0, 16))
+        self.assertEqual(text(data, handler.scripts[0].span), "%post\necho one\n\n")
+        self.assertEqual(text(data, handler.scripts[1].span), "%post\necho two\n")
+
+class Span_Include_TestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._main = os.path.join(self._tmpdir, "main.ks")
+        self._included = os.path.join(self._tmpdir, "included.ks")
+
+        with open(self._included, "w") as f:
+            f.write("\nnetwork --device=eth1 --hostname=inc\n%post\necho inc\n%end\n")
+
+        with open(self._main, "w") as f:
+            f.write("network --device=eth0 --hostname=main\n%%include %s\nnetwork --device=eth2 --hostname=after\n" % self._included)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def runTest(self):
+        handler = makeVersion()
+        parser = KickstartParser(handler)
+        parser.readKickstart(self._main)
+
+        # Each file gets its own source, and lines are counted in each file.
+        self.assertEqual(parser.sourceFiles, [self._main, self._included])
+
+        spans = [nd.span for nd in handler.network.network]
+        self.assertEqual([(s.source, s.startLine) for s in spans], [(0, 1), (1, 2), (0, 3)])
+        self.assertEqual(spans[1].startOffset, 1)
+        self.assertEqual(handler.scripts[0].span, SourceSpan(1, 3, 5, 38, 58))
+
+        # Reading again starts the list of sources over.
+        parser.readKickstartFromString("text\n")
+        self.assertEqual(parser.sourceFiles, [None])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import random
+import shlex
+import unittest
+
+from pykickstart.parser import _splitLine
+
+# Characters shlex treats specially, plus enough ordinary ones to make words.
+ALPHABET = "ab-=%/ \t\r\n\x0b'\"\\#é"
+
+def split(split_func, line, comments):
+    try:
+        return split_func(line, comments=comments)
+    except ValueError as e:
+        return ("ValueError", str(e))
+
+class SplitLine_TestCase(unittest.TestCase):
+    def runTest(self):
+        for line in ["", "   ", "part / --size=100", "network --bootproto=dhcp # comment",
+                     "rootpw 'a b' \"c \\\" d\" e\\ f", "a#b", "\"a#b\"", "''", "\"\"",
+                     "\"a\\b\\\\c\"", "'a\\'", "a\\", "\"a\\", "'a", "\"a", "#only a comment",
+                     "a # b\nc", "%include /tmp/ks.cfg", "a\\\nb"]:
+            for comments in (False, True):
+                self.assertEqual(split(_splitLine, line, comments), split(shlex.split, line, comments),
+                                 (line, comments))
+
+class SplitLine_Fuzz_TestCase(unittest.TestCase):
+    def runTest(self):
+        rng = random.Random(17)
+
+        for _i in range(20000):
+            line = "".join(rng.choice(ALPHABET) for _j in range(rng.randint(0, 24)))
+
+            for comments in (False, True):
+                self.assertEqual(split(_splitLine, line, comments), split(shlex.split, line, comments),
+                                 (line, comments))
+
+if __name__ == "__main__":
+    unittest.main()
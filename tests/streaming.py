@@ -0,0 +1,107 @@
+import io
+import mmap
+import os
+import random
+import tempfile
+import unittest
+
+from pykickstart.parser import KickstartParser, _splitChunks
+from pykickstart.version import makeVersion
+
+KS = """network --hostname=hé
+rootpw --plaintext abc\r
+%post --log=/tmp/post.log
+printf "%s\\n" "café"\r
+%{_libdir}/helper
+%end
+
+%packages
+vim
+%end
+"""
+
+def parse(method, arg):
+    handler = makeVersion()
+    parser = KickstartParser(handler)
+    getattr(parser, method)(arg)
+    return str(handler)
+
+class ReadKickstartFromLines_TestCase(unittest.TestCase):
+    def runTest(self):
+        expected = parse("readKickstartFromString", KS)
+
+        # Lines and pieces of any size give the same result as a string.
+        self.assertEqual(parse("readKickstartFromLines", KS.splitlines(True)), expected)
+        self.assertEqual(parse("readKickstartFromLines", iter(KS)), expected)
+
+        rng = random.Random(19)
+        for _i in range(50):
+            pieces = []
+            pos = 0
+            while pos < len(KS):
+                size = rng.randint(1, 20)
+                pieces.append(KS[pos:pos + size])
+                pos += size
+
+            self.assertEqual(parse("readKickstartFromLines", pieces), expected)
+
+class SplitChunks_TestCase(unittest.TestCase):
+    def runTest(self):
+        # However the text is cut up, the lines are the same as splitting it
+        # whole, including a "\r\n" cut in two and other line breaks.
+        rng = random.Random(19)
+        alphabet = ["a", "é", " ", "\n", "\r", "\r\n", "\x85", "\u2028", "\v"]
+
+        for _i in range(2000):
+            text = "".join(rng.choice(alphabet) for _j in range(rng.randint(0, 30)))
+            cuts = sorted(rng.randint(0, len(text)) for _j in range(rng.randint(0, 6)))
+            chunks = [text[a:b] for (a, b) in zip([0] + cuts, cuts + [len(text)])]
+            self.assertEqual(list(_splitChunks(chunks)), text.splitlines(True), chunks)
+
+        # A long line given one character at a time.
+        self.assertEqual(list(_splitChunks(["x"] * 10000 + ["\r", "\n", "y"])), ["x" * 10000 + "\r\n", "y"])
+
+class ReadKickstartFromLines_Lazy_TestCase(unittest.TestCase):
+    def runTest(self):
+        handler = makeVersion()
+        parser = KickstartParser(handler)
+        seen = []
+
+        def lines():
+            yield "rootpw --plaintext abc\n"
+            yield "text\n"
+            # By now the parser has handled the first line.
+            seen.append(handler.rootpw.password)
+            yield "%post\nls\n%end\n"
+
+        parser.readKickstartFromLines(lines())
+        self.assertEqual(seen, ["abc"])
+        self.assertEqual(handler.scripts[0].script, "ls\n")
+
+class ReadKickstartFromFile_TestCase(unittest.TestCase):
+    def runTest(self):
+        expected = parse("readKickstartFromString", KS)
+        data = KS.encode("utf-8")
+
+        self.assertEqual(parse("readKickstartFromFile", io.StringIO(KS, newline="")), expected)
+        self.assertEqual(parse("readKickstartFromFile", io.BytesIO(data)), expected)
+
+        (fd, path) = tempfile.mkstemp(prefix="ks-")
+        try:
+            os.write(fd, data)
+            os.close(fd)
+
+            with open(path, "rb") as f:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    self.assertEqual(parse("readKickstartFromFile", m), expected)
+                finally:
+                    m.close()
+
+            # readKickstart reads local files the same way.
+            self.assertEqual(parse("readKickstart", path), expected)
+        finally:
+            os.unlink(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pykickstart.errors import KickstartParseWarning
+from pykickstart.parser import KickstartParser
+from pykickstart.version import DEVEL, FC6, F31, makeVersion
+
+# Each version writes %post, %packages, and their options differently, so a
+# parse that picks up another thread's version shows up in the output.
+INPUT = {
+    FC6: "%post\necho fc6\n\n%packages --excludedocs\nvim\n",
+    F31: "%post\necho f31\n%end\n\n%packages --instLangs=en\nvim\n%end\n",
+    DEVEL: "%post\necho devel\n%end\n\n%packages --inst-langs=en --exclude-weakdeps\nvim\n%end\n",
+}
+
+def parse(version):
+    handler = makeVersion(version)
+    parser = KickstartParser(handler)
+    parser.readKickstartFromString(INPUT[version])
+    return str(handler)
+
+class RecordingParser(KickstartParser):
+    def __init__(self, *args, **kwargs):
+        KickstartParser.__init__(self, *args, **kwargs)
+        self.warnings = []
+
+    def _handleWarning(self, message, category):
+        self.warnings.append(category)
+        return True
+
+class Version_Isolation_TestCase(unittest.TestCase):
+    def runTest(self):
+        # Making a parser for one version does not change how objects
+        # created by another parser are written out.
+        old = makeVersion(FC6)
+        oldParser = KickstartParser(old)
+        new = makeVersion(DEVEL)
+        KickstartParser(new)
+
+        oldParser.readKickstartFromString(INPUT[FC6])
+        self.assertNotIn("%end", str(old))
+        self.assertNotIn("%end", str(old.scripts[0]))
+        new.packages.seen = True
+        self.assertIn("%end", str(new.packages))
+
+        # Sections count what they see per parser.
+        first = KickstartParser(makeVersion(DEVEL))
+        second = KickstartParser(makeVersion(DEVEL))
+        first.readKickstartFromString(INPUT[DEVEL])
+        self.assertTrue(first.getSection("%post").seen)
+        self.assertFalse(second.getSection("%post").seen)
+
+class Concurrent_Parse_TestCase(unittest.TestCase):
+    def runTest(self):
+        expected = dict((v, parse(v)) for v in INPUT)
+        versions = list(INPUT) * 100
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(parse, versions))
+
+        for (version, result) in zip(versions, results):
+            self.assertEqual(result, expected[version])
+
+class Concurrent_Warnings_TestCase(unittest.TestCase):
+    ks = "user --name=a\nuser --name=a\n"
+
+    def _strict(self, _i):
+        parser = KickstartParser(makeVersion(DEVEL), warningsAreErrors=True)
+        with self.assertRaises(KickstartParseWarning):
+            parser.readKickstartFromString(self.ks)
+
+        return True
+
+    def _lenient(self, _i):
+        handler = makeVersion(DEVEL)
+        parser = RecordingParser(handler)
+        parser.readKickstartFromString(self.ks)
+        return parser.warnings == [KickstartParseWarning] and len(handler.user.userList) == 2
+
+    def runTest(self):
+        # Turning warnings into errors in one parser does not affect any
+        # other, and does not touch the process-wide warnings filters.
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            strict = [pool.submit(self._strict, i) for i in range(50)]
+            lenient = [pool.submit(self._lenient, i) for i in range(50)]
+
+            self.assertTrue(all(f.result() for f in strict))
+            self.assertTrue(all(f.result() for f in lenient))
+
+if __name__ == "__main__":
+    unittest.main()
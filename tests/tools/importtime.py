@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+from textwrap import indent
+from unittest import TestCase
+
+TOP = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TOOLS = ["ksflatten", "ksshell", "ksvalidator", "ksverdiff"]
+
+def loadedModules(code):
+    """Run code in a new interpreter and return the names of all modules in
+       sys.modules once it is done.  The tests themselves have imported most
+       of pykickstart already, so this can't be checked in-process.
+    """
+    code = "import sys\ntry:\n%s\nfinally:\n    sys.stderr.write('\\n'.join(sys.modules))\n" % indent(code, "    ")
+    env = dict(os.environ, PYTHONPATH=TOP)
+    proc = subprocess.run([sys.executable, "-c", code], env=env, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True, check=True)
+    return proc.stderr.splitlines()
+
+class DeferredImports_Base(TestCase):
+    def assertNotLoaded(self, modules, prefixes, msg=None):
+        for name in modules:
+            for prefix in prefixes:
+                self.assertFalse(name == prefix or name.startswith(prefix + "."), (msg, name))
+
+class DeferredImports_Library_TestCase(DeferredImports_Base):
+    def runTest(self):
+        # None of these are needed until a URL is loaded or a handler is made.
+        modules = loadedModules("import pykickstart.parser\nimport pykickstart.version\nimport pykickstart.load\n")
+        self.assertIn("pykickstart.parser", modules)
+        self.assertNotLoaded(modules, ["requests", "multiprocessing", "concurrent.futures",
+                                       "pykickstart.handlers", "pykickstart.commands"])
+
+        # Reading a kickstart file that doesn't name any URLs doesn't load
+        # requests either.
+        modules = loadedModules("from pykickstart.parser import KickstartParser\n"
+                                "from pykickstart.version import makeVersion\n"
+                                "KickstartParser(makeVersion()).readKickstartFromString('text\\nnetwork --device=eth0\\n')\n")
+        self.assertIn("pykickstart.commands.network", modules)
+        self.assertNotLoaded(modules, ["requests", "multiprocessing", "concurrent.futures"])
+
+class DeferredImports_Tools_TestCase(DeferredImports_Base):
+    def runTest(self):
+        for tool in TOOLS:
+            path = os.path.join(TOP, "tools", tool + ".py")
+            modules = loadedModules("import runpy\nsys.argv = [%r, '--help']\nrunpy.run_path(%r, run_name='__main__')\n"
+                                    % (path, path))
+
+            # None of these are needed until a URL is loaded, several files
+            # are checked at once, or a kickstart file is actually read.
+            self.assertNotLoaded(modules, ["requests", "multiprocessing", "concurrent.futures",
+                                           "pykickstart.handlers", "pykickstart.commands"], tool)
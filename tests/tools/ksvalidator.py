@@ -1,6 +1,8 @@
+import io
 import re
 import os
 import tempfile
+from contextlib import redirect_stdout
 import unittest
 from unittest import TestCase
 import unittest.mock as mock
@@ -36,6 +38,7 @@ class Show_Param_Help_TestCase(TestCase):
         expected_opt_args = {("-h", "--help"),
                              ("-e", "--firsterror"),
                              ("-i", "--followincludes"),
+                             ("-j", "--jobs"),
                              ("-l", "--listversions"),
                              ("-v", "--version")}
         retval, messages = ksvalidator.main(["--help"])
@@ -140,6 +143,43 @@ class KS_With_Include_TestCase(TestCase):
         os.unlink(self._include_path)
 
 
+class Parallel_Jobs_TestCase(TestCase):
+    def setUp(self):
+        super(Parallel_Jobs_TestCase, self).setUp()
+        self._ks_paths = [mktempfile("autopart\n"),
+                          mktempfile("firstb00t --enable\nunknown --foo='bar'\n"),
+                          mktempfile("text'"),
+                          mktempfile("network --device=eth0\nnetwork --device=eth0\n"),
+                          mktempfile("text\n")]
+
+    def _run(self, args):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            (retval, out) = ksvalidator.main(args + self._ks_paths)
+
+        return (retval, out, output.getvalue())
+
+    def runTest(self):
+        # Output, messages and the exit code are the same as when checking
+        # one file at a time.
+        serial = self._run([])
+        self.assertNotEqual(serial[0], 0)
+        self.assertEqual(self._run(["-j", "3"]), serial)
+        self.assertEqual(self._run(["--jobs=0"]), serial)
+
+        # Files are reported in the order they were given.
+        output = serial[2]
+        positions = [output.index(path) for path in self._ks_paths]
+        self.assertEqual(positions, sorted(positions))
+
+        # Stopping at the first error works the same way.
+        self.assertEqual(self._run(["-e", "-j", "2"]), self._run(["-e"]))
+
+    def tearDown(self):
+        super(Parallel_Jobs_TestCase, self).tearDown()
+        for path in self._ks_paths:
+            os.unlink(path)
+
 class Nonexistent_KS_File_TestCase(TestCase):
     def runTest(self):
         retval, out = ksvalidator.main(["/foo/bar/baz/ks.cfg"])
@@ -1,5 +1,6 @@
 import sys
 import unittest
+from unittest import mock
 import tempfile
 import os
 
@@ -367,6 +368,61 @@ class returnClassForVersion_TestCase(CommandTest):
                 # Ensure that returnClassForVersion returns what we expect
                 self.assertEqual(getClassName(returnClassForVersion(versionMap[vers])), getClassName(module))
 
+class returnClassForVersion_Registry_TestCase(CommandTest):
+    def runTest(self):
+        import pykickstart.version as ver
+        from pykickstart.handlers.f23 import F23Handler
+
+        # Handlers come from the pykickstart.handlers package, and every way
+        # of naming a version gives the same class.
+        self.assertIs(returnClassForVersion(F23), F23Handler)
+        self.assertIs(returnClassForVersion("F23"), F23Handler)
+        self.assertIs(returnClassForVersion("DEVEL"), returnClassForVersion(DEVEL))
+
+        # Each version's module is imported once, and sys.path is never
+        # touched.
+        path = list(sys.path)
+
+        with mock.patch.dict(ver._handlerClasses, clear=True), \
+             mock.patch.object(ver.importlib, "import_module", wraps=ver.importlib.import_module) as importModule:
+            for _i in range(100):
+                makeVersion()
+                self.assertIs(returnClassForVersion(F23), F23Handler)
+
+            self.assertEqual(importModule.call_count, 2)
+
+        self.assertEqual(sys.path, path)
+
+class ReverseMaps_TestCase(CommandTest):
+    def runTest(self):
+        import pykickstart.version as ver
+
+        # The reverse maps agree with versionMap.
+        for (name, vers) in versionMap.items():
+            if name == "DEVEL":
+                self.assertEqual(ver.versionToString(vers), "DEVEL")
+                continue
+
+            self.assertEqual(ver.stringToVersion(ver.versionToString(vers, skipDevel=True)), vers)
+            self.assertTrue(ver.versionToLongString(vers).startswith(("Fedora", "RedHatEnterpriseLinux")))
+
+        self.assertRaises(KickstartVersionError, ver.versionToString, [])
+        self.assertRaises(KickstartVersionError, ver.versionToLongString, -1)
+
+        # Changing versionMap is picked up by the next lookup.
+        try:
+            versionMap["F9999"] = 999900
+            self.assertEqual(ver.versionToString(999900), "F9999")
+            self.assertEqual(ver.versionToLongString(999900), "Fedora9999")
+            versionMap.update(RHEL9999=999901)
+            self.assertEqual(ver.versionToLongString(999901), "RedHatEnterpriseLinux9999")
+        finally:
+            versionMap.pop("F9999", None)
+            versionMap.pop("RHEL9999", None)
+
+        self.assertRaises(KickstartVersionError, ver.versionToString, 999900)
+        self.assertRaises(KickstartVersionError, ver.versionToLongString, 999901)
+
 class versionFromFile_TestCase(CommandTest):
     def runTest(self):
 
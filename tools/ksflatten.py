@@ -64,7 +64,7 @@ def main(argv=None):
     else:
         f = sys.stdout
 
-    f.write("%s" % ksparser.handler)
+    ksparser.handler.write(f)
 
     if opts.output:
         f.close()
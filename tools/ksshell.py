@@ -236,7 +236,7 @@ def main(argv=None):
     # And finally, print the output kickstart file.
     if opts.output:
         with open(opts.output, "w") as fd:
-            fd.write(str(ksparser.handler))
+            ksparser.handler.write(fd)
     else:
         print("\n" + str(ksparser.handler))
 
@@ -23,15 +23,17 @@
 # pylint: disable=W9902
 
 import argparse
+import io
 import os
 import sys
-import warnings
 import tempfile
 import shutil
 import glob
+from contextlib import redirect_stdout
 from pykickstart.i18n import _
 from pykickstart.errors import KickstartError, KickstartParseError, KickstartVersionError,\
-    KickstartParseWarning, KickstartDeprecationWarning
+    KickstartDeprecationWarning
+from pykickstart import load
 from pykickstart.load import is_url, load_to_file
 from pykickstart.parser import KickstartParser, preprocessKickstart
 from pykickstart.version import DEFAULT_VERSION, makeVersion, versionMap
@@ -48,6 +50,69 @@ def cleanup(dest, fn=None, exitval=1):
 
     return exitval
 
+def check_file(ksfile, destfile, opts):
+    """Validate one kickstart file, loading it into destfile first.  Returns
+       a tuple of the number of errors found and a list of messages.
+    """
+    rc = 0
+    retmsg = []
+
+    print(_("\nChecking kickstart file %(filename)s\n") % {"filename": ksfile})
+
+    try:
+        f = load_to_file(ksfile, destfile)
+    except KickstartError as e:
+        return (1, [_("Error reading %(filename)s:\n%(version)s") % {"filename": ksfile, "version": e}])
+
+    handler = makeVersion(opts.version)
+
+    # turn kickstart parse warnings into errors
+    ksparser = KickstartParser(handler, followIncludes=opts.followincludes,
+                               errorsAreFatal=opts.firsterror,
+                               warningsAreErrors=True)
+
+    try:
+        processedFile = preprocessKickstart(f)
+        if processedFile is None:
+            raise RuntimeError("Empty file")
+        ksparser.readKickstart(processedFile)
+        rc += ksparser.errorsCount
+    except KickstartDeprecationWarning as err:
+        rc += 1
+        retmsg.append(_("File uses a deprecated option or command.\n%s") % err)
+    except KickstartParseError as err:
+        rc += 1
+        retmsg.append(str(err))
+    except KickstartError:
+        rc += 1
+        retmsg.append(_("General kickstart error in input file"))
+    except Exception as e:        # pylint: disable=broad-except
+        rc += 1
+        retmsg.append(_("General error in input file:  %s") % e)
+
+    return (rc, retmsg)
+
+def _enable_url_cache():
+    # Files checked together often include the same URLs, which the cache
+    # lets the server answer with 304 Not Modified.
+    load.CACHE_SIZE = load.DEFAULT_CACHE_SIZE
+
+def _init_worker(version):
+    # Build a handler once, so the command classes are imported and their
+    # option parsers cached before the first file comes in.  Every file
+    # still gets a handler of its own, which is cheap after this.
+    makeVersion(version)
+    _enable_url_cache()
+
+def _check_file_in_worker(ksfile, destfile, opts):
+    # Hold on to everything check_file prints, so the parent can print it
+    # in the order the files were given.
+    output = io.StringIO()
+    with redirect_stdout(output):
+        (rc, retmsg) = check_file(ksfile, destfile, opts)
+
+    return (output.getvalue(), rc, retmsg)
+
 def main(argv):
     op = argparse.ArgumentParser(usage="%(prog)s [options] ksfile [ksfile...]", add_help=False)
     op.add_argument("ksfile", nargs="*",
@@ -57,6 +122,9 @@ def main(argv):
     op.add_argument("-i", "--followincludes", dest="followincludes",
                     action="store_true", default=False,
                     help=_("parse include files when %%include is seen"))
+    op.add_argument("-j", "--jobs", dest="jobs", type=int, default=1,
+                    help=_("number of files to check at the same time, or 0 "
+                           "for one per CPU"))
     op.add_argument("-l", "--listversions", dest="listversions", action="store_true",
                     default=False,
                     help=_("list the available versions of kickstart syntax"))
@@ -96,47 +164,37 @@ def main(argv):
     if not ksfiles:
         return (1, ["No files match the patterns."])
 
+    # bad version is fatal for all files
+    try:
+        makeVersion(opts.version)
+    except KickstartVersionError:
+        return (1, [_("The version %s is not supported by pykickstart") % opts.version])
+
+    jobs = opts.jobs if opts.jobs > 0 else os.cpu_count() or 1
+    _enable_url_cache()
+
     # iterate over files to check them
     with tempfile.TemporaryDirectory(prefix="ksvalidator-tmp-") as destdir:
-        for ksfile in ksfiles:
-            print(_("\nChecking kickstart file %(filename)s\n") % {"filename": ksfile})
-
-            try:
-                f = load_to_file(ksfile, os.path.join(destdir, "ks.cfg"))
-            except KickstartError as e:
-                rc += 1
-                retmsg.append(_("Error reading %(filename)s:\n%(version)s") % {"filename": ksfile, "version": e})
-
-            try:
-                handler = makeVersion(opts.version)
-            except KickstartVersionError:
-                # return immediately because bad version is fatal for all files
-                return (1, [_("The version %s is not supported by pykickstart") % opts.version])
-
-            # turn kickstart parse warnings into errors
-            warnings.filterwarnings(action="error", category=KickstartParseWarning)
-
-            ksparser = KickstartParser(handler, followIncludes=opts.followincludes,
-                                       errorsAreFatal=opts.firsterror)
-
-            try:
-                processedFile = preprocessKickstart(f)
-                if processedFile is None:
-                    raise RuntimeError("Empty file")
-                ksparser.readKickstart(processedFile)
-                rc += ksparser.errorsCount
-            except KickstartDeprecationWarning as err:
-                rc += 1
-                retmsg.append(_("File uses a deprecated option or command.\n%s") % err)
-            except KickstartParseError as err:
-                rc += 1
-                retmsg.append(str(err))
-            except KickstartError:
-                rc += 1
-                retmsg.append(_("General kickstart error in input file"))
-            except Exception as e:        # pylint: disable=broad-except
-                rc += 1
-                retmsg.append(_("General error in input file:  %s") % e)
+        if jobs == 1 or len(ksfiles) == 1:
+            for ksfile in ksfiles:
+                (filerc, filemsg) = check_file(ksfile, os.path.join(destdir, "ks.cfg"), opts)
+                rc += filerc
+                retmsg.extend(filemsg)
+        else:
+            # This pulls in multiprocessing, which is slow to import and not
+            # needed at all when checking one file at a time.
+            from concurrent.futures import ProcessPoolExecutor
+
+            destfiles = [os.path.join(destdir, "ks-%d.cfg" % i) for i in range(len(ksfiles))]
+            chunksize = max(1, len(ksfiles) // (jobs * 4))
+
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                     initargs=(opts.version,)) as pool:
+                for (output, filerc, filemsg) in pool.map(_check_file_in_worker, ksfiles, destfiles,
+                                                          [opts] * len(ksfiles), chunksize=chunksize):
+                    sys.stdout.write(output)
+                    rc += filerc
+                    retmsg.extend(filemsg)
 
     return rc, retmsg
 